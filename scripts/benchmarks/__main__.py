@@ -0,0 +1,58 @@
+"""Runs the benchmark suite (see `scripts.benchmarks.suite`), optionally
+stores the results as JSON and compares them with the results of an
+earlier run. Run it from the root of the repository by
+
+`python -m scripts.benchmarks --output results.json`
+
+and after a change by
+
+`python -m scripts.benchmarks --baseline results.json`
+
+which exits with the status 1, when some benchmark got slower by more
+than the tolerance. The baseline should be measured on the same machine;
+the times of different machines are not comparable."""
+
+import argparse
+import sys
+
+from scripts.benchmarks.harness import compare, load, run, save
+from scripts.benchmarks.suite import benchmarks
+
+
+def main(arguments: list[str] = None) -> int:
+    """Runs the benchmarks and returns the exit status."""
+    parser = argparse.ArgumentParser(prog="python -m scripts.benchmarks")
+    parser.add_argument("--output", help="file the results are stored to")
+    parser.add_argument("--baseline", help="file of the earlier results")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown (default 0.2)")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="number of the rounds (default 5)")
+    parser.add_argument("--filter", dest="selected",
+                        help="run only the benchmarks containing this")
+    options = parser.parse_args(arguments)
+
+    baseline = load(options.baseline) if options.baseline else None
+
+    def report(name: str, result: dict):
+        line = f"{name:<30} {1e6 * result['seconds']:>12.2f} us"
+        if baseline is not None and name in baseline["results"]:
+            reference = baseline["results"][name]["seconds"]
+            line += f" {result['seconds'] / reference:>8.2f}x"
+        print(line)
+
+    results = run(benchmarks(), options.selected, options.rounds, report)
+    if options.output:
+        save(results, options.output)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, options.tolerance)
+        for name, ratio in regressions:
+            print(f"Regression: {name} is {ratio:.2f}x slower")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
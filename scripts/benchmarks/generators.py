@@ -0,0 +1,150 @@
+"""This module contains seeded generators of random terms and environments
+used by the benchmarks. The same arguments (including the seed) always
+give the same term, so the measurements are reproducible."""
+
+import random
+from typing import Mapping
+
+from scripts.src.environment import Environment
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Atom, Term
+
+
+# Default operator mix; weights of the operators of the generated terms
+DEFAULT_OPERATORS = {
+    Negation: 1,
+    Conjunction: 2,
+    Disjunction: 2,
+    Implication: 1,
+    Equivalence: 1,
+}
+
+
+def variable_names(variable_count: int) -> tuple[str]:
+    """Returns the names of the variables of the generated terms."""
+    return tuple(f"x{index}" for index in range(variable_count))
+
+
+def random_term(variable_count: int, depth: int, width: int = 1,
+                operators: Mapping[type, float] = None,
+                seed: int = 0) -> Term:
+    """Returns the random term made of the given number of the trees of the
+    given depth joined by the conjunctions. Every tree is full; all it's
+    atoms are at the given depth. The term contains no shared subterms.
+
+    Parameters
+    ----------
+    variable_count: int
+        Number of the variables the atoms are picked from.
+
+    depth: int
+        Depth of every tree; the number of the operators from the root of
+        the tree to any of it's atoms.
+
+    width: int, optional
+        Number of the trees.
+
+    operators: Mapping of type to float, optional
+        Weights of the operators; `DEFAULT_OPERATORS` if not given.
+
+    seed: int, optional
+        Seed of the random generator.
+    """
+    generator = random.Random(seed)
+    operators = DEFAULT_OPERATORS if operators is None else operators
+    types, weights = list(operators), list(operators.values())
+    names = variable_names(variable_count)
+
+    term = None
+    for _ in range(width):
+        if depth == 0:
+            tree = Atom(generator.choice(names))
+            term = tree if term is None else Conjunction([term, tree])
+            continue
+
+        # Operators are chosen top-down and built once all their terms are
+        tree = None
+        stack = [(generator.choices(types, weights)[0], depth, [])]
+        while stack:
+            operation_type, level, terms = stack[-1]
+            arity = 1 if operation_type is Negation else 2
+            if len(terms) < arity:
+                if level == 1:
+                    terms.append(Atom(generator.choice(names)))
+                else:
+                    stack.append((generator.choices(types, weights)[0],
+                                  level - 1, []))
+                continue
+            stack.pop()
+            tree = operation_type(terms)
+            if stack:
+                stack[-1][2].append(tree)
+        term = tree if term is None else Conjunction([term, tree])
+    return term
+
+
+def random_3sat(variable_count: int, clauses: int, seed: int = 0) -> Term:
+    """Returns the random 3-SAT instance as a single conjunction of the
+    disjunctions of three literals.
+
+    Parameters
+    ----------
+    variable_count: int
+        Number of the variables to pick from.
+
+    clauses: int
+        Number of the clauses.
+
+    seed: int, optional
+        Seed of the random generator.
+    """
+    generator = random.Random(seed)
+    names = variable_names(variable_count)
+    terms = []
+    for _ in range(clauses):
+        literals = []
+        for _ in range(3):
+            literal = Atom(generator.choice(names))
+            if generator.random() < 0.5:
+                literal = Negation([literal])
+            literals.append(literal)
+        terms.append(Disjunction(literals))
+    return terms[0] if len(terms) == 1 else Conjunction(terms)
+
+
+def random_environment(variable_count: int, seed: int = 0) -> Environment:
+    """Returns the environment of random values of all the variables.
+
+    Parameters
+    ----------
+    variable_count: int
+        Number of the variables.
+
+    seed: int, optional
+        Seed of the random generator.
+    """
+    generator = random.Random(seed)
+    env = Environment()
+    for name in variable_names(variable_count):
+        env.add_values(name, generator.random() < 0.5)
+    return env
+
+
+def term_text(term: Term) -> str:
+    """Returns the term written in the syntax of `scripts.src.parser`, all
+    the operations being parenthesized."""
+    symbols = {Conjunction: "&", Disjunction: "|", Implication: "->",
+               Equivalence: "<->"}
+    texts = {}
+    for subterm in term.postorder():
+        if isinstance(subterm, Atom):
+            text = subterm.atom_name
+        elif isinstance(subterm, Negation):
+            text = "~" + texts[id(subterm._terms[0])]
+        else:
+            symbol = f" {symbols[type(subterm)]} "
+            text = "(" + symbol.join(
+                texts[id(each)] for each in subterm._terms) + ")"
+        texts[id(subterm)] = text
+    return texts[id(term)]
@@ -0,0 +1,147 @@
+"""This module contains a harness measuring the benchmarks, storing their
+results as JSON and comparing them with a baseline (the stored results of
+an earlier run).
+
+Every benchmark prepares it's data once and then the measured function is
+called repeatedly; the time of one call is the best of several rounds,
+which makes the results stable enough to compare."""
+
+import json
+import platform
+import time
+from typing import Callable, Iterable
+
+
+class Benchmark:
+    """Benchmark of one hot path. The setup prepares the data (e.g. the
+    generated term) and returns the function to be measured."""
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]]):
+        """
+        Parameters
+        ----------
+        name: str
+            Unique name of the benchmark, e.g. 'term.evaluate'.
+
+        setup: Callable
+            Function preparing the data and returning the measured
+            function, which takes no arguments.
+        """
+        self._name = name
+        self._setup = setup
+
+    @property
+    def name(self) -> str:
+        """Name of the benchmark."""
+        return self._name
+
+    def measure(self, rounds: int = 5, round_time: float = 0.05) -> dict:
+        """Returns the result of the benchmark; the time of one call in
+        seconds (the best of the rounds) and the number of the calls per
+        round.
+
+        Parameters
+        ----------
+        rounds: int, optional
+            Number of the rounds.
+
+        round_time: float, optional
+            Minimal time of one round in seconds; the number of the calls
+            per round is raised until a round takes at least this long.
+        """
+        function = self._setup()
+        calls = 1
+        while True:
+            elapsed = _time(function, calls)
+            if elapsed >= round_time:
+                break
+            calls *= 2 if elapsed == 0 else max(
+                2, min(10, int(round_time / elapsed) + 1))
+
+        best = elapsed
+        for _ in range(rounds - 1):
+            best = min(best, _time(function, calls))
+        return {"seconds": best / calls, "calls": calls}
+
+
+def _time(function: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return time.perf_counter() - start
+
+
+def run(benchmarks: Iterable[Benchmark], selected: str = None,
+        rounds: int = 5, report: Callable[[str, dict], None] = None) -> dict:
+    """Measures the benchmarks and returns the results with a description
+    of the environment they were measured in.
+
+    Parameters
+    ----------
+    benchmarks: Iterable of Benchmark
+        The benchmarks to be measured.
+
+    selected: str, optional
+        If given, only the benchmarks with names containing it are run.
+
+    rounds: int, optional
+        Number of the rounds of every benchmark.
+
+    report: Callable, optional
+        Function called with the name and the result of every benchmark
+        once it's measured.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        if selected and selected not in benchmark.name:
+            continue
+        results[benchmark.name] = benchmark.measure(rounds)
+        if report is not None:
+            report(benchmark.name, results[benchmark.name])
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict,
+            tolerance: float = 0.2) -> list[tuple[str, float]]:
+    """Returns the benchmarks slower than in the baseline by more than the
+    tolerance, each with the ratio of the times. The benchmarks missing in
+    the baseline are skipped.
+
+    Parameters
+    ----------
+    results: dict
+        The results of the current run (see `run`).
+
+    baseline: dict
+        The results of the earlier run.
+
+    tolerance: float, optional
+        Allowed relative slowdown; 0.2 means 20 % slower.
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or reference["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def save(results: dict, path: str):
+    """Stores the results as JSON into the given file."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load(path: str) -> dict:
+    """Loads the results stored by `save`."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
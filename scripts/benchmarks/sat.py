@@ -0,0 +1,62 @@
+"""Benchmark comparing the SAT solver with the exhaustive enumeration of
+the assignments evaluated by `Term.evaluate`. The instances are random
+3-SAT terms near the satisfiability threshold (clauses = 4.26 * variables).
+
+Run it from the root of the repository by
+
+`python -m scripts.benchmarks.sat`
+"""
+
+import time
+from itertools import product
+
+from scripts.benchmarks.generators import random_3sat
+from scripts.src.environment import Environment
+from scripts.src.sat import solve
+from scripts.src.term import Term
+
+
+def enumerate_models(term: Term) -> Environment:
+    """Looks for the satisfying assignment by evaluating the term for one
+    assignment after another."""
+    names = term.variable_names
+    for values in product((False, True), repeat=len(names)):
+        env = Environment()
+        for name, value in zip(names, values):
+            env.add_values(name, value)
+        if term.evaluate(env):
+            return env
+    return None
+
+
+def _measure(function, term: Term) -> tuple[float, bool]:
+    start = time.perf_counter()
+    result = function(term)
+    return time.perf_counter() - start, result is not None
+
+
+def main(sizes=(8, 10, 12, 14, 16), instances: int = 5, seed: int = 0):
+    """Runs the benchmark and prints the average times per instance."""
+    print(f"{'vars':>5} {'sat':>4} {'solver [ms]':>12} "
+          f"{'enumeration [ms]':>17} {'speedup':>8}")
+    for size in sizes:
+        solver_time = enumeration_time = 0.0
+        satisfiable = 0
+        for instance in range(instances):
+            term = random_3sat(size, round(4.26 * size), seed + instance)
+            elapsed, found = _measure(solve, term)
+            solver_time += elapsed
+            elapsed, expected = _measure(enumerate_models, term)
+            enumeration_time += elapsed
+            if found != expected:
+                raise Exception(f"Results differ for instance {instance}")
+            satisfiable += found
+
+        print(f"{size:>5} {satisfiable:>4} "
+              f"{1000 * solver_time / instances:>12.2f} "
+              f"{1000 * enumeration_time / instances:>17.2f} "
+              f"{enumeration_time / solver_time:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
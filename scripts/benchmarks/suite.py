@@ -0,0 +1,213 @@
+"""This module contains the benchmarks of the hot paths of the terms, the
+environments and the engines built on them. All the data are generated
+with the fixed seeds, so every run measures the same work."""
+
+from itertools import islice
+
+from scripts.benchmarks.generators import (random_term, random_3sat,
+                                           random_environment, term_text,
+                                           variable_names)
+from scripts.benchmarks.harness import Benchmark
+from scripts.src.bdd import BddManager
+from scripts.src.cnf import CnfEncoding
+from scripts.src.compact import CompactTerm
+from scripts.src.compilation import CompiledTerm
+from scripts.src.counting import count_models
+from scripts.src.environment import (Declaration, Environment,
+                                     MutableEnvironment)
+from scripts.src.incremental import IncrementalEvaluation
+from scripts.src.models import models
+from scripts.src.parser import parse
+from scripts.src.rewriting import simplify
+from scripts.src.sat import solve
+from scripts.src.serialization import dumps, loads_compact
+from scripts.src.term import Term
+from scripts.src.truth_table import TruthTable
+
+try:
+    import numpy
+    from scripts.src.batch import evaluate_batch
+except ImportError:     # pragma: no cover
+    numpy = None
+
+
+# Number of the variables and the depth of the generated terms
+VARIABLES = 16
+DEPTH = 10
+
+
+def _term() -> Term:
+    return random_term(VARIABLES, DEPTH)
+
+
+def _evaluate():
+    term, env = _term(), random_environment(VARIABLES)
+    return lambda: term.evaluate(env)
+
+
+def _evaluate_shared():
+    term, env = _term(), random_environment(VARIABLES)
+    return lambda: term.evaluate_shared(env)
+
+
+def _clone():
+    term = _term()
+    return lambda: term.clone
+
+
+def _variable_names():
+    term = _term()
+    return lambda: term.variable_names
+
+
+def _variable_names_cold():
+    term = _term()
+
+    def function():
+        # Any structural change invalidates the cached names
+        Term._changes += 1
+        return term.variable_names
+    return function
+
+
+def _add_declaration():
+    declarations = [Declaration(name, index % 2 == 0)
+                    for index, name in enumerate(variable_names(256))]
+
+    def function():
+        env = Environment()
+        for declaration in declarations:
+            env.add_declaration(declaration)
+    return function
+
+
+def _declaration():
+    names = variable_names(256)
+    env = random_environment(256)
+
+    def function():
+        for name in names:
+            env.declaration(name)
+    return function
+
+
+def _compile():
+    term = _term()
+    return lambda: CompiledTerm(term)
+
+
+def _compiled_call():
+    compiled = CompiledTerm(_term())
+    env = random_environment(VARIABLES)
+    return lambda: compiled(env)
+
+
+def _compact():
+    term = _term()
+    return lambda: CompactTerm(term)
+
+
+def _compact_evaluate():
+    compact = CompactTerm(_term())
+    env = random_environment(VARIABLES)
+    return lambda: compact.evaluate(env)
+
+
+def _dumps():
+    term = _term()
+    return lambda: dumps(term)
+
+
+def _loads():
+    data = dumps(_term())
+    return lambda: loads_compact(data)
+
+
+def _truth_table():
+    term = random_term(12, 8)
+    return lambda: TruthTable(term)
+
+
+def _batch():
+    term = random_term(VARIABLES, 8)
+    matrix = numpy.random.default_rng(0).random((1 << 14, VARIABLES)) < 0.5
+    return lambda: evaluate_batch(term, matrix)
+
+
+def _parse():
+    text = term_text(random_term(VARIABLES, 8, width=4))
+    return lambda: parse(text)
+
+
+def _simplify():
+    term = random_term(8, 8)
+    return lambda: simplify(term)
+
+
+def _solve():
+    term = random_3sat(40, 170)
+    return lambda: solve(term)
+
+
+def _bdd():
+    term = random_term(12, 6, width=2)
+    return lambda: BddManager(term.variable_names).build(term)
+
+
+def _count_models():
+    term = random_3sat(30, 90)
+    return lambda: count_models(term)
+
+
+def _models():
+    term = random_term(VARIABLES, 6, width=2)
+    return lambda: sum(1 for _ in islice(models(term), 100))
+
+
+def _incremental():
+    env = MutableEnvironment()
+    env.add_all_declarations(random_environment(VARIABLES).declarations)
+    evaluation = IncrementalEvaluation(_term(), env)
+    name = variable_names(VARIABLES)[0]
+
+    def function():
+        env.set_value(name, not env.lookup(name))
+        return evaluation.value
+    return function
+
+
+def _cnf():
+    term = _term()
+    return lambda: sum(1 for _ in CnfEncoding(term).clauses())
+
+
+def benchmarks() -> list[Benchmark]:
+    """Returns all the benchmarks; the ones needing the optional
+    dependencies (NumPy) are left out when these are not installed."""
+    suite = [
+        Benchmark("term.evaluate", _evaluate),
+        Benchmark("term.evaluate_shared", _evaluate_shared),
+        Benchmark("term.clone", _clone),
+        Benchmark("term.variable_names", _variable_names),
+        Benchmark("term.variable_names.cold", _variable_names_cold),
+        Benchmark("environment.add_declaration", _add_declaration),
+        Benchmark("environment.declaration", _declaration),
+        Benchmark("compilation.compile", _compile),
+        Benchmark("compilation.call", _compiled_call),
+        Benchmark("compact.encode", _compact),
+        Benchmark("compact.evaluate", _compact_evaluate),
+        Benchmark("serialization.dumps", _dumps),
+        Benchmark("serialization.loads", _loads),
+        Benchmark("truth_table", _truth_table),
+        Benchmark("parser.parse", _parse),
+        Benchmark("rewriting.simplify", _simplify),
+        Benchmark("sat.solve", _solve),
+        Benchmark("bdd.build", _bdd),
+        Benchmark("counting.count_models", _count_models),
+        Benchmark("models", _models),
+        Benchmark("incremental.flip", _incremental),
+        Benchmark("cnf.clauses", _cnf),
+    ]
+    if numpy is not None:
+        suite.append(Benchmark("batch.evaluate", _batch))
+    return suite
@@ -0,0 +1,88 @@
+"""This module contains a definition of algebras the terms can be
+interpreted in. An algebra defines what the values of the atoms are and the
+operators then combine these values by using the Python bitwise operators
+(`~`, `&`, `|` and `^`). This way one term can be turned into an evaluator,
+a vector of truth values or any other structure supporting these operators.
+"""
+
+from abc import ABC, abstractmethod
+from itertools import product
+
+
+class Algebra(ABC):
+    """Algebra is a definition of the domain the term is interpreted to.
+    It provides the values for the atoms (variables and constants), while
+    the operations are expressed by the bitwise operators of these values:
+
+    +---------------+-------------+
+    | operator      | expression  |
+    +---------------+-------------+
+    | negation      | ~a          |
+    | conjunction   | a & b       |
+    | disjunction   | a | b       |
+    | xor           | a ^ b       |
+    +---------------+-------------+
+
+    Realization of this class is abstract, thus it cannot be
+    instantiated as is."""
+
+    @abstractmethod
+    def variable(self, name: str):
+        """Returns the value representing the variable of the given name.
+
+        Parameters
+        ----------
+        name: str
+            Name of the atom to be represented.
+        """
+
+    @abstractmethod
+    def constant(self, value: bool):
+        """Returns the value representing the given logical constant.
+
+        Parameters
+        ----------
+        value: bool
+            The logical value to be represented.
+        """
+
+    def operation(self, operation, values: tuple):
+        """Interprets the operation, which does not define how to combine
+        values of it's terms by itself (typically the custom operations).
+
+        By default, the operation is expanded into a disjunction of all the
+        combinations of the values it is evaluated as true for. This works
+        for any operation, which result depends only on the values of it's
+        terms, but it grows exponentially with the cardinality.
+
+        Parameters
+        ----------
+        operation: Operation
+            The operation to be interpreted.
+
+        values: tuple
+            Already interpreted values of the terms of the operation.
+        """
+        result = self.constant(False)
+        for combination in product((False, True), repeat=len(values)):
+            if not operation.evaluate_values(combination):
+                continue
+
+            minterm = self.constant(True)
+            for value, positive in zip(values, combination):
+                minterm = minterm & (value if positive else ~value)
+            result = result | minterm
+        return result
+
+    def shared(self, value):
+        """Called with the value of a term contained more than once in the
+        interpreted term, before it's used by any other term. The returned
+        value is used instead of the given one. By default, the value is
+        returned as it is.
+
+        Parameters
+        ----------
+        value
+            Value of the shared term.
+        """
+        return value
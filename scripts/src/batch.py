@@ -0,0 +1,101 @@
+"""This module contains a batch evaluation of terms. Instead of evaluating
+the term for every single assignment, the whole batch of assignments is
+evaluated at once; every operator is computed just once over the NumPy
+vectors of values.
+
+This module requires NumPy to be installed."""
+
+from scripts.src.algebra import Algebra
+from scripts.src.environment import Environment
+from scripts.src.term import Term
+
+try:
+    import numpy
+except ImportError:     # pragma: no cover
+    numpy = None
+
+
+# Default number of assignments evaluated at once
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class _VectorAlgebra(Algebra):
+    """Algebra interpreting the atoms as the boolean vectors of their
+    values in a chunk of assignments."""
+
+    def __init__(self, variable_names: tuple[str], chunk):
+        self._variable_names = variable_names
+        self._columns = {
+            name: chunk[:, index]
+            for index, name in enumerate(variable_names)}
+        self._size = len(chunk)
+
+    def variable(self, name: str):
+        return self._columns[name]
+
+    def constant(self, value: bool):
+        return numpy.full(self._size, bool(value))
+
+    def operation(self, operation, values: tuple):
+        """Uses the vectorized evaluator of the operation when there is one.
+        Otherwise, the operation is evaluated for one assignment after
+        another."""
+        vectorized_evaluator = getattr(operation, "vectorized_evaluator",
+                                       None)
+        if vectorized_evaluator is not None:
+            return numpy.asarray(vectorized_evaluator(values), dtype=bool)
+
+        result = numpy.empty(self._size, dtype=bool)
+        for row in range(self._size):
+            env = Environment()
+            for name in self._variable_names:
+                env.add_values(name, bool(self._columns[name][row]))
+            result[row] = operation.evaluate(env)
+        return result
+
+
+def evaluate_batch(term: Term, matrix,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Evaluates the term for every assignment (row) of the given matrix
+    and returns the boolean vector of the results.
+
+    The matrix is processed in chunks of the given number of rows, so the
+    memory needed for the intermediate results stays bounded regardless
+    of the number of assignments.
+
+    Parameters
+    ----------
+    term: Term
+        The term to be evaluated.
+
+    matrix: array_like
+        Two dimensional boolean array. Rows are the assignments and columns
+        are values of the variables in order of `term.variable_names`.
+
+    chunk_size: int, optional
+        Number of rows evaluated at once.
+
+    Raises
+    ------
+    Exception
+        When NumPy is not installed or the shape of the matrix does not
+        match the variables of the term.
+    """
+    if numpy is None:
+        raise Exception("Batch evaluation requires NumPy to be installed")
+    if chunk_size < 1:
+        raise Exception(f"The chunk size has to be positive: {chunk_size}")
+
+    variable_names = term.variable_names
+    matrix = numpy.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[1] != len(variable_names):
+        raise Exception(
+            f"Shape of the matrix {matrix.shape} does not match the number "
+            f"of variables ({len(variable_names)})")
+
+    result = numpy.empty(len(matrix), dtype=bool)
+    for start in range(0, len(matrix), chunk_size):
+        chunk = numpy.asarray(matrix[start:start + chunk_size], dtype=bool)
+        algebra = _VectorAlgebra(variable_names, chunk)
+        result[start:start + len(chunk)] = term.interpret(algebra)
+    return result
@@ -0,0 +1,509 @@
+"""This module contains reduced ordered binary decision diagrams (ROBDD).
+The diagram of a term is a graph deciding the value of the term by testing
+the variables one by one in a fixed order. Every node is unique within it's
+manager, thus every logical function has exactly one diagram and two terms
+are equivalent iff their diagrams are the very same node.
+
+Building the diagram may take long, but once it's built, the equivalence
+checking takes constant time and counting the models and restricting the
+variables take time linear in the size of the diagram."""
+
+from typing import Iterable, Mapping
+
+from scripts.src.algebra import Algebra
+from scripts.src.term import Term
+
+
+# Nodes of the constant functions
+_FALSE = 0
+_TRUE = 1
+
+# Level of the terminal nodes, which are below all the variables
+_TERMINAL = 1 << 62
+
+
+class Bdd:
+    """Handle of a node of the diagram. The handles are the values of the
+    algebra of the manager, so they are combined by the bitwise operators
+    and two handles are equal iff they represent the same function.
+
+    The node is kept alive (and not collected) as long as it's handle is.
+    """
+
+    __slots__ = ("_manager", "_node")
+
+    def __init__(self, manager: "BddManager", node: int):
+        self._manager = manager
+        self._node = node
+        manager._refs[node] += 1
+
+    def __del__(self):
+        self._manager._refs[self._node] -= 1
+
+    @property
+    def manager(self) -> "BddManager":
+        """Manager the diagram belongs to."""
+        return self._manager
+
+    @property
+    def is_tautology(self) -> bool:
+        """If the function is true for all the values of the variables."""
+        return self._node == _TRUE
+
+    @property
+    def is_satisfiable(self) -> bool:
+        """If the function is true for some values of the variables."""
+        return self._node != _FALSE
+
+    @property
+    def support(self) -> tuple[str]:
+        """Names of the variables the function depends on in the order of
+        the manager."""
+        return self._manager._support(self._node)
+
+    def count_models(self, variable_names: Iterable[str] = None) -> int:
+        """Returns the number of the assignments of the variables the
+        function is true for.
+
+        Parameters
+        ----------
+        variable_names: Iterable of str, optional
+            Names of the variables the assignments are made of. They have
+            to contain all the variables of the support of the function. If
+            not given, all the variables of the manager are used.
+
+        Raises
+        ------
+        Exception
+            When some variable of the support is not given.
+        """
+        return self._manager._count_models(self._node, variable_names)
+
+    def restrict(self, values: Mapping[str, bool]) -> "Bdd":
+        """Returns the diagram of the function with the given variables
+        fixed to the given values.
+
+        Parameters
+        ----------
+        values: Mapping of str to bool
+            Values of the variables indexed by their names. Variables
+            unknown to the manager are ignored.
+        """
+        return self._manager._restrict(self._node, values)
+
+    def __invert__(self) -> "Bdd":
+        return self._manager._apply(self._node, _FALSE, _TRUE)
+
+    def __and__(self, other: "Bdd") -> "Bdd":
+        manager = self._manager
+        return manager._apply(self._node, manager._check(other), _FALSE)
+
+    def __or__(self, other: "Bdd") -> "Bdd":
+        manager = self._manager
+        return manager._apply(self._node, _TRUE, manager._check(other))
+
+    def __xor__(self, other: "Bdd") -> "Bdd":
+        manager = self._manager
+        negation = ~other
+        return manager._apply(self._node, manager._check(negation),
+                              other._node)
+
+    def __len__(self) -> int:
+        """Returns the number of the nodes of the diagram (including the
+        terminal ones)."""
+        return self._manager._size(self._node)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Bdd) and other._manager is self._manager
+                and other._node == self._node)
+
+    def __hash__(self) -> int:
+        return hash((id(self._manager), self._node))
+
+    def __repr__(self) -> str:
+        return f"Bdd({self._node})"
+
+
+class BddManager(Algebra):
+    """Manager of the nodes of the diagrams sharing the same variables and
+    their order. The nodes are kept in the unique table, so there is never
+    more than one node of the same variable and successors.
+
+    The results of the if-then-else operation (used for all the operators)
+    are stored in the computed cache of a bounded size; when two results
+    fall into the same slot, the older one is forgotten.
+
+    The order of the variables can be given or changed afterwards, either
+    explicitly by `reorder` or by sifting (`sift`), which looks for an
+    order making the diagrams smaller."""
+
+    # Largest growth of the size allowed while moving the sifted variable
+    _MAX_GROWTH = 1.2
+
+    def __init__(self, variable_names: Iterable[str] = (),
+                 cache_size: int = 1 << 16, reordering: bool = False):
+        """
+        Parameters
+        ----------
+        variable_names: Iterable of str, optional
+            Names of the variables in the initial order (from the root).
+            Other variables are added below these ones when used.
+
+        cache_size: int, optional
+            Number of the slots of the computed cache (rounded up to the
+            power of two).
+
+        reordering: bool, optional
+            If set, the variables are sifted automatically whenever the
+            number of the nodes doubles.
+        """
+        # Variables indexed by their numbers and levels
+        self._names: list[str] = []
+        self._numbers: dict[str, int] = {}
+        self._levels: list[int] = []
+        self._order: list[int] = []
+        self._tables: list[dict[tuple[int, int], int]] = []
+
+        # Nodes; the variable of a free node is -1
+        self._variables = [-1, -1]
+        self._lows = [_FALSE, _TRUE]
+        self._highs = [_FALSE, _TRUE]
+        self._refs = [1, 1]
+        self._free: list[int] = []
+
+        size = 1
+        while size < cache_size:
+            size <<= 1
+        self._cache: list[tuple] = [None] * size
+        self._mask = size - 1
+
+        self._reordering = reordering
+        self._threshold = 1 << 12
+
+        for name in variable_names:
+            self._number(name)
+
+    @property
+    def true(self) -> Bdd:
+        """Diagram of the constant true."""
+        return Bdd(self, _TRUE)
+
+    @property
+    def false(self) -> Bdd:
+        """Diagram of the constant false."""
+        return Bdd(self, _FALSE)
+
+    @property
+    def order(self) -> tuple[str]:
+        """Names of the variables in the current order (from the root)."""
+        return tuple(self._names[v] for v in self._order)
+
+    def build(self, term: Term) -> Bdd:
+        """Returns the diagram of the given term.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be turned into the diagram.
+        """
+        return term.interpret(self)
+
+    def ite(self, condition: Bdd, then: Bdd, otherwise: Bdd) -> Bdd:
+        """Returns the diagram of the function `then` where the `condition`
+        is true and `otherwise` elsewhere."""
+        return self._apply(self._check(condition), self._check(then),
+                           self._check(otherwise))
+
+    def variable(self, name: str) -> Bdd:
+        return Bdd(self, self._node(self._number(name), _FALSE, _TRUE))
+
+    def constant(self, value: bool) -> Bdd:
+        return Bdd(self, _TRUE if value else _FALSE)
+
+    def collect_garbage(self):
+        """Frees all the nodes not used by any diagram alive."""
+        self._cache = [None] * len(self._cache)
+        dead = [node for node in range(2, len(self._variables))
+                if self._refs[node] == 0 and self._variables[node] != -1]
+        self._release(dead)
+
+    def reorder(self, variable_names: Iterable[str]):
+        """Changes the order of the variables. The diagrams alive stay
+        valid; their nodes are rebuilt for the new order.
+
+        Parameters
+        ----------
+        variable_names: Iterable of str
+            Names of the variables in the new order (from the root). The
+            variables not given keep their relative order below these ones.
+        """
+        numbers = [self._number(name) for name in variable_names]
+        self.collect_garbage()
+        for level, number in enumerate(numbers):
+            while self._levels[number] > level:
+                self._swap(self._levels[number] - 1)
+        self._cache = [None] * len(self._cache)
+
+    def sift(self):
+        """Reorders the variables to make the diagrams alive smaller. Every
+        variable is moved through all the levels (while the diagrams do not
+        grow too much) and left at the level the diagrams were the
+        smallest at."""
+        self.collect_garbage()
+        numbers = sorted(range(len(self._names)),
+                         key=lambda v: -len(self._tables[v]))
+        for number in numbers:
+            best_size, best_level = len(self), self._levels[number]
+            for step in (1, -1):
+                while 0 <= self._levels[number] + step < len(self._order):
+                    level = self._levels[number]
+                    self._swap(level if step > 0 else level - 1)
+                    if len(self) < best_size:
+                        best_size = len(self)
+                        best_level = self._levels[number]
+                    elif len(self) > self._MAX_GROWTH * best_size:
+                        break
+            while self._levels[number] < best_level:
+                self._swap(self._levels[number])
+            while self._levels[number] > best_level:
+                self._swap(self._levels[number] - 1)
+        self._cache = [None] * len(self._cache)
+
+    def __len__(self) -> int:
+        """Returns the number of the nodes (including the terminal ones)."""
+        return len(self._variables) - len(self._free)
+
+    def _number(self, name: str) -> int:
+        """Returns the number of the variable; new variables are added
+        below all the others."""
+        number = self._numbers.get(name)
+        if number is None:
+            number = len(self._names)
+            self._names.append(name)
+            self._numbers[name] = number
+            self._levels.append(len(self._order))
+            self._order.append(number)
+            self._tables.append({})
+        return number
+
+    def _level(self, node: int) -> int:
+        return _TERMINAL if node < 2 else self._levels[self._variables[node]]
+
+    def _node(self, variable: int, low: int, high: int) -> int:
+        """Returns the unique node of the given variable and successors."""
+        if low == high:
+            return low
+        table = self._tables[variable]
+        node = table.get((low, high))
+        if node is None:
+            if self._free:
+                node = self._free.pop()
+                self._variables[node] = variable
+                self._lows[node] = low
+                self._highs[node] = high
+                self._refs[node] = 0
+            else:
+                node = len(self._variables)
+                self._variables.append(variable)
+                self._lows.append(low)
+                self._highs.append(high)
+                self._refs.append(0)
+            self._refs[low] += 1
+            self._refs[high] += 1
+            table[(low, high)] = node
+        return node
+
+    def _check(self, diagram: Bdd) -> int:
+        """Returns the node of the diagram of this manager."""
+        if not isinstance(diagram, Bdd) or diagram._manager is not self:
+            raise Exception(f"Diagram '{diagram}' belongs to another manager")
+        return diagram._node
+
+    def _apply(self, condition: int, then: int, otherwise: int) -> Bdd:
+        """Computes the if-then-else of the nodes. The unused nodes are
+        collected before, when there is too many of them."""
+        if len(self) > self._threshold:
+            self.collect_garbage()
+            if self._reordering and len(self) > self._threshold // 2:
+                self.sift()
+            self._threshold = max(self._threshold, 2 * len(self))
+        return Bdd(self, self._ite(condition, then, otherwise))
+
+    def _ite(self, f: int, g: int, h: int) -> int:
+        """Returns the node of the function `g` where `f` is true and `h`
+        elsewhere. The cofactors are computed without recursion, so the
+        number of the variables is not limited; the stack holds the pending
+        calls (the triples of nodes) and the nodes waiting for the results
+        of their successors (with the variable and the slot of the cache).
+        """
+        cache, mask = self._cache, self._mask
+        results = []
+        stack = [(f, g, h)]
+        while stack:
+            task = stack.pop()
+            if len(task) == 5:
+                f, g, h, variable, slot = task
+                high = results.pop()
+                result = self._node(variable, results.pop(), high)
+                cache[slot] = (f, g, h, result)
+                results.append(result)
+                continue
+
+            f, g, h = task
+            if f == _TRUE or g == h:
+                results.append(g)
+                continue
+            if f == _FALSE:
+                results.append(h)
+                continue
+            if g == _TRUE and h == _FALSE:
+                results.append(f)
+                continue
+
+            slot = (f * 12582917 + g * 4256249 + h) & mask
+            entry = cache[slot]
+            if entry is not None and entry[0] == f and entry[1] == g \
+                    and entry[2] == h:
+                results.append(entry[3])
+                continue
+
+            level = min(self._level(f), self._level(g), self._level(h))
+            f0, f1 = self._cofactors(f, level)
+            g0, g1 = self._cofactors(g, level)
+            h0, h1 = self._cofactors(h, level)
+            stack.append((f, g, h, self._order[level], slot))
+            stack.append((f1, g1, h1))
+            stack.append((f0, g0, h0))
+        return results[0]
+
+    def _cofactors(self, node: int, level: int) -> tuple[int, int]:
+        """Returns the successors of the node if it's on the given level,
+        otherwise the node itself twice."""
+        if self._level(node) == level:
+            return self._lows[node], self._highs[node]
+        return node, node
+
+    def _release(self, dead: list[int]):
+        """Frees the given unused nodes and all the nodes used only by
+        them."""
+        while dead:
+            node = dead.pop()
+            variable = self._variables[node]
+            if variable == -1:
+                continue
+            low, high = self._lows[node], self._highs[node]
+            del self._tables[variable][(low, high)]
+            self._variables[node] = -1
+            self._free.append(node)
+            for successor in (low, high):
+                self._refs[successor] -= 1
+                if successor > 1 and self._refs[successor] == 0:
+                    dead.append(successor)
+
+    def _swap(self, level: int):
+        """Swaps the variables of the given and the next level. The nodes
+        of the upper variable depending on the lower one are rebuilt in
+        place, so they represent the same functions as before."""
+        x, y = self._order[level], self._order[level + 1]
+        variables, lows, highs = self._variables, self._lows, self._highs
+
+        # Nodes not depending on y stay as they are (just a level lower)
+        table = self._tables[x]
+        self._tables[x] = {}
+        rebuilt = []
+        for key, node in table.items():
+            low, high = key
+            if variables[low] == y or variables[high] == y:
+                rebuilt.append(node)
+            else:
+                self._tables[x][key] = node
+
+        self._order[level], self._order[level + 1] = y, x
+        self._levels[x], self._levels[y] = level + 1, level
+        for node in rebuilt:
+            f0, f1 = lows[node], highs[node]
+            f00, f01 = (lows[f0], highs[f0]) if variables[f0] == y \
+                else (f0, f0)
+            f10, f11 = (lows[f1], highs[f1]) if variables[f1] == y \
+                else (f1, f1)
+            low = self._node(x, f00, f10)
+            high = self._node(x, f01, f11)
+            self._refs[low] += 1
+            self._refs[high] += 1
+            lows[node], highs[node], variables[node] = low, high, y
+            self._tables[y][(low, high)] = node
+
+            for successor in (f0, f1):
+                self._refs[successor] -= 1
+                if successor > 1 and self._refs[successor] == 0:
+                    self._release([successor])
+
+    def _support(self, node: int) -> tuple[str]:
+        variables = set()
+        for current in self._nodes(node):
+            variables.add(self._variables[current])
+        return tuple(self._names[v] for v in self._order if v in variables)
+
+    def _size(self, node: int) -> int:
+        # Every non-constant function reaches both the terminal nodes
+        return len(self._nodes(node)) + 2 if node > 1 else 1
+
+    def _nodes(self, node: int) -> list[int]:
+        """Returns the inner nodes reachable from the given node, every
+        one after all it's successors."""
+        result, visited = [], set()
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current < 2 or current in visited:
+                stack.pop()
+                continue
+            low, high = self._lows[current], self._highs[current]
+            if low > 1 and low not in visited:
+                stack.append(low)
+            elif high > 1 and high not in visited:
+                stack.append(high)
+            else:
+                stack.pop()
+                visited.add(current)
+                result.append(current)
+        return result
+
+    def _count_models(self, node: int,
+                      variable_names: Iterable[str] = None) -> int:
+        """Counts the models over all the variables, then adjusts the count
+        for the given variables."""
+        counts = {_FALSE: 0, _TRUE: 1}
+        bottom = len(self._order)
+        levels = {_FALSE: bottom, _TRUE: bottom}
+        for current in self._nodes(node):
+            level = self._levels[self._variables[current]]
+            levels[current] = level
+            low, high = self._lows[current], self._highs[current]
+            counts[current] = (counts[low] << (levels[low] - level - 1)) \
+                + (counts[high] << (levels[high] - level - 1))
+        count = counts[node] << levels[node]
+
+        if variable_names is None:
+            return count
+        names = set(variable_names)
+        missing = set(self._support(node)) - names
+        if missing:
+            raise Exception(
+                f"Variables {sorted(missing)} are needed for counting")
+        unused = sum(1 for name in self._names if name not in names)
+        return (count >> unused) << len(names - set(self._names))
+
+    def _restrict(self, node: int, values: Mapping[str, bool]) -> Bdd:
+        fixed = {self._numbers[name]: bool(value)
+                 for name, value in values.items() if name in self._numbers}
+        results = {_FALSE: _FALSE, _TRUE: _TRUE}
+        for current in self._nodes(node):
+            variable = self._variables[current]
+            low, high = self._lows[current], self._highs[current]
+            if variable in fixed:
+                results[current] = results[high if fixed[variable] else low]
+            else:
+                results[current] = self._node(variable, results[low],
+                                              results[high])
+        return Bdd(self, results[node])
@@ -0,0 +1,237 @@
+"""This module contains a conversion of terms into the conjunctive normal
+form (CNF), i.e. a set of clauses. The conversion is the Tseitin
+transformation; every operator gets a new variable defined by a few
+clauses to be equal to the result of the operator. Thus the number of the
+clauses is linear in the size of the term (unlike the conversion by
+distributing the operators, which may grow exponentially).
+
+Optionally, the Plaisted-Greenbaum refinement is used; only the clauses
+needed for the polarity the operator occurs in are generated. Such clauses
+are satisfiable iff the term is, but they do not preserve the number of
+the models.
+
+The clauses are lists of literals in DIMACS convention; variable is a
+positive integer and it's negation is the negative one."""
+
+from array import array
+from typing import Iterator
+
+from scripts.src.algebra import Algebra
+from scripts.src.environment import Environment
+from scripts.src.term import Term
+
+
+# Variable which is constantly true
+TRUE = 1
+
+# Kinds of the gates
+_AND = 0
+_XOR = 1
+
+# Polarities of the gates
+_POSITIVE = 1
+_NEGATIVE = 2
+_BOTH = _POSITIVE | _NEGATIVE
+
+
+class _Literal:
+    """Literal of the encoded term. Combining the literals by the bitwise
+    operators introduces a new gate for the result."""
+
+    __slots__ = ("_encoding", "value")
+
+    def __init__(self, encoding: "CnfEncoding", value: int):
+        self._encoding = encoding
+        self.value = value
+
+    def __invert__(self) -> "_Literal":
+        return _Literal(self._encoding, -self.value)
+
+    def __and__(self, other: "_Literal") -> "_Literal":
+        return self._encoding._gate(_AND, self.value, other.value)
+
+    def __or__(self, other: "_Literal") -> "_Literal":
+        return ~self._encoding._gate(_AND, -self.value, -other.value)
+
+    def __xor__(self, other: "_Literal") -> "_Literal":
+        return self._encoding._gate(_XOR, self.value, other.value)
+
+
+class CnfEncoding(Algebra):
+    """Encoding of the term into clauses. The term is turned into the gates
+    at once, while the clauses are generated lazily by `clauses`, so all of
+    them never have to be held in memory.
+
+    The variable 1 is constantly true (see `TRUE`), the variables of the
+    term follow and the variables of the gates are the last ones."""
+
+    def __init__(self, term: Term, polarity: bool = False):
+        """Encodes the given term.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be encoded.
+
+        polarity: bool, optional
+            If set, the Plaisted-Greenbaum refinement is used. The clauses
+            are then only satisfiable iff the term is, while by default
+            there is exactly one model of the clauses for every model of
+            the term.
+        """
+        self._variables: dict[str, int] = {}
+        for name in term.variable_names:
+            self._variables[name] = len(self._variables) + 2
+        self._count = len(self._variables) + 1
+
+        # Inputs of the gates; gate of the variable v has index v - first
+        self._first_gate = self._count + 1
+        self._kinds = array("b")
+        self._inputs = (array("q"), array("q"))
+        self._gates: dict[tuple[int, int, int], int] = {}
+
+        self._root = term.interpret(self).value
+        self._gates = None
+        self._polarities = self._polarize(polarity)
+
+    @property
+    def variables(self) -> dict[str, int]:
+        """Variables of the clauses indexed by the names of the atoms."""
+        return dict(self._variables)
+
+    @property
+    def variable_count(self) -> int:
+        """Number of the variables used by the clauses."""
+        return self._count
+
+    @property
+    def root(self) -> int:
+        """Literal equal to the value of the whole term."""
+        return self._root
+
+    def clauses(self) -> Iterator[list[int]]:
+        """Yields the clauses one by one. The clauses are satisfied iff the
+        term is satisfied; the last clause is the unit clause of the root.
+        """
+        yield [TRUE]
+        inputs_a, inputs_b = self._inputs
+        for index, kind in enumerate(self._kinds):
+            polarity = self._polarities[index]
+            g = index + self._first_gate
+            a, b = inputs_a[index], inputs_b[index]
+            if kind == _AND:
+                if polarity & _POSITIVE:
+                    yield [-g, a]
+                    yield [-g, b]
+                if polarity & _NEGATIVE:
+                    yield [g, -a, -b]
+            else:
+                if polarity & _POSITIVE:
+                    yield [-g, a, b]
+                    yield [-g, -a, -b]
+                if polarity & _NEGATIVE:
+                    yield [g, -a, b]
+                    yield [g, a, -b]
+        yield [self._root]
+
+    def environment(self, model) -> Environment:
+        """Turns the model of the clauses into the environment of the values
+        of the atoms.
+
+        Parameters
+        ----------
+        model: Mapping
+            Values of the variables indexed by the variables. The variables
+            missing in the model (e.g. the ones folded away as they have no
+            effect on the value of the term) are set to False.
+        """
+        env = Environment()
+        for name, variable in self._variables.items():
+            env.add_values(name, bool(model.get(variable, False)))
+        return env
+
+    def variable(self, name: str) -> _Literal:
+        return _Literal(self, self._variables[name])
+
+    def constant(self, value: bool) -> _Literal:
+        return _Literal(self, TRUE if value else -TRUE)
+
+    def _gate(self, kind: int, a: int, b: int) -> _Literal:
+        """Returns the literal of the gate of given kind and inputs. The
+        constants are folded and the same gates are shared."""
+        if kind == _AND:
+            if a == -TRUE or b == -TRUE or a == -b:
+                return _Literal(self, -TRUE)
+            if a == TRUE or a == b:
+                return _Literal(self, b)
+            if b == TRUE:
+                return _Literal(self, a)
+        else:
+            if abs(a) == TRUE:
+                return _Literal(self, -b if a == TRUE else b)
+            if abs(b) == TRUE:
+                return _Literal(self, -a if b == TRUE else a)
+            if abs(a) == abs(b):
+                return _Literal(self, TRUE if a == -b else -TRUE)
+
+            # The output of xor is negated instead of it's inputs
+            sign = 1
+            if a < 0:
+                a, sign = -a, -sign
+            if b < 0:
+                b, sign = -b, -sign
+
+        a, b = min(a, b), max(a, b)
+        gate = self._gates.get((kind, a, b))
+        if gate is None:
+            self._count += 1
+            gate = self._count
+            self._gates[(kind, a, b)] = gate
+            self._kinds.append(kind)
+            self._inputs[0].append(a)
+            self._inputs[1].append(b)
+        return _Literal(self, gate if kind == _AND else sign * gate)
+
+    def _polarize(self, polarity: bool) -> array:
+        """Returns the polarities the gates occur in. Without the polarity
+        refinement, all the gates are used in both polarities."""
+        if not polarity:
+            return array("b", [_BOTH]) * len(self._kinds)
+
+        polarities = array("b", [0]) * len(self._kinds)
+        self._mark(polarities, self._root, _POSITIVE)
+
+        # Gates are created after their inputs, so the reversed order
+        # visits every gate before all of it's inputs
+        inputs_a, inputs_b = self._inputs
+        for index in range(len(self._kinds) - 1, -1, -1):
+            polarity = polarities[index]
+            if polarity == 0:
+                continue
+            if self._kinds[index] == _XOR:
+                polarity = _BOTH
+            self._mark(polarities, inputs_a[index], polarity)
+            self._mark(polarities, inputs_b[index], polarity)
+        return polarities
+
+    def _mark(self, polarities: array, literal: int, polarity: int):
+        """Adds the polarity to the gate of the literal (if it is a gate)."""
+        index = abs(literal) - self._first_gate
+        if index >= 0:
+            if literal < 0 and polarity != _BOTH:
+                polarity ^= _BOTH
+            polarities[index] |= polarity
+
+
+def clauses(term: Term, polarity: bool = False) -> Iterator[list[int]]:
+    """Yields the clauses of the term encoded by `CnfEncoding`.
+
+    Parameters
+    ----------
+    term: Term
+        The term to be encoded.
+
+    polarity: bool, optional
+        If set, the Plaisted-Greenbaum refinement is used.
+    """
+    return CnfEncoding(term, polarity).clauses()
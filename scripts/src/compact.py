@@ -0,0 +1,372 @@
+"""This module contains a compact representation of terms. Instead of an
+object per node, the whole term is kept in a few arrays (so called struct
+of arrays); every node takes an opcode byte and two integers, while the
+names of the atoms are stored just once in a table.
+
+The nodes are stored in the post-order; the terms of every operation
+precede the operation itself, so the root is the last node and the term
+can be evaluated or interpreted by a single pass through the arrays. The
+terms contained more than once are stored just once.
+
+The conjunctions and the disjunctions of more than two terms refer to the
+list of their terms in another array by the position and the number of
+them.
+
+Operations other than the basic operators (e.g. the custom ones) are kept
+as objects (without their terms) aside the arrays and evaluated by
+`Operation.evaluate_values`.
+"""
+
+from array import array
+from typing import Iterator
+
+from scripts.src.algebra import Algebra
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Term, Atom, Constant, Operation
+
+
+# Opcodes of the nodes; the atoms refer to the name table by the first
+# argument (and keep their value in the second one), the operators refer
+# to their terms (the n-ary ones to the list of them) and the other
+# operations to the table of the operations
+VARIABLE = 0
+ATOM = 1
+CONSTANT = 2
+NEGATION = 3
+CONJUNCTION = 4
+DISJUNCTION = 5
+IMPLICATION = 6
+EQUIVALENCE = 7
+OPERATION = 8
+NARY_CONJUNCTION = 9
+NARY_DISJUNCTION = 10
+
+_OPCODES = {
+    Negation: NEGATION,
+    Conjunction: CONJUNCTION,
+    Disjunction: DISJUNCTION,
+    Implication: IMPLICATION,
+    Equivalence: EQUIVALENCE,
+}
+_NARY_OPCODES = {
+    Conjunction: NARY_CONJUNCTION,
+    Disjunction: NARY_DISJUNCTION,
+}
+_TYPES = {opcode: operation_type for opcodes in (_OPCODES, _NARY_OPCODES)
+          for operation_type, opcode in opcodes.items()}
+
+
+def _from_arrays(opcodes: array, first: array, second: array,
+                 lists: array, names: list[str]) -> "CompactTerm":
+    """Returns the compact term of the given arrays of the nodes and of the
+    terms of the n-ary nodes, and the table of the names (used by the
+    deserialization)."""
+    compact = object.__new__(CompactTerm)
+    compact._opcodes = opcodes
+    compact._first = first
+    compact._second = second
+    compact._lists = lists
+    compact._names = names
+    compact._operations = []
+    compact._variable_names = None
+    return compact
+
+
+def _detached(operation: Operation) -> Operation:
+    """Returns the copy of the operation without it's terms, which is not
+    interned."""
+    operation = operation._shallow_copy()
+    operation._factory = operation._hash = None
+    operation._variables_cache = None
+    operation._terms = []
+    return operation
+
+
+class CompactTerm:
+    """Term stored in the arrays of the opcodes and the arguments of it's
+    nodes. The compact term is a snapshot of the term it was made of; later
+    changes of the term are not reflected."""
+
+    def __init__(self, term: Term):
+        """Encodes the given term.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be encoded.
+
+        Raises
+        ------
+        Exception
+            When the term contains something else than atoms and
+            operations.
+        """
+        self._opcodes = array("B")
+        self._first = array("i")
+        self._second = array("i")
+        self._lists = array("i")
+        self._names: list[str] = []
+        self._operations: list[tuple[Operation, tuple[int]]] = []
+
+        names: dict[str, int] = {}
+        nodes: dict[int, int] = {}
+        for subterm in term.postorder():
+            opcode = _OPCODES.get(type(subterm))
+            if opcode is not None:
+                terms = subterm._terms
+                if len(terms) > 2:
+                    opcode = _NARY_OPCODES[type(subterm)]
+                    first, second = len(self._lists), len(terms)
+                    self._lists.extend(nodes[id(t)] for t in terms)
+                else:
+                    first = nodes[id(terms[0])]
+                    second = nodes[id(terms[1])] if len(terms) > 1 else -1
+            elif isinstance(subterm, Atom):
+                if isinstance(subterm, Constant):
+                    opcode = CONSTANT
+                else:
+                    opcode = VARIABLE if subterm.value is None else ATOM
+                name = subterm.atom_name
+                first = names.get(name)
+                if first is None:
+                    first = names[name] = len(self._names)
+                    self._names.append(name)
+                second = int(bool(subterm.value))
+            elif isinstance(subterm, Operation):
+                opcode, first, second = OPERATION, len(self._operations), -1
+                self._operations.append((_detached(subterm), tuple(
+                    nodes[id(t)] for t in subterm._terms)))
+            else:
+                raise Exception(f"Term '{subterm}' cannot be encoded")
+
+            nodes[id(subterm)] = len(self._opcodes)
+            self._opcodes.append(opcode)
+            self._first.append(first)
+            self._second.append(second)
+        self._variable_names = None
+
+    def __len__(self) -> int:
+        """Returns the number of the distinct nodes of the term."""
+        return len(self._opcodes)
+
+    @property
+    def root(self) -> int:
+        """Index of the root node; it's always the last one."""
+        return len(self._opcodes) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Number of the bytes taken by the arrays of the nodes."""
+        return sum(len(values) * values.itemsize for values in (
+            self._opcodes, self._first, self._second, self._lists))
+
+    @property
+    def variable_names(self) -> tuple[str]:
+        """Names of the variables in the same order as in
+        `Term.variable_names`."""
+        if self._variable_names is None:
+            names = {}
+            for node, opcode in enumerate(self._opcodes):
+                if opcode == VARIABLE or opcode == ATOM:
+                    names[self._names[self._first[node]]] = None
+            self._variable_names = tuple(names)
+        return self._variable_names
+
+    def opcode(self, node: int) -> int:
+        """Returns the opcode of the given node."""
+        return self._opcodes[node]
+
+    def name(self, node: int) -> str:
+        """Returns the name of the given atom node."""
+        if self._opcodes[node] > CONSTANT:
+            raise Exception(f"Node {node} is not an atom")
+        return self._names[self._first[node]]
+
+    def children(self, node: int) -> tuple[int]:
+        """Returns the nodes of the terms of the given node."""
+        opcode = self._opcodes[node]
+        if opcode <= CONSTANT:
+            return ()
+        if opcode == NEGATION:
+            return self._first[node],
+        if opcode == OPERATION:
+            return self._operations[self._first[node]][1]
+        if opcode >= NARY_CONJUNCTION:
+            start = self._first[node]
+            return tuple(self._lists[start:start + self._second[node]])
+        return self._first[node], self._second[node]
+
+    def postorder(self) -> Iterator[int]:
+        """Yields all the nodes; the terms of every operation before the
+        operation itself."""
+        return iter(range(len(self._opcodes)))
+
+    def evaluate(self, env: Environment = None) -> bool:
+        """Evaluates the term the same way as `Term.evaluate_shared`; the
+        operators are short-circuited and every node is evaluated at most
+        once. The evaluation does not use recursion.
+
+        Parameters
+        ----------
+        env: Environment, optional
+            Declaration of values for specified variables.
+
+        Raises
+        ------
+        Exception
+            When there is an atomic variable without specified value.
+        """
+        opcodes, first, second = self._opcodes, self._first, self._second
+        lists = self._lists
+        values = [None] * len(opcodes)
+
+        # Positions in the lists of the terms of the n-ary nodes, which
+        # wait for the value of the term there
+        positions: dict[int, int] = {}
+        stack = [len(opcodes) - 1]
+        while stack:
+            node = stack[-1]
+            opcode = opcodes[node]
+            if opcode == VARIABLE:
+                name = self._names[first[node]]
+                value = None if env is None else env.lookup(name)
+                if value is None:
+                    raise Exception(f"Value of atom '{name}' is not defined")
+            elif opcode <= CONSTANT:
+                value = bool(second[node])
+            elif opcode == OPERATION:
+                operation, terms = self._operations[first[node]]
+                pending = [t for t in terms if values[t] is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                value = operation.evaluate_values(values[t] for t in terms)
+            elif opcode >= NARY_CONJUNCTION:
+                # The value is the first dominant value of the terms (False
+                # for the conjunction) or the other one if there is none
+                dominant = opcode == NARY_DISJUNCTION
+                position = positions.pop(node, first[node])
+                end = first[node] + second[node]
+                while position < end:
+                    other = values[lists[position]]
+                    if other is None or bool(other) is dominant:
+                        break
+                    position += 1
+                if position == end:
+                    value = not dominant
+                elif other is not None:
+                    value = dominant
+                else:
+                    positions[node] = position
+                    stack.append(lists[position])
+                    continue
+            else:
+                value = values[first[node]]
+                if value is None:
+                    stack.append(first[node])
+                    continue
+                if opcode == NEGATION:
+                    value = not value
+                elif opcode == IMPLICATION and not value:
+                    value = True
+                elif (opcode == CONJUNCTION and value
+                      or opcode == DISJUNCTION and not value
+                      or opcode == IMPLICATION or opcode == EQUIVALENCE):
+                    # The value is given by the second term too
+                    other = values[second[node]]
+                    if other is None:
+                        stack.append(second[node])
+                        continue
+                    value = value == other if opcode == EQUIVALENCE else other
+            values[node] = value
+            stack.pop()
+        return values[-1]
+
+    def interpret(self, algebra: Algebra):
+        """Interprets the term in the given algebra the same way as
+        `Term.interpret`.
+
+        Parameters
+        ----------
+        algebra: Algebra
+            Algebra providing the values of the atoms.
+        """
+        opcodes, first, second = self._opcodes, self._first, self._second
+        occurrences = [0] * len(opcodes)
+        for node in range(len(opcodes)):
+            for term in self.children(node):
+                occurrences[term] += 1
+
+        values = []
+        for node, opcode in enumerate(opcodes):
+            if opcode == VARIABLE:
+                value = algebra.variable(self._names[first[node]])
+            elif opcode <= CONSTANT:
+                value = algebra.constant(bool(second[node]))
+            elif opcode == NEGATION:
+                value = ~values[first[node]]
+            elif opcode == OPERATION:
+                operation, terms = self._operations[first[node]]
+                value = operation.combine(
+                    tuple(values[t] for t in terms), algebra)
+            elif opcode >= NARY_CONJUNCTION:
+                terms = self.children(node)
+                value = values[terms[0]]
+                for term in terms[1:]:
+                    if opcode == NARY_CONJUNCTION:
+                        value = value & values[term]
+                    else:
+                        value = value | values[term]
+            else:
+                left, right = values[first[node]], values[second[node]]
+                if opcode == CONJUNCTION:
+                    value = left & right
+                elif opcode == DISJUNCTION:
+                    value = left | right
+                elif opcode == IMPLICATION:
+                    value = ~left | right
+                else:
+                    value = ~(left ^ right)
+            if occurrences[node] > 1:
+                value = algebra.shared(value)
+            values.append(value)
+        return values[-1]
+
+    def to_term(self, factory: TermFactory = None) -> Term:
+        """Returns the term of the objects encoded by this compact term.
+        The nodes stored once are shared in the returned term too.
+
+        Parameters
+        ----------
+        factory: TermFactory, optional
+            Factory the returned term is interned by. If not given, the
+            term is not interned.
+        """
+        terms = []
+        first, second = self._first, self._second
+        for node, opcode in enumerate(self._opcodes):
+            if opcode <= CONSTANT:
+                name = self._names[first[node]]
+                value = bool(second[node])
+                if opcode == CONSTANT:
+                    term = (Constant(value, name) if factory is None
+                            else factory.constant(value, name))
+                else:
+                    value = None if opcode == VARIABLE else value
+                    term = (Atom(name, value) if factory is None
+                            else factory.atom(name, value))
+            elif opcode == OPERATION:
+                operation, children = self._operations[first[node]]
+                term = _detached(operation)
+                term._terms = [terms[child] for child in children]
+                if factory is not None:
+                    term = factory.intern(term)
+            else:
+                children = [terms[child] for child in self.children(node)]
+                term = (_TYPES[opcode](children) if factory is None
+                        else factory.operation(_TYPES[opcode], children))
+            terms.append(term)
+        return terms[-1]
@@ -0,0 +1,210 @@
+"""This module contains a compiler of terms. The compiled term is a plain
+Python function generated from the structure of the term, so evaluating it
+does not need to walk the tree of terms, dispatch the evaluation on every
+single node nor search the environment for every atom."""
+
+from collections.abc import Mapping
+from typing import Callable, Iterable
+
+from scripts.src.algebra import Algebra
+from scripts.src.environment import Environment
+
+
+# Maximal nesting of the generated expression. Deeper expressions are moved
+# into separate functions, as Python parser refuses too nested expressions.
+_MAX_DEPTH = 32
+
+# Maximal nesting of the calls of the separate functions. Evaluators of
+# deeper terms would exceed the recursion limit of Python, so such terms are
+# evaluated iteratively instead.
+_MAX_CALLS = 256
+
+# Minimal length of the code of an expression being moved into a separate
+# function when it is used repeatedly (by a shared term).
+_MIN_SHARED_LENGTH = 64
+
+
+class _Expression:
+    """Piece of the generated Python code, which evaluates one term. The
+    bitwise operators are translated to the short-circuiting logical
+    operators of Python and the constants are folded right away."""
+
+    def __init__(self, compiler: "_Compiler", code: str, depth: int = 0,
+                 constant: bool = None, calls: int = 0):
+        self._compiler = compiler
+        self.code = code
+        self.depth = depth
+        self.constant = constant
+        self.calls = calls
+
+    def _new(self, code: str, *operands: "_Expression") -> "_Expression":
+        """Creates a new expression made of the given operands."""
+        depth = max(operand.depth for operand in operands) + 1
+        calls = max(operand.calls for operand in operands)
+        if depth > _MAX_DEPTH:
+            return _Expression(self._compiler, self._compiler.define(code),
+                               calls=calls + 1)
+        return _Expression(self._compiler, code, depth, calls=calls)
+
+    def __invert__(self) -> "_Expression":
+        if self.constant is not None:
+            return self._compiler.constant(not self.constant)
+        return self._new(f"(not {self.code})", self)
+
+    def __and__(self, other: "_Expression") -> "_Expression":
+        if self.constant is not None:
+            return other if self.constant else self
+        if other.constant is not None:
+            return self if other.constant else other
+        return self._new(f"({self.code} and {other.code})", self, other)
+
+    def __or__(self, other: "_Expression") -> "_Expression":
+        if self.constant is not None:
+            return self if self.constant else other
+        if other.constant is not None:
+            return other if other.constant else self
+        return self._new(f"({self.code} or {other.code})", self, other)
+
+    def __xor__(self, other: "_Expression") -> "_Expression":
+        if self.constant is not None:
+            return ~other if self.constant else other
+        if other.constant is not None:
+            return ~self if other.constant else self
+        return self._new(
+            f"(bool({self.code}) != bool({other.code}))", self, other)
+
+
+class _Compiler(Algebra):
+    """Algebra interpreting the terms as the Python expressions. Apart from
+    the expressions themselves, it collects the functions the too deep or
+    shared expressions were moved into."""
+
+    def __init__(self, variable_names: Iterable[str]):
+        self._variables = {
+            name: index for index, name in enumerate(variable_names)}
+        self._definitions: list[str] = []
+        self._namespace = {"_environment": self._environment}
+
+    def variable(self, name: str) -> _Expression:
+        return _Expression(self, f"_v[{self._variables[name]}]")
+
+    def constant(self, value: bool) -> _Expression:
+        return _Expression(self, str(bool(value)), constant=bool(value))
+
+    def operation(self, operation, values: tuple) -> _Expression:
+        """The operations without own definition of combining the values
+        are called as they are with the environment made of the assignment.
+        The operation is cloned, so it's later changes are not reflected.
+        """
+        name = f"_t{len(self._namespace)}"
+        self._namespace[name] = operation.clone
+        return _Expression(self, f"{name}.evaluate(_environment(_v))")
+
+    def shared(self, value: _Expression) -> _Expression:
+        """Long expressions of the shared terms are moved into separate
+        functions, so their code is not repeated for every occurrence."""
+        if value.depth > 0 and len(value.code) >= _MIN_SHARED_LENGTH:
+            return _Expression(self, self.define(value.code),
+                               calls=value.calls + 1)
+        return value
+
+    def define(self, code: str) -> str:
+        """Moves the given code into a separate function and returns the
+        code calling it."""
+        name = f"_f{len(self._definitions)}"
+        self._definitions.append(f"def {name}(_v):\n    return {code}\n")
+        return f"{name}(_v)"
+
+    def _environment(self, values: tuple) -> Environment:
+        """Creates an environment from the positional assignment."""
+        env = Environment()
+        for name, index in self._variables.items():
+            env.add_values(name, values[index])
+        return env
+
+    def build(self, expression: _Expression, term) -> tuple[Callable, str]:
+        """Generates the source of the whole evaluator from the given
+        expression and returns the compiled function with it's source.
+
+        When the calls of the separate functions are nested too deeply, the
+        returned function evaluates the copy of the given term iteratively
+        instead (the source is generated anyway)."""
+        source = "".join(self._definitions)
+        code = expression.code
+        if expression.constant is None:
+            code = f"bool({code})"
+        source += f"def _evaluate(_v):\n    return {code}\n"
+        if expression.calls > _MAX_CALLS:
+            term = term.clone
+
+            def evaluate(values: tuple) -> bool:
+                return bool(term.evaluate_shared(self._environment(values)))
+            return evaluate, source
+        exec(compile(source, "<compiled term>", "exec"), self._namespace)
+        return self._namespace["_evaluate"], source
+
+
+class CompiledTerm:
+    """Compiled term is a reusable evaluator of the term it was created
+    from. It's called with an assignment of the variables and returns the
+    logical value of the term.
+
+    The compiled term is a snapshot of the term at the time of the
+    compilation; later changes of the term are not reflected."""
+
+    def __init__(self, term):
+        """Compiles the given term.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be compiled.
+        """
+        self._variable_names = term.variable_names
+        compiler = _Compiler(self._variable_names)
+        self._function, self._source = compiler.build(
+            term.interpret(compiler), term)
+
+    @property
+    def variable_names(self) -> tuple[str]:
+        """Names of the variables in order the positional assignment
+        is expected to be in."""
+        return self._variable_names
+
+    @property
+    def source(self) -> str:
+        """Python source code of the generated evaluator."""
+        return self._source
+
+    def __call__(self, assignment) -> bool:
+        """Evaluates the compiled term for the given assignment.
+
+        Parameters
+        ----------
+        assignment: tuple, Mapping or Environment
+            Values of the variables. It's either a sequence of values in
+            order of the `variable_names`, a mapping of variable names to
+            their values or an environment.
+
+        Raises
+        ------
+        Exception
+            When there is a variable without specified value.
+        """
+        if isinstance(assignment, (Mapping, Environment)):
+            assignment = self._values(assignment)
+        elif len(assignment) != len(self._variable_names):
+            raise Exception(
+                f"Number of values ({len(assignment)}) is not equal to the "
+                f"number of variables ({len(self._variable_names)})")
+        return self._function(assignment)
+
+    def _values(self, assignment) -> tuple:
+        """Turns the named assignment into the positional one."""
+        get = (assignment.lookup if isinstance(assignment, Environment)
+               else assignment.get)
+        values = tuple(map(get, self._variable_names))
+        if None in values:
+            name = self._variable_names[values.index(None)]
+            raise Exception(f"Value of atom '{name}' is not defined")
+        return values
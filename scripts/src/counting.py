@@ -0,0 +1,365 @@
+"""This module contains an exact model counter (so called #SAT solver).
+The term is encoded into clauses (see `scripts.src.cnf`); the encoding
+keeps exactly one model of the clauses for every model of the term, so
+the models of the clauses are counted instead.
+
+The counter assigns the variables one by one, both the values in turn,
+and sums the counts of the simplified clauses. Before branching, the unit
+clauses are propagated and the clauses are split into the components,
+which have no variable in common; the count is the product of the counts
+of the components, and the counts of the components already seen are
+taken from the cache. Thus the counts of the terms with hundreds of
+variables can be computed, if they decompose well enough.
+
+The variables of the gates of the encoding are eliminated by resolution
+first (as long as it does not make more clauses), so the counter
+branches on the variables of the atoms. When the variables can be
+eliminated one by one leaving each with a few neighbours only, the last
+eliminated ones are assigned first, as they split the clauses into the
+components soonest; otherwise the most frequent variables are.
+
+The clauses are lists of literals in DIMACS convention; variable is a
+positive integer and it's negation is the negative one."""
+
+from heapq import heappush, heappop
+from typing import Iterable
+
+from scripts.src.cnf import CnfEncoding
+from scripts.src.term import Term
+
+
+# Default number of the slots of the cache of the components
+DEFAULT_CACHE_SIZE = 1 << 16
+
+# Greatest width of the elimination order the counter branches by; the
+# frequency of the variables is used for the wider orders
+_MAX_ORDER_WIDTH = 16
+
+
+class _ComponentCache:
+    """Cache of the counts of the components of a bounded size. Every
+    component has just one slot given by it's hash; the count stored
+    there before is forgotten."""
+
+    def __init__(self, size: int):
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self._slots: list[tuple] = [None] * slots
+        self._mask = slots - 1
+
+    def get(self, key: tuple) -> int:
+        entry = self._slots[hash(key) & self._mask]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def put(self, key: tuple, count: int):
+        self._slots[hash(key) & self._mask] = (key, count)
+
+
+def _propagate(clauses: list[tuple], assigned: set) -> list[tuple]:
+    """Assigns the literals of the unit clauses and simplifies the clauses
+    until there is no unit clause. Returns the simplified clauses or None,
+    if some clause is falsified. The assigned literals are added to the
+    given set."""
+    occurrences: dict[int, list[int]] = {}
+    for index, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+    queue = [clause[0] for clause in clauses if len(clause) == 1]
+    if not queue:
+        return clauses
+
+    # Numbers of the literals of the clauses, which are not false yet
+    unassigned = [len(clause) for clause in clauses]
+    satisfied = [False] * len(clauses)
+    while queue:
+        literal = queue.pop()
+        if literal in assigned:
+            continue
+        if -literal in assigned:
+            return None
+        assigned.add(literal)
+        for index in occurrences.get(literal, ()):
+            satisfied[index] = True
+        for index in occurrences.get(-literal, ()):
+            if satisfied[index]:
+                continue
+            unassigned[index] -= 1
+            if unassigned[index] == 0:
+                return None
+            if unassigned[index] == 1:
+                for other in clauses[index]:
+                    if -other not in assigned:
+                        queue.append(other)
+                        break
+
+    return [tuple(literal for literal in clause if -literal not in assigned)
+            for index, clause in enumerate(clauses) if not satisfied[index]]
+
+
+def _components(clauses: list[tuple]) -> list[tuple[list, set]]:
+    """Splits the clauses into the groups, which have no variable in
+    common. Returns the clauses of every group with it's variables."""
+    occurrences: dict[int, list[int]] = {}
+    for index, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(abs(literal), []).append(index)
+
+    components = []
+    visited = set()
+    for variable in occurrences:
+        if variable in visited:
+            continue
+        visited.add(variable)
+        stack, indices = [variable], set()
+        while stack:
+            for index in occurrences[stack.pop()]:
+                if index in indices:
+                    continue
+                indices.add(index)
+                for literal in clauses[index]:
+                    if abs(literal) not in visited:
+                        visited.add(abs(literal))
+                        stack.append(abs(literal))
+        component = [clauses[index] for index in sorted(indices)]
+        variables = {abs(literal) for clause in component
+                     for literal in clause}
+        components.append((component, variables))
+    return components
+
+
+def _elimination_order(clauses: Iterable[tuple], variables: Iterable[int],
+                       max_width: int) -> dict[int, int]:
+    """Returns the positions of the variables in the order made by the
+    elimination of the variable of the fewest neighbours (the variables it
+    shares some clause with), which neighbours become the neighbours of
+    each other. Returns None, when some variable has more neighbours than
+    the given width, when it's eliminated."""
+    neighbours = {variable: set() for variable in variables}
+    for clause in clauses:
+        for literal in clause:
+            neighbours[abs(literal)].update(abs(other) for other in clause)
+    heap = []
+    for variable, adjacent in neighbours.items():
+        adjacent.discard(variable)
+        heappush(heap, (len(adjacent), variable))
+
+    order = {}
+    while heap:
+        degree, variable = heappop(heap)
+        if variable in order or degree != len(neighbours[variable]):
+            continue
+        if degree > max_width:
+            return None
+        order[variable] = len(order)
+        adjacent = neighbours.pop(variable)
+        for other in adjacent:
+            neighbours[other] |= adjacent
+            neighbours[other].discard(other)
+            neighbours[other].discard(variable)
+            heappush(heap, (len(neighbours[other]), other))
+    return order
+
+
+def _branching_variable(clauses: list[tuple], decisions: range,
+                        order: dict[int, int]) -> int:
+    """Returns the variable the clauses are split by; the decision variable
+    eliminated last by the order is assigned first, or the most frequent
+    one, when there is no order."""
+    frequency = {}
+    for clause in clauses:
+        for literal in clause:
+            frequency[abs(literal)] = frequency.get(abs(literal), 0) + 1
+    candidates = [variable for variable in frequency
+                  if variable in decisions] or frequency
+    return max(candidates, key=order.get if order else frequency.get)
+
+
+def _count_steps(clauses: list[tuple], variables: set,
+                 cache: _ComponentCache, decisions: range,
+                 order: dict[int, int]):
+    """Counts the models of the clauses over the given variables. The
+    counts of the branches are requested by yielding the clauses and the
+    variables of the branch, while the count is returned. The branches
+    assign the decision variables, while the other ones are left to the
+    propagation as long as there is some decision variable."""
+    assigned = set()
+    clauses = _propagate(clauses, assigned)
+    if clauses is None:
+        return 0
+
+    components = _components(clauses)
+    used = sum(len(component_variables)
+               for _, component_variables in components)
+    count = 1 << (len(variables) - len(assigned) - used)
+
+    for component, component_variables in components:
+        # The clauses keep the order of the sorted clauses they come from,
+        # so the same component is mostly the same tuple
+        key = tuple(component)
+        component_count = cache.get(key)
+        if component_count is None:
+            variable = _branching_variable(component, decisions, order)
+            component_count = (yield component + [(variable,)],
+                               component_variables)
+            component_count += (yield component + [(-variable,)],
+                                component_variables)
+            cache.put(key, component_count)
+        count *= component_count
+        if count == 0:
+            return 0
+    return count
+
+
+def _eliminate(clauses: set[tuple], variables: Iterable[int]) -> set[int]:
+    """Eliminates the given variables from the clauses by the resolution
+    (the clauses of the variable are replaced by all their resolvents),
+    unless it makes more clauses. Returns the eliminated variables.
+
+    The clauses over the remaining variables are satisfied iff there is a
+    value of the eliminated variables satisfying the original ones; the
+    counts are the same, when the eliminated variables are defined by the
+    others."""
+    occurrences: dict[int, set[tuple]] = {}
+    for clause in clauses:
+        for literal in clause:
+            occurrences.setdefault(literal, set()).add(clause)
+
+    eliminated = set()
+    for variable in variables:
+        positive = occurrences.get(variable, set())
+        negative = occurrences.get(-variable, set())
+        resolvents = set()
+        for first in positive:
+            for second in negative:
+                resolvent = set(first) | set(second)
+                resolvent.discard(variable)
+                resolvent.discard(-variable)
+                if not any(-literal in resolvent for literal in resolvent):
+                    resolvents.add(tuple(sorted(resolvent)))
+            if len(resolvents) > len(positive) + len(negative):
+                break
+        if len(resolvents) > len(positive) + len(negative):
+            continue
+
+        eliminated.add(variable)
+        for clause in positive | negative:
+            clauses.discard(clause)
+            for literal in clause:
+                occurrences[literal].discard(clause)
+        for clause in resolvents - clauses:
+            clauses.add(clause)
+            for literal in clause:
+                occurrences.setdefault(literal, set()).add(clause)
+    return eliminated
+
+
+def count_clauses(clauses: Iterable[Iterable[int]], variable_count: int,
+                  cache_size: int = DEFAULT_CACHE_SIZE,
+                  decision_count: int = None) -> int:
+    """Returns the number of the assignments of the variables from 1 to the
+    given count, which satisfy all the clauses.
+
+    Parameters
+    ----------
+    clauses: Iterable of Iterable of int
+        The clauses; the literals of the clauses have to be nonzero and
+        their variables cannot be greater than the variable count.
+
+    variable_count: int
+        Number of the variables the assignments are made of.
+
+    cache_size: int, optional
+        Number of the slots of the cache of the counts of the components.
+
+    decision_count: int, optional
+        Number of the first variables the other ones are defined by, like
+        the variables of the atoms of the Tseitin encoding define it's
+        gates; every model of the first variables has to be extended to at
+        most one model of the clauses. The other variables are eliminated
+        first (while it does not make more clauses) and the counter
+        branches on the first ones. All the variables by default.
+
+    Raises
+    ------
+    Exception
+        When some literal is zero or out of the variables.
+    """
+    normalized = set()
+    for clause in clauses:
+        clause = tuple(sorted(set(clause)))
+        if any(literal == 0 or abs(literal) > variable_count
+               for literal in clause):
+            raise Exception(f"Clause {list(clause)} has invalid literal")
+        if not clause:
+            return 0
+        if not any(-literal in clause for literal in clause):
+            normalized.add(clause)
+
+    variables = set(range(1, variable_count + 1))
+    decisions = range(1, (decision_count or variable_count) + 1)
+    if len(decisions) < variable_count:
+        variables -= _eliminate(normalized, range(
+            variable_count, len(decisions), -1))
+        if () in normalized:
+            return 0
+
+    # Branches are driven by the explicit stack instead of the recursion
+    cache = _ComponentCache(cache_size)
+    order = _elimination_order(normalized, variables, _MAX_ORDER_WIDTH)
+    stack = [_count_steps(sorted(normalized), variables, cache, decisions,
+                          order)]
+    value = None
+    while True:
+        try:
+            request = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            if not stack:
+                return value
+            continue
+        stack.append(_count_steps(*request, cache, decisions, order))
+        value = None
+
+
+def count_models(term: Term, variable_names: Iterable[str] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE) -> int:
+    """Returns the number of the assignments of the variables the term is
+    true for.
+
+    Parameters
+    ----------
+    term: Term
+        The term the models are counted for.
+
+    variable_names: Iterable of str, optional
+        Names of the variables the assignments are made of. These have to
+        contain all the variables of the term. When not given, the
+        variables of the term are used.
+
+    cache_size: int, optional
+        Number of the slots of the cache of the counts of the components.
+
+    Raises
+    ------
+    Exception
+        When there is a variable of the term not contained in the given
+        variable names.
+    """
+    extra = 0
+    if variable_names is not None:
+        names = set(variable_names)
+        missing = set(term.variable_names) - names
+        if missing:
+            raise Exception(
+                f"Variables {sorted(missing)} are needed for counting")
+        extra = len(names) - len(term.variable_names)
+
+    encoding = CnfEncoding(term)
+    # The constant and the atoms are the first variables
+    count = count_clauses(encoding.clauses(), encoding.variable_count,
+                          cache_size, len(encoding.variables) + 1)
+    return count << extra
@@ -0,0 +1,290 @@
+"""This module contains reading and writing of the clauses in the DIMACS CNF
+format, the common format of the SAT problems. The file starts with the
+comments (lines starting by `c`) and the header `p cnf <variables>
+<clauses>`, followed by the clauses; every clause is a list of nonzero
+literals (the variable or it's negation as a negative number) terminated
+by zero.
+
+The files are read in large chunks and the clauses are yielded one by one,
+so the files of any size are read in constant memory. The clauses can be
+fed straight into the solver (`scripts.src.sat.Solver.add_clause`) or the
+counter (`scripts.src.counting.count_clauses`), or they can be turned into
+a term.
+
+The sources and the targets may be paths or binary file objects (e.g.
+opened by `gzip.open`); the file objects are not closed."""
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Mapping
+
+from scripts.src.cnf import CnfEncoding
+from scripts.src.factory import TermFactory
+from scripts.src.operators import Negation, Conjunction, Disjunction
+from scripts.src.term import Term, Atom, Constant
+
+
+# Default number of the bytes read at once
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Number of the clauses written at once
+_BATCH = 4096
+
+# Width the number of the clauses is padded to, when it's not known before
+# the clauses are written
+_COUNT_WIDTH = 20
+
+
+@contextmanager
+def _opened(source, mode: str):
+    """Opens the file of the given path or uses the given file object."""
+    if hasattr(source, "read" if "r" in mode else "write"):
+        yield source
+    else:
+        with open(source, mode) as file:
+            yield file
+
+
+def _lines(source, chunk_size: int) -> Iterator[list[bytes]]:
+    """Yields the lines of the file in the lists read by the chunks."""
+    with _opened(source, "rb") as file:
+        rest = b""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                rest = chunk
+                continue
+            rest = chunk[end + 1:]
+            yield chunk[:end].split(b"\n")
+        if rest:
+            yield [rest]
+
+
+def read_header(source) -> tuple[int, int]:
+    """Returns the numbers of the variables and of the clauses declared by
+    the header of the file.
+
+    Parameters
+    ----------
+    source: str or binary file
+        Path or the file object of the DIMACS file.
+
+    Raises
+    ------
+    Exception
+        When there is no valid header before the clauses.
+    """
+    for lines in _lines(source, 1 << 16):
+        for line in lines:
+            tokens = line.split()
+            if not tokens or tokens[0].startswith(b"c"):
+                continue
+            if tokens[0] != b"p" or tokens[1:2] != [b"cnf"] or len(
+                    tokens) != 4 or not all(t.isdigit() for t in tokens[2:]):
+                raise Exception(f"Invalid header of DIMACS CNF: {line!r}")
+            return int(tokens[2]), int(tokens[3])
+    raise Exception("DIMACS CNF has no header")
+
+
+def read_clauses(source,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+    """Yields the clauses of the DIMACS file one by one as the tuples of
+    the literals. The header is not checked (see `read_header`).
+
+    Parameters
+    ----------
+    source: str or binary file
+        Path or the file object of the DIMACS file.
+
+    chunk_size: int, optional
+        Number of the bytes read at once.
+
+    Raises
+    ------
+    Exception
+        When there is an invalid literal.
+    """
+    clause = []
+    number = 0
+    for lines in _lines(source, chunk_size):
+        for line in lines:
+            number += 1
+            tokens = line.split()
+            if not tokens:
+                continue
+            head = tokens[0][0]
+            if head == 99 or head == 112:       # c and p
+                continue
+            if head == 37:                      # % ends some of the files
+                if clause:
+                    yield tuple(clause)
+                return
+            try:
+                literals = list(map(int, tokens))
+            except ValueError:
+                raise Exception(f"Line {number}: invalid literal in "
+                                f"{line.decode(errors='replace')!r}")
+
+            # Usually the line is exactly one clause
+            if not clause and literals[-1] == 0 and literals.count(0) == 1:
+                literals.pop()
+                yield tuple(literals)
+                continue
+            for literal in literals:
+                if literal:
+                    clause.append(literal)
+                else:
+                    yield tuple(clause)
+                    clause = []
+    if clause:
+        yield tuple(clause)
+
+
+def _junction(operation_type: type, terms: list[Term], make) -> Term:
+    """Joins the terms by a single operation; the single term is returned
+    as it is."""
+    if len(terms) == 1:
+        return terms[0]
+    return make(operation_type, terms)
+
+
+def read_term(source, variable_names: Mapping[int, str] = None,
+              factory: TermFactory = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Term:
+    """Returns the conjunction of the clauses of the DIMACS file. The
+    conjunction and the disjunctions of the clauses are single n-ary
+    operations, so the depth of the term is at most three. Every variable
+    is a single atom shared by all the clauses.
+
+    Parameters
+    ----------
+    source: str or binary file
+        Path or the file object of the DIMACS file.
+
+    variable_names: Mapping of int to str, optional
+        Names of the atoms of the variables; the variables missing there
+        are named `x<variable>`.
+
+    factory: TermFactory, optional
+        Factory the returned term is interned by.
+
+    chunk_size: int, optional
+        Number of the bytes read at once.
+    """
+    if factory is None:
+        def make(operation_type: type, terms: list[Term]) -> Term:
+            return operation_type(terms)
+    else:
+        make = factory.operation
+    names = variable_names or {}
+    literals: dict[int, Term] = {}
+
+    def literal_term(literal: int) -> Term:
+        term = literals.get(literal)
+        if term is None:
+            if literal < 0:
+                term = make(Negation, [literal_term(-literal)])
+            else:
+                name = names.get(literal, f"x{literal}")
+                term = Atom(name) if factory is None else factory.atom(name)
+            literals[literal] = term
+        return term
+
+    false = Constant(False) if factory is None else factory.constant(False)
+    clauses = [_junction(Disjunction, [literal_term(literal)
+                                       for literal in clause], make)
+               if clause else false
+               for clause in read_clauses(source, chunk_size)]
+    if not clauses:
+        return Constant(True) if factory is None else factory.constant(True)
+    return _junction(Conjunction, clauses, make)
+
+
+def write_clauses(target, clauses: Iterable[Iterable[int]],
+                  variable_count: int, clause_count: int = None,
+                  comments: Iterable[str] = ()) -> int:
+    """Writes the clauses in the DIMACS format and returns their number.
+    The clauses are written as they come, so the iterable may be a generator
+    of more clauses than fit into the memory.
+
+    Parameters
+    ----------
+    target: str or binary file
+        Path or the file object the clauses are written to.
+
+    clauses: Iterable of Iterable of int
+        The clauses to be written.
+
+    variable_count: int
+        Number of the variables of the header.
+
+    clause_count: int, optional
+        Number of the clauses of the header. If not given, the clauses are
+        counted while they are written and the header is rewritten then;
+        the file has to be seekable in such case.
+
+    comments: Iterable of str, optional
+        Lines of the comments written before the header.
+    """
+    with _opened(target, "wb") as file:
+        for comment in comments:
+            file.write(f"c {comment}\n".encode())
+        if clause_count is not None:
+            file.write(f"p cnf {variable_count} {clause_count}\n".encode())
+        else:
+            header = file.tell()
+            file.write(f"p cnf {variable_count} ".encode()
+                       + b" " * _COUNT_WIDTH + b"\n")
+
+        count = 0
+        batch = []
+        for clause in clauses:
+            batch.append(" ".join(map(str, clause)))
+            if len(batch) == _BATCH:
+                file.write(" 0\n".join(batch).encode() + b" 0\n")
+                count += len(batch)
+                batch = []
+        if batch:
+            file.write(" 0\n".join(batch).encode() + b" 0\n")
+            count += len(batch)
+
+        if clause_count is None:
+            end = file.tell()
+            file.seek(header)
+            file.write(f"p cnf {variable_count} {count}".encode().ljust(
+                len(f"p cnf {variable_count} ") + _COUNT_WIDTH))
+            file.seek(end)
+        elif clause_count != count:
+            raise Exception(f"Number of the clauses ({count}) is not the "
+                            f"declared one ({clause_count})")
+    return count
+
+
+def write_term(target, term: Term, polarity: bool = False) -> CnfEncoding:
+    """Writes the clauses of the term (see `scripts.src.cnf.CnfEncoding`)
+    in the DIMACS format. Returns the encoding, which turns the models of
+    the clauses back into the values of the atoms.
+
+    The comments list the variables of the atoms as `c <variable> <name>`.
+
+    Parameters
+    ----------
+    target: str or binary file
+        Path or the seekable file object the clauses are written to.
+
+    term: Term
+        The term to be written.
+
+    polarity: bool, optional
+        If set, the Plaisted-Greenbaum refinement is used; the clauses are
+        then only equisatisfiable with the term.
+    """
+    encoding = CnfEncoding(term, polarity)
+    comments = [f"{variable} {name}"
+                for name, variable in encoding.variables.items()]
+    write_clauses(target, encoding.clauses(), encoding.variable_count,
+                  comments=comments)
+    return encoding
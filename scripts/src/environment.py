@@ -1,12 +1,14 @@
 """"""
 
-from typing import Iterable
+from typing import Callable, Iterable, Mapping
 
 
 class Declaration:
     """Instances of this class sets a declaration of a logic value for
     variable of specified name."""
 
+    __slots__ = ("_declaration_name", "_value")
+
     def __init__(self, declaration_name: str, value: bool):
         """Initor creating the instance.
 
@@ -37,20 +39,28 @@ class Environment:
     """Environment is a construction used for setting the set of variables
     with given logic values. This abstraction works as a container of
     declarations (instances of the class Declaration) and provides it's
-    general functionalities, like search and summary."""
+    general functionalities, like search and summary.
+
+    Declarations are indexed by their names, so searching for a declaration
+    or it's value takes constant time regardless of the number of declared
+    variables."""
 
     def __init__(self):
-        self._declarations: list[Declaration] = []
+        # Declarations indexed by their names (in order of their addition)
+        self._declarations: dict[str, Declaration] = {}
+
+        # Values of the declarations indexed by their names
+        self._values: dict[str, bool] = {}
 
     @property
     def declarations(self) -> tuple[Declaration]:
         """Returns a tuple of the declarations."""
-        return tuple(self._declarations)
+        return tuple(self._declarations.values())
 
     @property
     def declaration_names(self) -> tuple[str]:
         """Returns a tuple of names of declared variables."""
-        return tuple(map(lambda d: str(d.declaration_name), self.declarations))
+        return tuple(map(str, self._declarations))
 
     @property
     def is_empty(self) -> bool:
@@ -66,9 +76,21 @@ class Environment:
         declaration_name: str
             Name of the variable the search should be performed.
         """
-        for declaration in self.declarations:
-            if declaration.declaration_name == declaration_name:
-                return declaration
+        return self._declarations.get(declaration_name)
+
+    def lookup(self, declaration_name: str) -> bool:
+        """Returns the value declared for the variable of the given name.
+        When there is no such declaration, returns None.
+
+        This is the fast path used when evaluating terms, as it does not
+        need to touch the declaration itself.
+
+        Parameters
+        ----------
+        declaration_name: str
+            Name of the variable the value should be returned for.
+        """
+        return self._values.get(declaration_name)
 
     def has_declaration(self, declaration_name: str) -> bool:
         """Returns if there is a declaration for variable of the given name.
@@ -80,7 +102,7 @@ class Environment:
             declaration is contained. If there is such a declaration, returns
             True, else False.
         """
-        return self.declaration(declaration_name) is not None
+        return declaration_name in self._declarations
 
     def add_declaration(self, declaration: Declaration):
         """Tries to add the given declaration. If there is a declaration of
@@ -96,8 +118,10 @@ class Environment:
         Exception
             When there is one declaration of the same name already
         """
-        if not self.has_declaration(declaration.declaration_name):
-            self._declarations.append(declaration)
+        name = declaration.declaration_name
+        if name not in self._declarations:
+            self._declarations[name] = declaration
+            self._values[name] = declaration.value
         else:
             raise Exception(f"Declaration '{declaration.declaration_name}' "
                             f"is already registered.")
@@ -139,7 +163,106 @@ class Environment:
             self.add_declaration(declaration)
 
     def __len__(self) -> int:
-        return len(self.declarations)
+        return len(self._declarations)
+
+
+class MutableEnvironment(Environment):
+    """Environment, which values can be changed after they are declared.
+    Every change is announced to the subscribed listeners, so the values
+    derived from the environment (e.g. the values of the terms) can be
+    updated instead of computed again."""
+
+    def __init__(self):
+        Environment.__init__(self)
+        self._listeners: list[Callable[[str, bool], None]] = []
+
+    def subscribe(self, listener: Callable[[str, bool], None]):
+        """Registers the listener called with the name of the variable and
+        it's new value whenever the value is declared or changed. When the
+        declaration is removed, the value is None.
+
+        Parameters
+        ----------
+        listener: Callable
+            Function receiving the name and the new value.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, bool], None]):
+        """Removes the registered listener.
+
+        Parameters
+        ----------
+        listener: Callable
+            The listener to be removed.
+
+        Raises
+        ------
+        Exception
+            When the listener is not registered.
+        """
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            raise Exception(f"Listener '{listener}' is not registered")
 
+    def add_declaration(self, declaration: Declaration):
+        Environment.add_declaration(self, declaration)
+        self._notify(declaration.declaration_name, declaration.value)
 
+    def set_value(self, declaration_name: str, value: bool):
+        """Sets the value of the variable of the given name. If there is no
+        declaration of the variable, it's added. The listeners are notified
+        only if the value actually changes.
+
+        Parameters
+        ----------
+        declaration_name: str
+            Name of the variable the value is set for.
+
+        value: bool
+            The new logic value of the variable.
+        """
+        if declaration_name not in self._declarations:
+            self.add_values(declaration_name, value)
+        elif self._values[declaration_name] != value:
+            self._declarations[declaration_name] = Declaration(
+                declaration_name, value)
+            self._values[declaration_name] = value
+            self._notify(declaration_name, value)
+
+    def remove_declaration(self, declaration_name: str):
+        """Removes the declaration of the variable of the given name, so the
+        variable is undefined again.
+
+        Parameters
+        ----------
+        declaration_name: str
+            Name of the variable the declaration is removed for.
+
+        Raises
+        ------
+        Exception
+            When there is no declaration of this name.
+        """
+        if declaration_name not in self._declarations:
+            raise Exception(f"Declaration '{declaration_name}' is not "
+                            f"registered.")
+        del self._declarations[declaration_name]
+        del self._values[declaration_name]
+        self._notify(declaration_name, None)
+
+    def set_values(self, values: Mapping[str, bool]):
+        """Sets the values of all the given variables (see `set_value`).
+
+        Parameters
+        ----------
+        values: Mapping of str to bool
+            New values indexed by the names of the variables.
+        """
+        for name, value in values.items():
+            self.set_value(name, value)
 
+    def _notify(self, declaration_name: str, value: bool):
+        for listener in tuple(self._listeners):
+            listener(declaration_name, value)
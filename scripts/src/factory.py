@@ -0,0 +1,187 @@
+"""This module contains a factory of interned terms. The factory keeps a
+table of all the terms it has made, so structurally equal terms are made
+just once and shared. Such terms are immutable; comparing and hashing them
+takes constant time and cloning them is free."""
+
+from typing import Callable, Iterable
+from weakref import WeakValueDictionary
+
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Term, Atom, Constant, Operation, CustomOperation
+
+
+class TermFactory:
+    """Factory of the interned terms. Every term made by the factory is
+    looked up in the table of already made terms first, so there is at most
+    one instance of every structurally distinct term.
+
+    The table does not keep the terms alive; terms no longer used anywhere
+    else are dropped from it."""
+
+    def __init__(self):
+        self._table = WeakValueDictionary()
+
+    def atom(self, atom_name: str, value: bool = None) -> Atom:
+        """Returns the interned atom of the given name and value.
+
+        Parameters
+        ----------
+        atom_name: str
+            Name of the atom.
+
+        value: bool, optional
+            Value of the atom; not given if the atom is variable.
+        """
+        key = (Atom, atom_name, value)
+        return self._unique(key, lambda: Atom(atom_name, value))
+
+    def constant(self, value: bool, constant_name: str = None) -> Constant:
+        """Returns the interned constant of the given value and name.
+
+        Parameters
+        ----------
+        value: bool
+            Logical value of the constant.
+
+        constant_name: str, optional
+            Name of the constant. If not given, it's generated.
+        """
+        if not constant_name:
+            constant_name = "TRUE" if value else "FALSE"
+        key = (Constant, constant_name, value)
+        return self._unique(key, lambda: Constant(value, constant_name))
+
+    def negation(self, term: Term) -> Negation:
+        """Returns the interned negation of the given term."""
+        return self.operation(Negation, (term,))
+
+    def conjunction(self, first: Term, second: Term,
+                    *others: Term) -> Conjunction:
+        """Returns the interned conjunction of the given terms."""
+        return self.operation(Conjunction, (first, second, *others))
+
+    def disjunction(self, first: Term, second: Term,
+                    *others: Term) -> Disjunction:
+        """Returns the interned disjunction of the given terms."""
+        return self.operation(Disjunction, (first, second, *others))
+
+    def implication(self, premise: Term, consequence: Term) -> Implication:
+        """Returns the interned implication of the given terms."""
+        return self.operation(Implication, (premise, consequence))
+
+    def equivalence(self, first: Term, second: Term) -> Equivalence:
+        """Returns the interned equivalence of the given terms."""
+        return self.operation(Equivalence, (first, second))
+
+    def operation(self, operation_type: type, terms: Iterable[Term]):
+        """Returns the interned operation of the given type over the given
+        terms. The type has to be constructible from the terms only.
+
+        Parameters
+        ----------
+        operation_type: type
+            Subclass of Operation to be made.
+
+        terms: Iterable of Term
+            The terms of the operation; these are interned too.
+        """
+        terms = tuple(map(self.intern, terms))
+        key = (operation_type, *map(id, terms))
+        return self._unique(key, lambda: operation_type(terms))
+
+    def custom(self, cardinality: int, terms: Iterable[Term],
+               evaluator: Callable,
+               vectorized_evaluator: Callable = None) -> CustomOperation:
+        """Returns the interned custom operation. Custom operations are
+        equal only if they share the very same evaluators.
+
+        Parameters
+        ----------
+        cardinality: int
+            The number of terms the operation works with.
+
+        terms: Iterable of Term
+            The terms of the operation; these are interned too.
+
+        evaluator: Callable
+            The function evaluating the operation.
+
+        vectorized_evaluator: Callable, optional
+            The function evaluating the operation over many assignments.
+        """
+        terms = tuple(map(self.intern, terms))
+        key = (CustomOperation, cardinality, evaluator, vectorized_evaluator,
+               *map(id, terms))
+        return self._unique(key, lambda: CustomOperation(
+            cardinality, terms, evaluator, vectorized_evaluator))
+
+    def intern(self, term: Term) -> Term:
+        """Returns the interned term structurally equal to the given one.
+        The given term itself stays untouched.
+
+        Parameters
+        ----------
+        term: Term
+            Any term to be interned.
+
+        Raises
+        ------
+        Exception
+            When the term is neither an atom nor an operation.
+        """
+        if term._factory is self:
+            return term
+
+        interned = {}
+        stack = [term]
+        while stack:
+            current = stack[-1]
+            if id(current) in interned:
+                stack.pop()
+            elif current._factory is self:
+                stack.pop()
+                interned[id(current)] = current
+            elif isinstance(current, Constant):
+                stack.pop()
+                interned[id(current)] = self.constant(
+                    current.value, current.atom_name)
+            elif isinstance(current, Atom):
+                stack.pop()
+                interned[id(current)] = self.atom(
+                    current.atom_name, current.value)
+            elif isinstance(current, Operation):
+                pending = [t for t in current._terms if id(t) not in interned]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                terms = [interned[id(t)] for t in current._terms]
+                if isinstance(current, CustomOperation):
+                    interned[id(current)] = self.custom(
+                        current.cardinality, terms, current._evaluator,
+                        current.vectorized_evaluator)
+                else:
+                    interned[id(current)] = self.operation(
+                        type(current), terms)
+            else:
+                raise Exception(f"Term '{current}' cannot be interned")
+        return interned[id(term)]
+
+    def _unique(self, key: tuple, create: Callable) -> Term:
+        """Returns the term of the given key from the table. If there is no
+        such term, it's created, made immutable and stored."""
+        term = self._table.get(key)
+        if term is None:
+            term = create()
+            children = getattr(term, "_terms", ())
+            term._hash = hash(
+                (key[0].__name__, *key[1:len(key) - len(children)],
+                 *(child._hash for child in children)))
+            term._factory = self
+            self._table[key] = term
+        return term
+
+    def __len__(self) -> int:
+        """Returns the number of the interned terms alive."""
+        return len(self._table)
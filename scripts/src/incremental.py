@@ -0,0 +1,228 @@
+"""This module contains an incremental evaluation of terms. The evaluation
+keeps the values of all the subterms and listens to the changes of the
+values of the mutable environment; when some value changes, only the
+subterms containing the changed atoms are evaluated again, and only while
+their values keep changing.
+
+This makes evaluating the same large term over slightly different values
+(e.g. flipping one variable at a time) take time proportional to the part
+of the term actually affected."""
+
+from heapq import heappush, heappop
+from typing import Callable
+from weakref import finalize, ref
+
+from scripts.src.environment import Environment, MutableEnvironment
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Term, Atom, Operation, _watch, _unwatch
+
+
+def _negation(values: list) -> bool:
+    first, = values
+    return None if first is None else not first
+
+
+def _conjunction(values: list) -> bool:
+    if False in values:
+        return False
+    return None if None in values else True
+
+
+def _disjunction(values: list) -> bool:
+    if True in values:
+        return True
+    return None if None in values else False
+
+
+def _implication(values: list) -> bool:
+    first, second = values
+    if first is False or second is True:
+        return True
+    return None if first is None or second is None else False
+
+
+def _equivalence(values: list) -> bool:
+    first, second = values
+    return None if first is None or second is None else first == second
+
+
+# Functions combining the values of the terms of the operators; None is the
+# value of the subterm, which cannot be evaluated (some atom is undefined)
+_FUNCTIONS = {
+    Negation: _negation,
+    Conjunction: _conjunction,
+    Disjunction: _disjunction,
+    Implication: _implication,
+    Equivalence: _equivalence,
+}
+
+
+def _function(operation: Operation) -> Callable[[list], bool]:
+    """Returns the function combining the values of the terms of the given
+    operation."""
+    function = _FUNCTIONS.get(type(operation))
+    if function is None:
+        def function(values: list) -> bool:
+            if None in values:
+                return None
+            return operation.evaluate_values(values)
+    return function
+
+
+class IncrementalEvaluation:
+    """Evaluation of the term keeping the values of all it's subterms. When
+    the term is evaluated in the `MutableEnvironment`, the evaluation
+    listens to the changes of it's values and it re-evaluates just the
+    affected subterms.
+
+    Changes of the structure of the term and of the names of it's atoms
+    are recognized too (the whole term is evaluated again then); only the
+    changes of the contained terms are watched, so other terms can be
+    changed or made freely. The changes of the values of the defined atoms
+    are not recognized; these are read only once."""
+
+    def __init__(self, term: Term, env: Environment = None):
+        """
+        Parameters
+        ----------
+        term: Term
+            The term to be evaluated.
+
+        env: Environment, optional
+            The environment of the values of the variables. If it's
+            mutable, it's changes are followed.
+        """
+        self._term = term
+        self._env = env if env is not None else Environment()
+        self._dirty: set[str] = set()
+        self._recomputed = 0
+
+        # Ids of the watched terms; the list is kept, so the terms are not
+        # watched anymore when the evaluation is dropped
+        self._watcher = ref(self)
+        self._watched: list[int] = []
+        finalize(self, _unwatch, self._watched, self._watcher)
+        self._build()
+        if isinstance(self._env, MutableEnvironment):
+            self._env.subscribe(self._changed)
+
+    @property
+    def term(self) -> Term:
+        """The evaluated term."""
+        return self._term
+
+    @property
+    def value(self) -> bool:
+        """Current value of the term.
+
+        Raises
+        ------
+        Exception
+            When the value depends on an atom, which is not defined.
+        """
+        value = self.partial_value
+        if value is None:
+            names = [name for name, nodes in self._atoms.items()
+                     if self._values[nodes[0]] is None]
+            raise Exception(f"Value of atoms {names} is not defined")
+        return value
+
+    @property
+    def partial_value(self) -> bool:
+        """Current value of the term or None, if it depends on the atoms,
+        which are not defined (e.g. `a & b` is False when `a` is False,
+        regardless of `b`)."""
+        self._update()
+        return self._values[-1]
+
+    @property
+    def recomputed(self) -> int:
+        """Number of the subterms evaluated by the last update."""
+        return self._recomputed
+
+    def close(self):
+        """Stops following the changes of the environment."""
+        if isinstance(self._env, MutableEnvironment):
+            self._env.unsubscribe(self._changed)
+
+    def _changed(self, name: str, value: bool):
+        """Listener of the changes of the environment."""
+        self._dirty.add(name)
+
+    def _term_changed(self, term: Term):
+        """Watcher of the changes of the contained terms."""
+        self._stale = True
+
+    def _build(self):
+        """Evaluates all the subterms of the term and records the subterms
+        using every one of them."""
+        nodes = list(self._term.postorder())
+        index = {id(node): i for i, node in enumerate(nodes)}
+
+        _unwatch(self._watched, self._watcher)
+        self._watched[:] = index
+        _watch(self._watched, self._watcher)
+        self._stale = False
+        self._children: list[tuple[int]] = []
+        self._parents: list[list[int]] = [[] for _ in nodes]
+        self._functions: list[Callable] = []
+        self._atoms: dict[str, list[int]] = {}
+        self._values: list[bool] = []
+        for i, node in enumerate(nodes):
+            if isinstance(node, Operation):
+                children = tuple(index[id(t)] for t in node._terms)
+                for child in set(children):
+                    self._parents[child].append(i)
+                self._children.append(children)
+                self._functions.append(_function(node))
+                self._values.append(self._functions[i](
+                    [self._values[c] for c in children]))
+            else:
+                self._children.append(())
+                self._functions.append(None)
+                value = node.value if isinstance(node, Atom) else None
+                if value is None:
+                    self._atoms.setdefault(node.atom_name, []).append(i)
+                    value = self._env.lookup(node.atom_name)
+                self._values.append(value)
+        self._dirty.clear()
+        self._recomputed = len(nodes)
+
+    def _update(self):
+        """Evaluates the subterms affected by the changed values, from the
+        atoms up, as long as their values change."""
+        if self._stale:
+            self._build()
+            return
+        self._recomputed = 0
+        if not self._dirty:
+            return
+
+        values, parents = self._values, self._parents
+        queue: list[int] = []
+        queued = set()
+        for name in self._dirty:
+            value = self._env.lookup(name)
+            for node in self._atoms.get(name, ()):
+                if values[node] != value:
+                    values[node] = value
+                    for parent in parents[node]:
+                        if parent not in queued:
+                            queued.add(parent)
+                            heappush(queue, parent)
+        self._dirty.clear()
+
+        # Subterms are ordered after their terms, so the queue gives every
+        # subterm after all it's changed terms
+        children, functions = self._children, self._functions
+        while queue:
+            node = heappop(queue)
+            self._recomputed += 1
+            value = functions[node]([values[c] for c in children[node]])
+            if value != values[node]:
+                values[node] = value
+                for parent in parents[node]:
+                    if parent not in queued:
+                        queued.add(parent)
+                        heappush(queue, parent)
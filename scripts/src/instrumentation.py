@@ -0,0 +1,216 @@
+"""This module contains an instrumented evaluation of terms. It evaluates
+the term exactly the way `Term.evaluate` does (including the
+short-circuiting of the operators), but it counts the calls of the
+operators, the visits of the subterms and the lookups of the variables,
+measures the time spent in every subterm and reports all the steps to the
+optional trace callback.
+
+The instrumentation is opt-in; `Term.evaluate` itself is left untouched,
+so the evaluation without it does not pay anything. The instrumented one
+drives the evaluation steps of the operations (see
+`Operation._evaluation_steps`) by an explicit stack, thus it works for
+terms of any depth.
+
+The measured times can be exported as the collapsed stacks accepted by the
+flame graph tools (e.g. `flamegraph.pl` or speedscope); every stack is the
+path of the operators from the root to the subterm."""
+
+import time
+from typing import Callable
+
+from scripts.src.environment import Environment
+from scripts.src.term import Term, Atom, Operation
+
+
+class Instrumentation:
+    """Collector of the statistics of the instrumented evaluations. The
+    statistics of all the evaluations are summed up until `reset`."""
+
+    def __init__(self, trace: Callable[[str, Term, bool], None] = None,
+                 timing: bool = True):
+        """
+        Parameters
+        ----------
+        trace: Callable, optional
+            Function called with the event ('enter' or 'exit'), the term
+            and it's value (None for 'enter') whenever the evaluation of
+            any subterm starts or ends.
+
+        timing: bool, optional
+            If the times of the subterms should be measured.
+        """
+        self._trace = trace
+        self._timing = timing
+        self.reset()
+
+    def reset(self):
+        """Forgets all the collected statistics."""
+        self._evaluations = 0
+        self._operator_calls: dict[str, int] = {}
+        self._operator_times: dict[str, int] = {}
+        self._visits: dict[Term, int] = {}
+        self._times: dict[Term, int] = {}
+        # Stacks are numbered; every one is given by the number of the
+        # parent stack (-1 for none) and the name of it's last frame
+        self._frames: dict[tuple[int, str], int] = {}
+        self._stack_times: list[int] = []
+        self._lookups = 0
+        self._lookup_misses = 0
+
+    @property
+    def evaluations(self) -> int:
+        """Number of the instrumented evaluations."""
+        return self._evaluations
+
+    @property
+    def operator_calls(self) -> dict[str, int]:
+        """Numbers of the evaluated operations by the names of their
+        types."""
+        return dict(self._operator_calls)
+
+    @property
+    def operator_times(self) -> dict[str, int]:
+        """Times (in nanoseconds) spent in the operations by the names of
+        their types; the times of their subterms are not included."""
+        return dict(self._operator_times)
+
+    @property
+    def lookups(self) -> int:
+        """Number of the values of the variables looked up in the
+        environment."""
+        return self._lookups
+
+    @property
+    def lookup_misses(self) -> int:
+        """Number of the variables not found in the environment."""
+        return self._lookup_misses
+
+    def visits(self, term: Term) -> int:
+        """Returns how many times the given subterm was evaluated."""
+        return self._visits.get(term, 0)
+
+    def subtree_time(self, term: Term) -> int:
+        """Returns the time (in nanoseconds) spent in the given subterm,
+        including it's own subterms."""
+        return self._times.get(term, 0)
+
+    def most_expensive(self, count: int = 10) -> list[tuple[Term, int]]:
+        """Returns the given number of the subterms with the highest times
+        (see `subtree_time`), the most expensive first."""
+        return sorted(self._times.items(), key=lambda item: item[1],
+                      reverse=True)[:count]
+
+    def evaluate(self, term: Term, env: Environment = None) -> bool:
+        """Evaluates the term the same way as `Term.evaluate` while
+        collecting the statistics.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be evaluated.
+
+        env: Environment, optional
+            Declaration of values for specified variables.
+
+        Raises
+        ------
+        Exception
+            When the evaluation cannot be done. Typical reason is that
+            there is an atomic variable without specified value.
+        """
+        self._evaluations += 1
+        clock = time.perf_counter_ns if self._timing else _no_time
+
+        # Every entry is the term, it's steps (None for the terms evaluated
+        # as a whole), it's stack, the start and the time of it's subterms
+        entries = []
+        value = None
+        self._enter(term, -1, entries, env, clock)
+        while entries:
+            entry = entries[-1]
+            steps = entry[1]
+            if steps is not None:
+                try:
+                    subterm = steps.send(value)
+                except StopIteration as stop:
+                    value = stop.value
+                else:
+                    value = None
+                    self._enter(subterm, entry[2], entries, env, clock)
+                    continue
+            else:
+                value = entry[0].evaluate(env)
+            self._exit(entries, value, clock)
+        return value
+
+    def _enter(self, term: Term, parent: int, entries: list,
+               env: Environment, clock: Callable[[], int]):
+        """Starts the evaluation of the subterm."""
+        self._visits[term] = self._visits.get(term, 0) + 1
+        if self._trace is not None:
+            self._trace("enter", term, None)
+
+        if isinstance(term, Operation):
+            # The subterms are given to the trace, so a clone is evaluated
+            # over it's own terms
+            term._own_terms()
+            name = type(term).__name__
+            self._operator_calls[name] = self._operator_calls.get(name, 0) + 1
+            steps = term._evaluation_steps(env)
+        else:
+            name = term.atom_name if isinstance(term, Atom) else str(term)
+            steps = None
+            if isinstance(term, Atom) and not term.is_defined:
+                self._lookups += 1
+                if env is None or not env.has_declaration(term.atom_name):
+                    self._lookup_misses += 1
+
+        stack = self._frames.get((parent, name))
+        if stack is None:
+            stack = self._frames[parent, name] = len(self._frames)
+            self._stack_times.append(0)
+        entries.append([term, steps, stack, clock(), 0])
+
+    def _exit(self, entries: list, value: bool, clock: Callable[[], int]):
+        """Finishes the evaluation of the subterm of the last entry."""
+        term, _, stack, start, nested = entries.pop()
+        elapsed = clock() - start
+        self._times[term] = self._times.get(term, 0) + elapsed
+        own = elapsed - nested
+        self._stack_times[stack] += own
+        if isinstance(term, Operation):
+            name = type(term).__name__
+            self._operator_times[name] = (
+                self._operator_times.get(name, 0) + own)
+        if entries:
+            entries[-1][4] += elapsed
+        if self._trace is not None:
+            self._trace("exit", term, value)
+
+    def collapsed_stacks(self) -> str:
+        """Returns the measured times in the collapsed stack format of the
+        flame graphs; one line per stack of the operators (separated by
+        semicolons) followed by the time (in nanoseconds) spent in the last
+        of them."""
+        paths = []
+        for parent, name in self._frames:
+            paths.append(name if parent < 0 else f"{paths[parent]};{name}")
+        return "".join(f"{path} {elapsed}\n"
+                       for path, elapsed in zip(paths, self._stack_times))
+
+    def report(self) -> str:
+        """Returns the table of the calls and the times of the operators
+        together with the numbers of the lookups."""
+        lines = [f"{'operator':<20} {'calls':>10} {'time [us]':>12}"]
+        for name, calls in sorted(self._operator_calls.items(),
+                                  key=lambda item: -item[1]):
+            elapsed = self._operator_times.get(name, 0) / 1000
+            lines.append(f"{name:<20} {calls:>10} {elapsed:>12.1f}")
+        lines.append(f"evaluations: {self._evaluations}, "
+                     f"lookups: {self._lookups}, "
+                     f"misses: {self._lookup_misses}")
+        return "\n".join(lines)
+
+
+def _no_time() -> int:
+    return 0
@@ -0,0 +1,91 @@
+"""This module contains an enumeration of the models of terms, i.e. the
+assignments of the variables the term is true for (so called AllSAT).
+
+The models are searched by assigning the variables one by one, while the
+term is evaluated incrementally over the partial assignment (see
+`scripts.src.incremental`). Once the partial assignment decides the value
+of the term, the rest of the variables is not searched; when the term is
+false, there is no model there, and when it's true, every completion of
+the assignment is a model. The models are yielded lazily, so only the
+current assignment is held in memory."""
+
+from itertools import product
+from typing import Iterable, Iterator
+
+from scripts.src.environment import Environment, MutableEnvironment
+from scripts.src.incremental import IncrementalEvaluation
+from scripts.src.term import Term
+
+
+def models(term: Term, variable_names: Iterable[str] = None,
+           limit: int = None) -> Iterator[Environment]:
+    """Yields the models of the term one by one, each as a new environment.
+
+    Parameters
+    ----------
+    term: Term
+        The term the models are searched for.
+
+    variable_names: Iterable of str, optional
+        Names of the variables the models are projected onto; every
+        assignment of these variables, which can be completed to a model
+        of the term, is yielded once. All the variables of the term by
+        default.
+
+    limit: int, optional
+        The largest number of the models to be yielded.
+    """
+    if variable_names is None:
+        projected = tuple(term.variable_names)
+    else:
+        projected = tuple(dict.fromkeys(variable_names))
+    index = term.variable_index
+    relevant = tuple(n for n in projected if n in index)
+    skipped = set(relevant)
+    hidden = tuple(n for n in term.variable_names if n not in skipped)
+    order = relevant + hidden
+    if limit is not None and limit <= 0:
+        return
+
+    env = MutableEnvironment()
+    evaluation = IncrementalEvaluation(term, env)
+    try:
+        # Values to be tried yet for every assigned variable
+        alternatives: list[list[bool]] = []
+        count = 0
+        while True:
+            value = evaluation.partial_value
+            depth = len(alternatives)
+            if value is True:
+                # All the completions of the projected variables are models
+                assigned = {n: env.lookup(n) for n in relevant[:depth]}
+                free = [n for n in projected if n not in assigned]
+                for values in product((False, True), repeat=len(free)):
+                    assigned.update(zip(free, values))
+                    model = Environment()
+                    for name in projected:
+                        model.add_values(name, assigned[name])
+                    yield model
+                    count += 1
+                    if count == limit:
+                        return
+
+                # Other completions of the hidden variables are the same
+                while len(alternatives) > len(relevant):
+                    alternatives.pop()
+                    env.remove_declaration(order[len(alternatives)])
+            elif value is None:
+                alternatives.append([True])
+                env.set_value(order[depth], False)
+                continue
+
+            # Backtracking to the last variable with an untried value
+            while alternatives and not alternatives[-1]:
+                alternatives.pop()
+                env.remove_declaration(order[len(alternatives)])
+            if not alternatives:
+                return
+            env.set_value(order[len(alternatives) - 1],
+                          alternatives[-1].pop())
+    finally:
+        evaluation.close()
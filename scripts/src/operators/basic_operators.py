@@ -4,7 +4,42 @@ equivalence.
 """
 
 
-from scripts.src.term import Operation, Environment, Term
+from scripts.src.term import Operation, Environment, Term, Algebra, _constant
+
+
+def _value(term: Term) -> bool:
+    """Returns the value of the constant resulting from the partial
+    evaluation, or None for the residual term."""
+    return getattr(term, "_value", None)
+
+
+def _negated(term: Term, like: Term) -> Term:
+    """Returns the negation of the residual term made like the given
+    term; the double negation is removed."""
+    if type(term) is Negation:
+        return term._terms[0]
+    if like._factory is not None:
+        return like._factory.negation(term)
+    return Negation([term])
+
+
+def _partial_junction(operation: Operation, dominant: bool):
+    """Partial evaluation steps of the conjunction (the dominant value is
+    False) or the disjunction (True). The known terms of the other value
+    are left out of the residual operation."""
+    residual = []
+    for term in operation._terms:
+        result = yield term
+        value = _value(result)
+        if value is dominant:
+            return result
+        if value is None:
+            residual.append(result)
+    if not residual:
+        return _constant(not dominant, operation)
+    if len(residual) == 1:
+        return residual[0]
+    return operation._with_terms(residual)
 
 
 class Negation(Operation):
@@ -12,13 +47,14 @@ class Negation(Operation):
     the value of it's only internal term on the other one. This means there
     is it's cardinality equal to one."""
 
+    __slots__ = ()
+
     @property
     def cardinality(self) -> int:
         return 1
 
-    @property
-    def clone(self) -> "Term":
-        return Negation(tuple(map(lambda t: t.clone, self.terms)))
+    def combine(self, values: tuple, algebra: Algebra):
+        return ~values[0]
 
     def evaluate(self, env: Environment = None) -> bool:
         """Returns the value of the evaluated term turned on the other one.
@@ -34,25 +70,49 @@ class Negation(Operation):
             When the internal term cannot be evaluated due to the lack of
             certainty when evaluating.
         """
-        return not self.terms[0].evaluate(env)
+        try:
+            return not self._terms[0].evaluate(env)
+        except RecursionError:
+            return self._evaluate_iteratively(env)
+
+    def _evaluation_steps(self, env: Environment):
+        return not (yield self._terms[0])
+
+    def _partial_steps(self):
+        term = yield self._terms[0]
+        value = _value(term)
+        if value is not None:
+            return _constant(not value, self)
+        return self._with_terms([term])
 
 
 class Conjunction(Operation):
     """Conjunction (AND) is operator, which returns the lowest of the values.
-    In the case of propositional logic, it's true iff both of the values are
-    true."""
+    In the case of propositional logic, it's true iff all of the values are
+    true.
+
+    The conjunction works with any number (at least two) of terms, so the
+    conjunctions of many terms (e.g. the clauses of CNF) do not have to be
+    nested. These are evaluated by a single loop stopping at the first
+    false term."""
+
+    __slots__ = ()
+
+    variadic = True
 
     @property
     def cardinality(self) -> int:
-        return 2
+        return len(self._terms)
 
-    @property
-    def clone(self) -> "Term":
-        return Conjunction(tuple(map(lambda t: t.clone, self.terms)))
+    def combine(self, values: tuple, algebra: Algebra):
+        result = values[0]
+        for value in values[1:]:
+            result = result & value
+        return result
 
     def evaluate(self, env: Environment = None) -> bool:
-        """Returns the value calculated of both of the terms. It returns True
-        iff both the terms are evaluated as True.
+        """Returns the value calculated of all the terms. It returns True
+        iff all the terms are evaluated as True.
 
         Parameters
         ----------
@@ -65,24 +125,52 @@ class Conjunction(Operation):
             When the internal term cannot be evaluated due to the lack of
             certainty when evaluating.
         """
-        return self.terms[0].evaluate(env) and self.terms[1].evaluate(env)
+        try:
+            terms = self._terms
+            if len(terms) == 2:
+                # The most common case is evaluated without the loop
+                return terms[0].evaluate(env) and terms[1].evaluate(env)
+            for term in terms:
+                if not term.evaluate(env):
+                    return False
+            return True
+        except RecursionError:
+            return self._evaluate_iteratively(env)
+
+    def _evaluation_steps(self, env: Environment):
+        for term in self._terms:
+            if not (yield term):
+                return False
+        return True
+
+    def _partial_steps(self):
+        return (yield from _partial_junction(self, False))
 
 
 class Disjunction(Operation):
-    """Disjunction is a logic operator returning the highest value of both
-    of the terms inside. In propositional logic it returns true when at least
-    one of the terms are evaluated as true."""
+    """Disjunction is a logic operator returning the highest value of the
+    terms inside. In propositional logic it returns true when at least one
+    of the terms are evaluated as true.
+
+    The disjunction works with any number (at least two) of terms, the same
+    way as the conjunction does."""
+
+    __slots__ = ()
+
+    variadic = True
 
     @property
     def cardinality(self) -> int:
-        return 2
+        return len(self._terms)
 
-    @property
-    def clone(self) -> "Term":
-        return Disjunction(tuple(map(lambda t: t.clone, self.terms)))
+    def combine(self, values: tuple, algebra: Algebra):
+        result = values[0]
+        for value in values[1:]:
+            result = result | value
+        return result
 
     def evaluate(self, env: Environment = None) -> bool:
-        """Returns the value calculated of both of the terms. It returns True
+        """Returns the value calculated of all the terms. It returns True
         if at least one of the terms is evaluated as true.
 
         Parameters
@@ -96,7 +184,26 @@ class Disjunction(Operation):
             When the internal term cannot be evaluated due to the lack of
             certainty when evaluating.
         """
-        return self.terms[0].evaluate(env) or self.terms[1].evaluate(env)
+        try:
+            terms = self._terms
+            if len(terms) == 2:
+                # The most common case is evaluated without the loop
+                return terms[0].evaluate(env) or terms[1].evaluate(env)
+            for term in terms:
+                if term.evaluate(env):
+                    return True
+            return False
+        except RecursionError:
+            return self._evaluate_iteratively(env)
+
+    def _evaluation_steps(self, env: Environment):
+        for term in self._terms:
+            if (yield term):
+                return True
+        return False
+
+    def _partial_steps(self):
+        return (yield from _partial_junction(self, True))
 
 
 class Implication(Operation):
@@ -106,13 +213,14 @@ class Implication(Operation):
     has to be true to be the implication true. If the premise is not true,
     the result is always true."""
 
+    __slots__ = ()
+
     @property
     def cardinality(self) -> int:
         return 2
 
-    @property
-    def clone(self) -> "Term":
-        return Implication(tuple(map(lambda t: t.clone, self.terms)))
+    def combine(self, values: tuple, algebra: Algebra):
+        return ~values[0] | values[1]
 
     def evaluate(self, env: Environment = None) -> bool:
         """Returns the value calculated of both of the terms. It returns True
@@ -138,25 +246,64 @@ class Implication(Operation):
             When the internal term cannot be evaluated due to the lack of
             certainty when evaluating.
         """
-        if self.terms[0].evaluate(env):
-            return self.terms[1].evaluate(env)
+        try:
+            if self._terms[0].evaluate(env):
+                return self._terms[1].evaluate(env)
+            return True
+        except RecursionError:
+            return self._evaluate_iteratively(env)
+
+    def _evaluation_steps(self, env: Environment):
+        if (yield self._terms[0]):
+            return (yield self._terms[1])
         return True
 
+    def _partial_steps(self):
+        premise = yield self._terms[0]
+        if _value(premise) is False:
+            return _constant(True, self)
+        consequence = yield self._terms[1]
+        if _value(consequence) is True or _value(premise) is True:
+            return consequence
+        if _value(consequence) is False:
+            return _negated(premise, self)
+        return self._with_terms([premise, consequence])
+
 
 class Equivalence(Operation):
     """One of the most general logical junctions, evaluating the equality
     of the logical values of both the terms."""
 
+    __slots__ = ()
+
     @property
     def cardinality(self) -> int:
         return 2
 
-    @property
-    def clone(self) -> "Term":
-        return Equivalence(tuple(map(lambda t: t.clone, self.terms)))
+    def combine(self, values: tuple, algebra: Algebra):
+        return ~(values[0] ^ values[1])
 
     def evaluate(self, env: Environment = None) -> bool:
-        return self.terms[0].evaluate(env) == self.terms[1].evaluate(env)
+        try:
+            return (self._terms[0].evaluate(env)
+                    == self._terms[1].evaluate(env))
+        except RecursionError:
+            return self._evaluate_iteratively(env)
+
+    def _evaluation_steps(self, env: Environment):
+        return (yield self._terms[0]) == (yield self._terms[1])
+
+    def _partial_steps(self):
+        first = yield self._terms[0]
+        second = yield self._terms[1]
+        if _value(first) is not None and _value(second) is not None:
+            return _constant(_value(first) == _value(second), self)
+        for known, other in ((first, second), (second, first)):
+            if _value(known) is True:
+                return other
+            if _value(known) is False:
+                return _negated(other, self)
+        return self._with_terms([first, second])
 
 
 
@@ -0,0 +1,157 @@
+"""This module contains a parallel evaluation of terms over all the
+assignments of their variables. The assignments are split into shards by
+the values of the first variables (the prefix); every shard is a truth
+table of the rest of the variables computed bit-parallel (see
+`scripts.src.truth_table`) by one of the worker processes.
+
+The term is sent to every worker just once, when the worker starts, so the
+tasks consist of the numbers of the shards only. Thus the term has to be
+picklable; the custom operations have to use module-level functions and
+the interned terms (bound to their factory) cannot be sent at all.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator
+
+from scripts.src.environment import Environment
+from scripts.src.term import Term
+from scripts.src.truth_table import _BitAlgebra
+
+
+# Default number of the assignments evaluated by one task
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Number of the tasks per worker submitted in advance
+_TASKS_PER_WORKER = 4
+
+# The term, it's variable names and the number of the prefix variables
+# sent to the worker process
+_shared: tuple[Term, tuple[str], int] = None
+
+
+def _initialize(term: Term, variable_names: tuple[str], prefix: int):
+    """Initializer of the worker process receiving the evaluated term."""
+    global _shared
+    _shared = term, variable_names, prefix
+
+
+def _shard_bits(term: Term, variable_names: tuple[str], prefix: int,
+                shard: int) -> int:
+    """Returns the bits of the truth table of the term over the suffix
+    variables, while the prefix variables have the values given by the
+    bits of the number of the shard."""
+    fixed = {name: bool(shard >> (prefix - 1 - index) & 1)
+             for index, name in enumerate(variable_names[:prefix])}
+    algebra = _BitAlgebra(variable_names[prefix:], fixed)
+    bits = term.interpret(algebra)
+    return bits & ((1 << (1 << (len(variable_names) - prefix))) - 1)
+
+
+def _count_shard(shared: tuple, shard: int) -> int:
+    return bin(_shard_bits(*shared, shard)).count("1")
+
+
+def _find_in_shard(shared: tuple, shard: int) -> int:
+    """Returns the first row of the shard the term is true for, or -1."""
+    bits = _shard_bits(*shared, shard)
+    return (bits & -bits).bit_length() - 1
+
+
+def _in_worker(function: Callable[[tuple, int], int], shard: int) -> int:
+    """Calls the function in the worker with the term it received."""
+    return function(_shared, shard)
+
+
+def _map_shards(term: Term, function: Callable[[tuple, int], int],
+                workers: int, chunk_size: int) -> Iterator[tuple]:
+    """Yields the results of the function for all the shards as they are
+    computed (in any order), each with the number of the shard and the
+    number of the suffix variables. The shards not computed yet are
+    cancelled, when the generator is closed."""
+    names = tuple(term.variable_names)
+    suffix = min(len(names), max(0, chunk_size.bit_length() - 1))
+    prefix = len(names) - suffix
+    if prefix == 0 or workers == 1:
+        for shard in range(1 << prefix):
+            yield shard, function((term, names, prefix), shard), suffix
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_initialize,
+                             initargs=(term, names, prefix)) as executor:
+        shards = iter(range(1 << prefix))
+        pending = {}
+        try:
+            while True:
+                # Just a bounded number of the tasks is submitted ahead
+                for shard in shards:
+                    future = executor.submit(_in_worker, function, shard)
+                    pending[future] = shard
+                    if len(pending) >= _TASKS_PER_WORKER * workers:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result(), suffix
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def count_models(term: Term, workers: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Returns the number of the assignments of the variables of the term
+    the term is true for, computed by the pool of the worker processes.
+
+    Parameters
+    ----------
+    term: Term
+        The term the models are counted for. It has to be picklable.
+
+    workers: int, optional
+        Number of the worker processes; the number of the processors by
+        default. If it's 1, the shards are computed in this process.
+
+    chunk_size: int, optional
+        Number of the assignments evaluated by one task (rounded down to
+        the power of two).
+    """
+    workers = workers or os.cpu_count() or 1
+    return sum(count for _, count, _ in _map_shards(
+        term, _count_shard, workers, chunk_size))
+
+
+def find_model(term: Term, workers: int = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Environment:
+    """Returns an assignment of the variables the term is true for, or None
+    if there is no such assignment. The search is done by the pool of the
+    worker processes, and it stops with the first assignment found by any
+    of them.
+
+    Parameters
+    ----------
+    term: Term
+        The term the model is searched for. It has to be picklable.
+
+    workers: int, optional
+        Number of the worker processes; the number of the processors by
+        default. If it's 1, the shards are searched in this process.
+
+    chunk_size: int, optional
+        Number of the assignments searched by one task (rounded down to
+        the power of two).
+    """
+    workers = workers or os.cpu_count() or 1
+    results = _map_shards(term, _find_in_shard, workers, chunk_size)
+    for shard, row, suffix in results:
+        if row >= 0:
+            results.close()
+            names = term.variable_names
+            index = (shard << suffix) | row
+            env = Environment()
+            for position, name in enumerate(names):
+                env.add_values(
+                    name, bool(index >> (len(names) - 1 - position) & 1))
+            return env
+    return None
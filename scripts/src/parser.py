@@ -0,0 +1,238 @@
+"""This module contains a parser of terms written as strings, e.g.
+`~a & (b -> c) <-> TRUE`. The parser reads the tokens from left to right
+keeping the operators waiting for their operands in a stack (so called
+shunting-yard algorithm), so the depth of the nesting is not limited by
+the recursion.
+
+The operators from the lowest to the highest precedence are:
+
++---------------+---------------------+---------------+
+| operator      | tokens              | associativity |
++---------------+---------------------+---------------+
+| equivalence   | <->, <=>            | left          |
+| implication   | ->, =>              | right         |
+| disjunction   | |, or, OR           | left          |
+| conjunction   | &, and, AND         | left          |
+| negation      | ~, !, not, NOT      | prefix        |
++---------------+---------------------+---------------+
+
+The chains of the conjunctions or the disjunctions, e.g. `a & b & c`, are
+parsed as a single conjunction (disjunction) of all the operands.
+
+Constants are `TRUE`, `FALSE` (or `true`, `false`, `1` and `0`), any other
+name of letters, digits and underscores is an atom."""
+
+import re
+from typing import Iterable, Iterator
+
+from scripts.src.factory import TermFactory
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Term, Atom, Constant
+
+
+_TOKENS = re.compile(r"""\s*(?:
+    (?P<open>\() |
+    (?P<close>\)) |
+    (?P<equivalence><->|<=>) |
+    (?P<implication>->|=>) |
+    (?P<disjunction>\|) |
+    (?P<conjunction>&) |
+    (?P<negation>[~!]) |
+    (?P<name>[A-Za-z_][A-Za-z0-9_]*|[01]) |
+    (?P<end>$)
+)""", re.VERBOSE)
+
+# Names which are not atoms
+_KEYWORDS = {
+    "or": "disjunction", "OR": "disjunction",
+    "and": "conjunction", "AND": "conjunction",
+    "not": "negation", "NOT": "negation",
+}
+_CONSTANTS = {
+    "TRUE": True, "true": True, "1": True,
+    "FALSE": False, "false": False, "0": False,
+}
+
+# Precedence of the operators and if they are right associative
+_BINARY = {
+    "equivalence": (1, False),
+    "implication": (2, True),
+    "disjunction": (3, False),
+    "conjunction": (4, False),
+}
+_NEGATION = 5
+_OPEN = 0
+
+# Operators taking any number of operands; their chains like `a & b & c`
+# are parsed as a single operation
+_VARIADIC = {"conjunction", "disjunction"}
+
+_OPERATIONS = {
+    "equivalence": Equivalence,
+    "implication": Implication,
+    "disjunction": Disjunction,
+    "conjunction": Conjunction,
+    "negation": Negation,
+}
+
+
+def parse(text: str, factory: TermFactory = None) -> Term:
+    """Parses the given string into the term.
+
+    Parameters
+    ----------
+    text: str
+        The formula to be parsed.
+
+    factory: TermFactory, optional
+        If given, the parsed terms are interned by this factory. Otherwise
+        new terms are made; the atoms of the same name are shared within
+        the term.
+
+    Raises
+    ------
+    Exception
+        When the formula is not well-formed. The message contains the
+        position (index from 0) the error was found at.
+    """
+    atoms = {}
+    operands: list[Term] = []
+
+    # Waiting operators as (precedence, kind, position, number of the
+    # operands) tuples
+    operators: list[tuple[int, str, int, int]] = []
+    expects_operand = True
+
+    position = 0
+    while True:
+        match = _TOKENS.match(text, position)
+        if match is None:
+            start = len(text) - len(text[position:].lstrip())
+            raise Exception(
+                f"Unexpected character '{text[start]}' at position {start}")
+        kind = match.lastgroup
+        start, position = match.start(kind), match.end()
+        if kind == "name":
+            token = match.group(kind)
+            if token in _KEYWORDS:
+                kind = _KEYWORDS[token]
+            elif token in _CONSTANTS:
+                kind = "constant"
+
+        if expects_operand:
+            if kind == "name":
+                atom = atoms.get(token)
+                if atom is None:
+                    atom = Atom(token) if factory is None \
+                        else factory.atom(token)
+                    atoms[token] = atom
+                operands.append(atom)
+                expects_operand = False
+            elif kind == "constant":
+                value = _CONSTANTS[token]
+                operands.append(Constant(value) if factory is None
+                                else factory.constant(value))
+                expects_operand = False
+            elif kind == "negation":
+                operators.append((_NEGATION, kind, start, 1))
+            elif kind == "open":
+                operators.append((_OPEN, kind, start, 0))
+            elif kind == "end":
+                raise Exception(f"Missing operand at position {start}")
+            else:
+                raise Exception(f"Unexpected '{match.group(kind)}' at "
+                                f"position {start}, operand was expected")
+        elif kind in _BINARY:
+            precedence, right = _BINARY[kind]
+            while operators and (operators[-1][0] > precedence or (
+                    operators[-1][0] == precedence and not right
+                    and kind not in _VARIADIC)):
+                _reduce(operators.pop(), operands, factory)
+            if kind in _VARIADIC and operators and operators[-1][1] == kind:
+                # The chain of the same operators is a single operation
+                precedence, kind, start, count = operators.pop()
+                operators.append((precedence, kind, start, count + 1))
+            else:
+                operators.append((precedence, kind, start, 2))
+            expects_operand = True
+        elif kind == "close":
+            while operators and operators[-1][1] != "open":
+                _reduce(operators.pop(), operands, factory)
+            if not operators:
+                raise Exception(f"Unmatched ')' at position {start}")
+            operators.pop()
+        elif kind == "end":
+            while operators:
+                operator = operators.pop()
+                if operator[1] == "open":
+                    raise Exception(
+                        f"Unmatched '(' at position {operator[2]}")
+                _reduce(operator, operands, factory)
+            return operands[0]
+        else:
+            raise Exception(f"Unexpected '{match.group(kind)}' at "
+                            f"position {start}, operator was expected")
+
+
+def _reduce(operator: tuple[int, str, int, int], operands: list[Term],
+            factory: TermFactory):
+    """Replaces the operands on the top of the stack by the operation of
+    the given operator made of them."""
+    kind, count = operator[1], operator[3]
+    terms = operands[-count:]
+    del operands[-count:]
+    if factory is not None:
+        operands.append(factory.operation(_OPERATIONS[kind], terms))
+    else:
+        operands.append(_OPERATIONS[kind](terms))
+
+
+def parse_lines(lines: Iterable[str],
+                factory: TermFactory = None) -> Iterator[Term]:
+    """Parses the formulas one per line and yields the terms one by one.
+    The empty lines and the lines starting with '#' are skipped.
+
+    Parameters
+    ----------
+    lines: Iterable of str
+        Lines of the formulas, e.g. an open file.
+
+    factory: TermFactory, optional
+        If given, the parsed terms are interned by this factory.
+
+    Raises
+    ------
+    Exception
+        When some formula is not well-formed. The message contains the
+        number of the line (from 1) and the position within it.
+    """
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            continue
+        try:
+            yield parse(line, factory)
+        except Exception as error:
+            raise Exception(f"Line {number}: {error}") from error
+
+
+def parse_file(path: str, factory: TermFactory = None,
+               encoding: str = "utf-8") -> Iterator[Term]:
+    """Parses the formulas of the given file one per line (see
+    `parse_lines`). The file is read lazily, so only the currently parsed
+    line is held in memory.
+
+    Parameters
+    ----------
+    path: str
+        Path to the file of the formulas.
+
+    factory: TermFactory, optional
+        If given, the parsed terms are interned by this factory.
+
+    encoding: str, optional
+        Encoding of the file.
+    """
+    with open(path, encoding=encoding) as file:
+        yield from parse_lines(file, factory)
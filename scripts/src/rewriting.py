@@ -0,0 +1,441 @@
+"""This module contains a rewrite engine simplifying the terms by the
+axiomatic transformations, e.g. `~~a` to `a` or `a & (a | b)` to `a`.
+
+The term is rewritten from the atoms up. Every subterm is first made of
+the already rewritten terms and then the rules for it's type are tried;
+when some rule rewrites it, the result is rewritten again until no rule
+can be applied (the fixpoint). Structurally equal subterms are merged
+into one, so every distinct subterm is rewritten only once and the rules
+can compare the terms by identity.
+
+The terms are not changed in place; the result shares the unchanged
+subterms with the given term. Interned terms are rewritten into the terms
+of the same factory."""
+
+from typing import Callable, Iterable
+
+from scripts.src.operators import (Negation, Conjunction, Disjunction,
+                                   Implication, Equivalence)
+from scripts.src.term import Term, Atom, Constant, Operation, CustomOperation
+
+
+class Rule:
+    """Rule rewriting the operations of the given type (including it's
+    subclasses). The rule is a function receiving the operation, which
+    terms are already rewritten, and returning the equivalent term or None
+    when the rule cannot be applied to the operation."""
+
+    def __init__(self, name: str, operation_type: type,
+                 function: Callable[[Operation], Term]):
+        """
+        Parameters
+        ----------
+        name: str
+            Name of the rule.
+
+        operation_type: type
+            Type of the operations the rule can be applied to.
+
+        function: Callable
+            Function returning the rewritten operation or None.
+        """
+        self._name = name
+        self._operation_type = operation_type
+        self._function = function
+
+    @property
+    def name(self) -> str:
+        """Name of the rule."""
+        return self._name
+
+    @property
+    def operation_type(self) -> type:
+        """Type of the operations the rule can be applied to."""
+        return self._operation_type
+
+    def apply(self, operation: Operation) -> Term:
+        """Returns the rewritten operation or None."""
+        return self._function(operation)
+
+
+class Rewriter:
+    """Engine rewriting the terms by the given rules. The rules are indexed
+    by the type of the operations, so only the rules of the type of the
+    operation are tried on it (in the given order)."""
+
+    def __init__(self, rules: Iterable[Rule] = None):
+        """
+        Parameters
+        ----------
+        rules: Iterable of Rule, optional
+            Rules to be used; `RULES` if not given. The rules have to make
+            the terms simpler in some sense, otherwise the rewriting of
+            some terms may never end.
+        """
+        self._rules = tuple(RULES if rules is None else rules)
+        self._index: dict[type, tuple[Rule]] = {}
+
+    @property
+    def rules(self) -> tuple[Rule]:
+        """Rules used by the rewriter."""
+        return self._rules
+
+    def rules_for(self, operation_type: type) -> tuple[Rule]:
+        """Returns the rules applicable to the operations of the given
+        type."""
+        rules = self._index.get(operation_type)
+        if rules is None:
+            rules = tuple(rule for rule in self._rules
+                          if issubclass(operation_type, rule.operation_type))
+            self._index[operation_type] = rules
+        return rules
+
+    def rewrite(self, term: Term) -> Term:
+        """Returns the term rewritten by the rules to the fixpoint.
+
+        Parameters
+        ----------
+        term: Term
+            The term to be rewritten.
+        """
+        # Rewritten terms indexed by the ids of the terms, which are kept
+        # alive by the list of the visited terms
+        results: dict[int, Term] = {}
+        visited: list[Term] = []
+
+        # Terms replacing the operations, which wait to be rewritten
+        replacements: dict[int, Term] = {}
+        canonical: dict[tuple, Term] = {}
+
+        stack = [term]
+        while stack:
+            current = stack[-1]
+            if id(current) in results:
+                stack.pop()
+                continue
+
+            replacement = replacements.get(id(current))
+            if replacement is not None:
+                stack.pop()
+                result = results[id(replacement)]
+                results[id(current)] = result
+                continue
+
+            children = getattr(current, "_terms", None)
+            if children is None:
+                stack.pop()
+                result = _canonical(current, None, canonical)
+            else:
+                pending = [t for t in children if id(t) not in results]
+                if pending:
+                    stack.extend(reversed(pending))
+                    continue
+                terms = [results[id(t)] for t in children]
+                operation = _canonical(_rebuild(current, terms), terms,
+                                       canonical)
+                result = self._apply(operation)
+                if result is not operation:
+                    # The result is rewritten the same way first
+                    replacements[id(current)] = result
+                    visited.append(result)
+                    stack.append(result)
+                    continue
+                stack.pop()
+
+            visited.append(current)
+            visited.append(result)
+            results[id(current)] = result
+            results[id(result)] = result
+        return results[id(term)]
+
+    def _apply(self, operation: Operation) -> Term:
+        """Returns the operation rewritten by the first applicable rule, or
+        the operation itself if there is no such rule."""
+        for rule in self.rules_for(type(operation)):
+            result = rule.apply(operation)
+            if result is not None:
+                return result
+        return operation
+
+
+def _rebuild(operation: Operation, terms: list[Term]) -> Operation:
+    """Returns the operation of the same type over the given terms. If the
+    terms are the same as the ones of the operation, it's returned."""
+    if len(terms) == len(operation._terms) and all(
+            map(lambda a, b: a is b, terms, operation._terms)):
+        return operation
+    return _make(type(operation), terms, operation)
+
+
+def _canonical(term: Term, terms: list[Term], canonical: dict) -> Term:
+    """Returns the first seen term structurally equal to the given one,
+    which terms (None for atoms) are already canonical."""
+    if terms is not None:
+        # Custom operations are equal only if they share the evaluator
+        key = (type(term), term._factory, getattr(term, "_evaluator", None),
+               *map(id, terms))
+    elif isinstance(term, Atom):
+        key = (type(term), term._factory, term.atom_name, term.value)
+    else:
+        return term
+    return canonical.setdefault(key, term)
+
+
+def _make(operation_type: type, terms: list[Term], like: Term) -> Term:
+    """Makes the operation of the given type over the given terms. If the
+    given similar term is interned, the operation is interned by the same
+    factory."""
+    factory = like._factory
+    if issubclass(operation_type, CustomOperation):
+        if factory is not None:
+            return factory.custom(like.cardinality, terms, like._evaluator,
+                                  like.vectorized_evaluator)
+        return CustomOperation(like.cardinality, terms, like._evaluator,
+                               like.vectorized_evaluator)
+    if factory is not None:
+        return factory.operation(operation_type, terms)
+    return operation_type(terms)
+
+
+def _constant(value: bool, like: Term) -> Constant:
+    """Returns the constant of the given value made like the given term."""
+    if like._factory is not None:
+        return like._factory.constant(value)
+    return Constant(value)
+
+
+def _junction(operation: Operation, terms: list[Term]) -> Term:
+    """Returns the conjunction or disjunction like the given one over the
+    given terms; the single term itself or the neutral constant when
+    there are less than two terms."""
+    if len(terms) > 1:
+        return _make(type(operation), terms, operation)
+    if terms:
+        return terms[0]
+    return _constant(isinstance(operation, Conjunction), operation)
+
+
+def _value(term: Term):
+    """Returns the value of the defined atom or None."""
+    return getattr(term, "_value", None)
+
+
+def _negated(term: Term):
+    """Returns the term negated by the given one or None."""
+    return term._terms[0] if isinstance(term, Negation) else None
+
+
+def _fold_negation(operation: Negation) -> Term:
+    value = _value(operation._terms[0])
+    if value is not None:
+        return _constant(not value, operation)
+
+
+def _fold_junction(operation: Operation) -> Term:
+    # The dominant value is False for the conjunction, True for the
+    # disjunction; the terms of the other value are left out
+    dominant = isinstance(operation, Disjunction)
+    values = [_value(term) for term in operation._terms]
+    if dominant in values:
+        return _constant(dominant, operation)
+    if (not dominant) in values:
+        return _junction(operation, [term for term, value in zip(
+            operation._terms, values) if value is None])
+
+
+def _fold_implication(operation: Implication) -> Term:
+    premise, consequence = operation._terms
+    if _value(premise) is False or _value(consequence) is True:
+        return _constant(True, operation)
+    if _value(premise) is True:
+        return consequence
+    if _value(consequence) is False:
+        return _make(Negation, [premise], operation)
+
+
+def _fold_equivalence(operation: Equivalence) -> Term:
+    first, second = operation._terms
+    for constant, other in ((first, second), (second, first)):
+        value = _value(constant)
+        if value is True:
+            return other
+        if value is False:
+            return _make(Negation, [other], operation)
+
+
+def _double_negation(operation: Negation) -> Term:
+    return _negated(operation._terms[0])
+
+
+def _idempotence(operation: Operation) -> Term:
+    terms = {id(term): term for term in operation._terms}
+    if len(terms) < len(operation._terms):
+        return _junction(operation, list(terms.values()))
+
+
+def _complement(operation: Operation) -> Term:
+    terms = {id(term) for term in operation._terms}
+    if any(id(_negated(term)) in terms for term in operation._terms):
+        return _constant(isinstance(operation, Disjunction), operation)
+
+
+def _absorption(operation: Operation) -> Term:
+    # a & (a | b) = a and a | (a & b) = a
+    dual = Disjunction if isinstance(operation, Conjunction) else Conjunction
+    terms = {id(term) for term in operation._terms}
+    remaining = [term for term in operation._terms
+                 if not isinstance(term, dual)
+                 or not any(id(t) in terms for t in term._terms)]
+    if len(remaining) < len(operation._terms):
+        return _junction(operation, remaining)
+
+
+def _flattening(operation: Operation) -> Term:
+    # a & (b & c) = a & b & c
+    operation_type = type(operation)
+    if any(type(term) is operation_type for term in operation._terms):
+        terms = []
+        for term in operation._terms:
+            if type(term) is operation_type:
+                terms.extend(term._terms)
+            else:
+                terms.append(term)
+        return _make(operation_type, terms, operation)
+
+
+def _implication_elimination(operation: Implication) -> Term:
+    premise, consequence = operation._terms
+    return _make(Disjunction, [_make(Negation, [premise], operation),
+                               consequence], operation)
+
+
+def _equivalence_elimination(operation: Equivalence) -> Term:
+    first, second = operation._terms
+    return _make(Conjunction, [
+        _make(Disjunction, [_make(Negation, [first], operation), second],
+              operation),
+        _make(Disjunction, [first, _make(Negation, [second], operation)],
+              operation)], operation)
+
+
+def _de_morgan(operation: Negation) -> Term:
+    term = operation._terms[0]
+    if isinstance(term, (Conjunction, Disjunction)):
+        dual = Disjunction if isinstance(term, Conjunction) else Conjunction
+        return _make(dual, [_make(Negation, [t], operation)
+                            for t in term._terms], operation)
+
+
+# Default rules; the result consists of negations, conjunctions and
+# disjunctions only, with the negations applied to the atoms
+RULES = (
+    Rule("flattening", Conjunction, _flattening),
+    Rule("flattening", Disjunction, _flattening),
+    Rule("constant folding", Negation, _fold_negation),
+    Rule("constant folding", Conjunction, _fold_junction),
+    Rule("constant folding", Disjunction, _fold_junction),
+    Rule("constant folding", Implication, _fold_implication),
+    Rule("constant folding", Equivalence, _fold_equivalence),
+    Rule("double negation", Negation, _double_negation),
+    Rule("idempotence", Conjunction, _idempotence),
+    Rule("idempotence", Disjunction, _idempotence),
+    Rule("complement", Conjunction, _complement),
+    Rule("complement", Disjunction, _complement),
+    Rule("absorption", Conjunction, _absorption),
+    Rule("absorption", Disjunction, _absorption),
+    Rule("implication elimination", Implication, _implication_elimination),
+    Rule("equivalence elimination", Equivalence, _equivalence_elimination),
+    Rule("De Morgan", Negation, _de_morgan),
+)
+
+
+def flatten(term: Term) -> Term:
+    """Returns the term with the nested conjunctions (disjunctions) joined
+    into single conjunctions (disjunctions) of all their terms, e.g.
+    `(a & b) & (c & ~(d & e))` to `a & b & c & ~(d & e)`. The terms
+    repeated in the joined operation are kept just once; nothing else is
+    rewritten.
+
+    Every chain is joined at once, so the deep chains of the binary
+    operations are flattened in linear time (unlike by the flattening
+    rules, which join the operations one by one).
+
+    Parameters
+    ----------
+    term: Term
+        The term to be flattened.
+    """
+    # Flattened terms and the terms joined by the operations, indexed by
+    # the ids of the given subterms (kept alive by the given term)
+    results: dict[int, Term] = {}
+    operands: dict[int, list[Term]] = {}
+
+    stack = [term]
+    while stack:
+        current = stack[-1]
+        if id(current) in results:
+            stack.pop()
+            continue
+        children = getattr(current, "_terms", None)
+        if children is None:
+            stack.pop()
+            results[id(current)] = current
+            continue
+
+        joined = operands.get(id(current))
+        if joined is None:
+            joined = operands[id(current)] = (
+                _joined(current) if current.variadic else children)
+        pending = [t for t in joined if id(t) not in results]
+        if pending:
+            stack.extend(reversed(pending))
+            continue
+        stack.pop()
+        del operands[id(current)]
+
+        if joined is children:
+            results[id(current)] = _rebuild(
+                current, [results[id(t)] for t in children])
+            continue
+
+        # The flattened terms may be of the same type too, when their
+        # repeated terms were removed
+        unique = {}
+        for result in (results[id(t)] for t in joined):
+            if type(result) is type(current):
+                unique.update((id(t), t) for t in result._terms)
+            else:
+                unique[id(result)] = result
+        terms = list(unique.values())
+        results[id(current)] = (terms[0] if len(terms) == 1
+                                else _rebuild(current, terms))
+    return results[id(term)]
+
+
+def _joined(operation: Operation) -> list[Term]:
+    """Returns the distinct terms of the operation and of the nested
+    operations of the same type, in their order."""
+    operation_type = type(operation)
+    terms = {}
+    expanded = set()
+    stack = list(reversed(operation._terms))
+    while stack:
+        term = stack.pop()
+        if type(term) is not operation_type:
+            terms.setdefault(id(term), term)
+        elif id(term) not in expanded:
+            expanded.add(id(term))
+            stack.extend(reversed(term._terms))
+    return list(terms.values())
+
+
+def simplify(term: Term) -> Term:
+    """Returns the term rewritten by the default rules (see `RULES`). The
+    term is flattened first (see `flatten`).
+
+    Parameters
+    ----------
+    term: Term
+        The term to be simplified.
+    """
+    return Rewriter().rewrite(flatten(term))
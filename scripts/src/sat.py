@@ -0,0 +1,373 @@
+"""This module contains a SAT solver deciding the satisfiability of terms.
+The term is converted into clauses first (see `scripts.src.cnf`) and
+these are solved by a conflict-driven clause learning solver with watched
+literals, VSIDS branching heuristic, phase saving and restarts.
+
+The clauses are lists of literals in DIMACS convention; variable is a
+positive integer and it's negation is the negative one."""
+
+from heapq import heappush, heappop
+from typing import Iterable
+
+from scripts.src.cnf import CnfEncoding
+from scripts.src.environment import Environment
+from scripts.src.term import Term
+
+
+def _luby(index: int) -> int:
+    """Returns the given member of the Luby sequence (1, 1, 2, 1, 1, 2, 4,
+    ...) used for the restart intervals."""
+    size, power = 1, 0
+    while size < index + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        power -= 1
+        index = index % size
+    return 1 << power
+
+
+class Solver:
+    """Conflict-driven clause learning SAT solver. The clauses are added
+    one by one and then the solver decides if all of them can be satisfied
+    at once."""
+
+    # Multiplier of the activity increment (inverse of the decay)
+    _ACTIVITY_DECAY = 1 / 0.95
+
+    # Number of conflicts for the unit of the restart intervals
+    _RESTART_UNIT = 100
+
+    def __init__(self):
+        self._clauses: list[list[int]] = []
+        self._watches: dict[int, list[int]] = {}
+        self._units: list[int] = []
+        self._count = 0
+        self._inconsistent = False
+
+        # Assignment of the variables: 1, -1 or 0 for unassigned
+        self._values = [0]
+        self._levels = [0]
+        self._reasons = [None]
+        self._activity = [0.0]
+        self._phases = [False]
+
+        self._trail: list[int] = []
+        self._trail_levels: list[int] = []
+        self._head = 0
+        self._increment = 1.0
+        self._heap: list[tuple[float, int]] = []
+        self._model: dict[int, bool] = None
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+    @property
+    def variable_count(self) -> int:
+        """Number of the variables of the added clauses."""
+        return self._count
+
+    @property
+    def model(self) -> dict[int, bool]:
+        """Values of the variables satisfying all the clauses found by the
+        last solving. None if there is no such assignment."""
+        return self._model
+
+    def add_clause(self, literals: Iterable[int]):
+        """Adds the clause, a disjunction of the given literals.
+
+        Parameters
+        ----------
+        literals: Iterable of int
+            Nonzero literals; the positive ones are variables and negative
+            ones are their negations.
+
+        Raises
+        ------
+        Exception
+            When there is zero literal.
+        """
+        clause = list(dict.fromkeys(literals))
+        if 0 in clause:
+            raise Exception("Literal of the clause cannot be zero")
+        if any(-literal in clause for literal in clause):
+            return
+        for literal in clause:
+            self._ensure_variable(abs(literal))
+
+        if not clause:
+            self._inconsistent = True
+        elif len(clause) == 1:
+            self._units.append(clause[0])
+        else:
+            self._add_watched(clause)
+
+    def solve(self) -> bool:
+        """Decides if all the added clauses can be satisfied. When they can,
+        the satisfying assignment is available as the `model`."""
+        self._model = None
+        self._reset()
+        if self._inconsistent:
+            return False
+        for literal in self._units:
+            value = self._value(literal)
+            if value == -1 or (value == 0 and not self._assign(literal, None)):
+                self._inconsistent = True
+                return False
+        if self._propagate() is not None:
+            self._inconsistent = True
+            return False
+
+        for variable in range(1, self._count + 1):
+            heappush(self._heap, (-self._activity[variable], variable))
+
+        restarts = 0
+        limit = self._RESTART_UNIT * _luby(restarts)
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self._trail_levels:
+                    self._inconsistent = True
+                    return False
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                self._learn(learnt)
+                self._increment *= self._ACTIVITY_DECAY
+            elif conflicts >= limit:
+                restarts += 1
+                limit = self._RESTART_UNIT * _luby(restarts)
+                conflicts = 0
+                self._backtrack(0)
+            else:
+                variable = self._pick_variable()
+                if variable is None:
+                    self._model = {
+                        v: self._values[v] == 1
+                        for v in range(1, self._count + 1)}
+                    return True
+                self.decisions += 1
+                self._trail_levels.append(len(self._trail))
+                self._assign(variable if self._phases[variable]
+                             else -variable, None)
+
+    def _ensure_variable(self, variable: int):
+        """Extends the per-variable arrays up to the given variable."""
+        while self._count < variable:
+            self._count += 1
+            self._values.append(0)
+            self._levels.append(0)
+            self._reasons.append(None)
+            self._activity.append(0.0)
+            self._phases.append(False)
+
+    def _add_watched(self, clause: list[int]) -> int:
+        """Stores the clause and watches it's first two literals."""
+        index = len(self._clauses)
+        self._clauses.append(clause)
+        self._watches.setdefault(clause[0], []).append(index)
+        self._watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def _value(self, literal: int) -> int:
+        value = self._values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def _assign(self, literal: int, reason) -> bool:
+        """Makes the literal true; returns False if it is already false."""
+        variable = abs(literal)
+        if self._values[variable] != 0:
+            return self._value(literal) == 1
+        self._values[variable] = 1 if literal > 0 else -1
+        self._levels[variable] = len(self._trail_levels)
+        self._reasons[variable] = reason
+        self._trail.append(literal)
+        return True
+
+    def _propagate(self):
+        """Propagates the assigned literals through the watched clauses.
+        Returns the index of the conflicting clause or None."""
+        clauses, values = self._clauses, self._values
+        while self._head < len(self._trail):
+            false_literal = -self._trail[self._head]
+            self._head += 1
+            self.propagations += 1
+
+            watches = self._watches.get(false_literal)
+            if not watches:
+                continue
+            kept = 0
+            position = 0
+            while position < len(watches):
+                index = watches[position]
+                position += 1
+                clause = clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+
+                first = clause[0]
+                first_value = values[abs(first)]
+                if (first_value if first > 0 else -first_value) == 1:
+                    watches[kept] = index
+                    kept += 1
+                    continue
+
+                # Looking for a new literal to be watched
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    value = values[abs(literal)]
+                    if (value if literal > 0 else -value) != -1:
+                        clause[1], clause[k] = literal, false_literal
+                        self._watches.setdefault(literal, []).append(index)
+                        break
+                else:
+                    watches[kept] = index
+                    kept += 1
+                    if (first_value if first > 0 else -first_value) == -1:
+                        # Conflict; the rest of the watches stays
+                        while position < len(watches):
+                            watches[kept] = watches[position]
+                            kept += 1
+                            position += 1
+                        del watches[kept:]
+                        return index
+                    self._assign(first, index)
+            del watches[kept:]
+        return None
+
+    def _analyze(self, conflict: int) -> tuple[list[int], int]:
+        """Derives the learnt clause from the conflict (the first unique
+        implication point) and the level to backtrack to."""
+        level = len(self._trail_levels)
+        seen = set()
+        learnt = [0]
+        counter = 0
+        literal = None
+        position = len(self._trail) - 1
+        clause = self._clauses[conflict]
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                variable = abs(other)
+                if variable not in seen and self._levels[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if self._levels[variable] == level:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+
+            # The last seen literal of the trail
+            while abs(self._trail[position]) not in seen:
+                position -= 1
+            literal = self._trail[position]
+            position -= 1
+            seen.discard(abs(literal))
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self._clauses[self._reasons[abs(literal)]]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # The literal of the highest level goes to the second watch
+        best = max(range(1, len(learnt)),
+                   key=lambda i: self._levels[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self._levels[abs(learnt[1])]
+
+    def _learn(self, learnt: list[int]):
+        """Stores the learnt clause and asserts it's first literal."""
+        if len(learnt) == 1:
+            self._units.append(learnt[0])
+            self._assign(learnt[0], None)
+        else:
+            self._assign(learnt[0], self._add_watched(learnt))
+
+    def _bump(self, variable: int):
+        """Increases the activity of the variable taking part in conflict."""
+        self._activity[variable] += self._increment
+        if self._activity[variable] > 1e100:
+            self._activity = [a * 1e-100 for a in self._activity]
+            self._increment *= 1e-100
+            self._heap = [(-self._activity[v], v)
+                          for v in range(1, self._count + 1)
+                          if self._values[v] == 0]
+            self._heap.sort()
+        elif self._values[variable] == 0:
+            heappush(self._heap, (-self._activity[variable], variable))
+
+    def _pick_variable(self):
+        """Returns the unassigned variable of the highest activity."""
+        while self._heap:
+            activity, variable = heappop(self._heap)
+            if (self._values[variable] == 0
+                    and -activity == self._activity[variable]):
+                return variable
+        # Stale entries could hide some unassigned variables
+        for variable in range(1, self._count + 1):
+            if self._values[variable] == 0:
+                return variable
+        return None
+
+    def _reset(self):
+        """Unassigns all the literals including the ones of the level 0,
+        so the newly added clauses are propagated too."""
+        for literal in self._trail:
+            self._values[abs(literal)] = 0
+            self._reasons[abs(literal)] = None
+        self._trail.clear()
+        self._trail_levels.clear()
+        self._head = 0
+        self._heap.clear()
+
+    def _backtrack(self, level: int):
+        """Unassigns all the literals assigned above the given level."""
+        if len(self._trail_levels) <= level:
+            return
+        start = self._trail_levels[level]
+        for literal in self._trail[start:]:
+            variable = abs(literal)
+            self._phases[variable] = literal > 0
+            self._values[variable] = 0
+            self._reasons[variable] = None
+            heappush(self._heap, (-self._activity[variable], variable))
+        del self._trail[start:]
+        del self._trail_levels[level:]
+        self._head = min(self._head, start)
+
+
+def solve(term: Term) -> Environment:
+    """Looks for an assignment of the variables satisfying the term. Returns
+    the environment of the satisfying values or None if the term cannot be
+    satisfied.
+
+    Parameters
+    ----------
+    term: Term
+        The term to be satisfied.
+    """
+    encoding = CnfEncoding(term, polarity=True)
+    solver = Solver()
+    for clause in encoding.clauses():
+        solver.add_clause(clause)
+    if not solver.solve():
+        return None
+    return encoding.environment(solver.model)
+
+
+def is_satisfiable(term: Term) -> bool:
+    """Returns if there is an assignment of the variables satisfying the
+    term.
+
+    Parameters
+    ----------
+    term: Term
+        The term to be checked.
+    """
+    return solve(term) is not None
@@ -0,0 +1,362 @@
+"""This module contains a compact binary format of terms and a store of
+many terms in one file.
+
+The format of a term (version 2) starts with the magic bytes `LGT` and the
+version byte, followed by the table of the names of the atoms and by the
+nodes of the term in the post-order (see `scripts.src.compact`). Every
+node is an opcode byte followed by it's arguments; the atoms refer to the
+table of the names (the defined atoms and the constants have their value
+too), the operators refer to their terms by the distance backwards from
+the node itself; the conjunctions and the disjunctions of more than two
+terms have the number of the terms before them. All the numbers are
+unsigned varints (7 bits per byte, the lowest first), so the nearby terms
+and the few names take just one byte. The terms contained more than once
+are stored just once. The version 1 (without the n-ary operators) is still
+read.
+
+The store is a file of the serialized terms followed by the index of
+their offsets and by a fixed trailer; it's memory-mapped, so a single term
+can be loaded (or evaluated) without reading the rest of the file.
+
+Only the atoms and the basic operators can be serialized; the custom
+operations refer to the Python functions, which cannot be stored."""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from scripts.src.compact import (CompactTerm, _from_arrays, VARIABLE,
+                                 CONSTANT, NEGATION, OPERATION,
+                                 NARY_CONJUNCTION, NARY_DISJUNCTION)
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.term import Term
+
+
+# Version of the format of the terms and the highest opcode of the
+# versions
+VERSION = 2
+_LAST_OPCODES = {1: OPERATION - 1, 2: NARY_DISJUNCTION}
+
+_MAGIC = b"LGT"
+
+# Magic bytes and version of the store, number of the terms and offset of
+# the index (little-endian)
+_TRAILER = struct.Struct("<4sBxxxQQ")
+_STORE_MAGIC = b"LGTS"
+
+
+def _write_varint(buffer: bytearray, number: int):
+    while number > 0x7F:
+        buffer.append(number & 0x7F | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+def _read_varint(data, position: int) -> tuple[int, int]:
+    """Returns the number starting at the given position and the position
+    following it."""
+    number = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+def dumps_compact(compact: CompactTerm) -> bytes:
+    """Returns the compact term serialized to bytes.
+
+    Parameters
+    ----------
+    compact: CompactTerm
+        The term to be serialized.
+
+    Raises
+    ------
+    Exception
+        When the term contains an operation other than the basic operators.
+    """
+    if compact._operations:
+        raise Exception("Custom operations cannot be serialized")
+
+    buffer = bytearray(_MAGIC)
+    buffer.append(VERSION)
+    names = [name.encode("utf-8") for name in compact._names]
+    _write_varint(buffer, len(names))
+    for name in names:
+        _write_varint(buffer, len(name))
+        buffer += name
+
+    opcodes, first, second = compact._opcodes, compact._first, compact._second
+    lists = compact._lists
+    _write_varint(buffer, len(opcodes))
+    for node, opcode in enumerate(opcodes):
+        buffer.append(opcode)
+        if opcode <= CONSTANT:
+            _write_varint(buffer, first[node])
+            if opcode != VARIABLE:
+                buffer.append(second[node])
+        elif opcode >= NARY_CONJUNCTION:
+            _write_varint(buffer, second[node])
+            for term in lists[first[node]:first[node] + second[node]]:
+                _write_varint(buffer, node - term)
+        else:
+            _write_varint(buffer, node - first[node])
+            if opcode != NEGATION:
+                _write_varint(buffer, node - second[node])
+    return bytes(buffer)
+
+
+def dumps(term: Term) -> bytes:
+    """Returns the term serialized to bytes (see `dumps_compact`)."""
+    return dumps_compact(CompactTerm(term))
+
+
+def _decode(data, position: int = 0) -> CompactTerm:
+    """Returns the compact term serialized in the data from the given
+    position on.
+
+    Raises
+    ------
+    Exception
+        When the data are not a valid serialized term, including the
+        truncated ones.
+    """
+    try:
+        return _decode_nodes(data, position)
+    except (IndexError, ValueError) as error:
+        # Reading past the end of the data or the invalid names
+        raise Exception("Serialized term is truncated or corrupted") \
+            from error
+
+
+def _decode_nodes(data, position: int) -> CompactTerm:
+    """Returns the compact term serialized in the data from the given
+    position on; the truncated data raise IndexError (see `_decode`)."""
+    if data[position:position + 3] != _MAGIC:
+        raise Exception("Data do not contain a serialized term")
+    version = data[position + 3]
+    if version not in _LAST_OPCODES:
+        raise Exception(f"Unsupported version of the format: {version}")
+    last_opcode = _LAST_OPCODES[version]
+    position += 4
+
+    count, position = _read_varint(data, position)
+    names = []
+    for _ in range(count):
+        length, position = _read_varint(data, position)
+        names.append(bytes(data[position:position + length]).decode("utf-8"))
+        position += length
+
+    count, position = _read_varint(data, position)
+    if count == 0:
+        raise Exception("Serialized term has no node")
+    opcodes = array("B", bytes(count))
+    first = array("i", bytes(4 * count))
+    second = array("i", bytes(4 * count))
+    lists = array("i")
+    for node in range(count):
+        opcode = data[position]
+        position += 1
+        if opcode == OPERATION or opcode > last_opcode:
+            raise Exception(f"Invalid opcode {opcode} of node {node}")
+        opcodes[node] = opcode
+
+        # Single byte varints are decoded right away
+        number = data[position]
+        if number < 0x80:
+            position += 1
+        else:
+            number, position = _read_varint(data, position)
+        if opcode <= CONSTANT:
+            if number >= len(names):
+                raise Exception(f"Invalid name of node {node}")
+            first[node] = number
+            if opcode != VARIABLE:
+                second[node] = data[position]
+                position += 1
+            continue
+        if opcode >= NARY_CONJUNCTION:
+            if number < 3:
+                raise Exception(f"Invalid number of terms of node {node}")
+            first[node] = len(lists)
+            second[node] = number
+            for _ in range(number):
+                number, position = _read_varint(data, position)
+                if not 0 < number <= node:
+                    raise Exception(f"Invalid term of node {node}")
+                lists.append(node - number)
+            continue
+
+        if not 0 < number <= node:
+            raise Exception(f"Invalid term of node {node}")
+        first[node] = node - number
+        if opcode == NEGATION:
+            second[node] = -1
+            continue
+        number, position = _read_varint(data, position)
+        if not 0 < number <= node:
+            raise Exception(f"Invalid term of node {node}")
+        second[node] = node - number
+    return _from_arrays(opcodes, first, second, lists, names)
+
+
+def loads_compact(data: bytes) -> CompactTerm:
+    """Returns the compact term serialized in the given bytes.
+
+    Raises
+    ------
+    Exception
+        When the data are not a valid serialized term.
+    """
+    return _decode(data)
+
+
+def loads(data: bytes, factory: TermFactory = None) -> Term:
+    """Returns the term serialized in the given bytes.
+
+    Parameters
+    ----------
+    data: bytes
+        The serialized term (see `dumps`).
+
+    factory: TermFactory, optional
+        Factory the returned term is interned by.
+
+    Raises
+    ------
+    Exception
+        When the data are not a valid serialized term.
+    """
+    return _decode(data).to_term(factory)
+
+
+def write_store(path: str, terms: Iterable[Term]) -> int:
+    """Writes the terms into the store file and returns their number. The
+    terms are written one by one, so the iterable may be a generator of
+    more terms than fit into the memory.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file to be written.
+
+    terms: Iterable of Term
+        The terms to be stored.
+    """
+    offsets = array("Q")
+    with open(path, "wb") as file:
+        offset = 0
+        for term in terms:
+            data = dumps(term)
+            offsets.append(offset)
+            file.write(data)
+            offset += len(data)
+        offsets.append(offset)
+        if sys.byteorder == "big":     # pragma: no cover
+            offsets.byteswap()
+        file.write(offsets.tobytes())
+        file.write(_TRAILER.pack(_STORE_MAGIC, VERSION,
+                                 len(offsets) - 1, offset))
+    return len(offsets) - 1
+
+
+class FormulaStore:
+    """Store of the terms written by `write_store`. The file is
+    memory-mapped and only the index of the terms is read when it's
+    opened; every term is read when it's requested."""
+
+    def __init__(self, path: str):
+        """Opens the store.
+
+        Parameters
+        ----------
+        path: str
+            Path of the store file.
+
+        Raises
+        ------
+        Exception
+            When the file is not a store of a supported version or it's
+            truncated.
+        """
+        with open(path, "rb") as file:
+            # Empty files cannot be mapped
+            if os.fstat(file.fileno()).st_size < _TRAILER.size:
+                raise Exception(f"File '{path}' is not a store of terms")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map) - _TRAILER.size
+        magic, version, count, index = _TRAILER.unpack_from(self._map, size)
+        if magic != _STORE_MAGIC or version not in _LAST_OPCODES:
+            self.close()
+            raise Exception(f"File '{path}' is not a store of terms of "
+                            f"version up to {VERSION}")
+        if index + 8 * (count + 1) != size:
+            self.close()
+            raise Exception(f"Store '{path}' is truncated or corrupted")
+        self._count = count
+        self._index = index
+
+    def __len__(self) -> int:
+        """Returns the number of the stored terms."""
+        return self._count
+
+    def _offset(self, index: int) -> int:
+        return struct.unpack_from("<Q", self._map, self._index + 8 * index)[0]
+
+    def compact(self, index: int) -> CompactTerm:
+        """Returns the compact form of the term of the given index, read
+        from the file.
+
+        Parameters
+        ----------
+        index: int
+            Index of the term in the store.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"Store has no term of index {index}")
+        # The term is read up to the next one, so the corrupted term cannot
+        # be read past it's end
+        return _decode(self._map[self._offset(index):self._offset(index + 1)])
+
+    def __getitem__(self, index: int) -> Term:
+        """Returns the term of the given index, read from the file."""
+        if index < 0:
+            index += self._count
+        return self.compact(index).to_term()
+
+    def __iter__(self) -> Iterator[Term]:
+        """Yields all the stored terms one by one."""
+        for index in range(self._count):
+            yield self[index]
+
+    def evaluate(self, index: int, env: Environment = None) -> bool:
+        """Evaluates the term of the given index without making the objects
+        of it's nodes (see `CompactTerm.evaluate`).
+
+        Parameters
+        ----------
+        index: int
+            Index of the term in the store.
+
+        env: Environment, optional
+            Declaration of values for specified variables.
+        """
+        return self.compact(index).evaluate(env)
+
+    def close(self):
+        """Closes the memory-mapped file. The terms already read stay
+        usable."""
+        self._map.close()
+
+    def __enter__(self) -> "FormulaStore":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
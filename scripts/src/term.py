@@ -2,8 +2,11 @@
 definition of terms, atomic logical variables and operators."""
 
 from abc import ABC, abstractmethod
+from weakref import WeakSet, ref
+from scripts.src.algebra import Algebra
+from scripts.src.compilation import CompiledTerm
 from scripts.src.environment import Environment
-from typing import Iterable, Callable
+from typing import Iterable, Iterator, Callable
 
 
 class Term(ABC):
@@ -11,7 +14,63 @@ class Term(ABC):
     property of this entity is it's ability to be evaluated.
 
     Realization of this class is abstract, thus it cannot be
-    instantiated as is."""
+    instantiated as is.
+
+    Terms made by a term factory (see `scripts.src.factory.TermFactory`)
+    are interned; these are immutable and structurally equal interned terms
+    are the very same object. Other terms are compared by their identity.
+
+    Terms define `__slots__` to keep the large terms small in memory, so
+    the subclasses should define them too (at least an empty tuple).
+    """
+
+    # Factory which interned the term (None if the term is not interned),
+    # the structural hash of the interned term and the number of the clones
+    # made before the term was made; all are set by the initors of the
+    # atoms and the operations
+    __slots__ = ("_factory", "_hash", "_epoch", "__weakref__")
+
+    # Number of changes of the structure or names made to any of the terms;
+    # the cached variables are valid only until the next change. The counter
+    # is global (a term does not know the operations containing it), so any
+    # change invalidates the caches of all the terms; making new terms does
+    # not count as a change
+    _changes = 0
+
+    # Number of the clones of the operations made so far; the terms made
+    # after a clone cannot be shared by it (except the copies made by the
+    # other clones, which count as made with the copied terms)
+    _clones = 0
+
+    @property
+    def is_interned(self) -> bool:
+        """Returns if the term is interned, thus immutable."""
+        return self._factory is not None
+
+    def _check_mutable(self):
+        """Raises exception if the term is interned, thus immutable.
+        Otherwise the term is about to be changed, so the clones still
+        sharing it are copied first (see `Operation.clone`)."""
+        if self._factory is not None:
+            raise Exception(f"Interned term '{self}' cannot be changed")
+        if _sessions:
+            _prepare_change(self)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Term):
+            return NotImplemented
+        if (self._factory is None or other._factory is None
+                or self._factory is other._factory):
+            return False
+        # Interned terms of different factories are compared structurally
+        return self._hash == other._hash and _structurally_equal(self, other)
+
+    def __hash__(self) -> int:
+        if self._factory is None:
+            return object.__hash__(self)
+        return self._hash
 
     @property
     @abstractmethod
@@ -19,6 +78,13 @@ class Term(ABC):
         """Returns the tuple of names of variables contained in this term.
         When there is no variable in this term, it returns empty tuple."""
 
+    @property
+    def variable_index(self) -> dict[str, int]:
+        """Returns the dictionary of the positions of the variables in
+        `variable_names` indexed by their names."""
+        return {name: index
+                for index, name in enumerate(self.variable_names)}
+
     @property
     @abstractmethod
     def clone(self) -> "Term":
@@ -44,6 +110,114 @@ class Term(ABC):
             there is an atomic variable without specified value.
         """
 
+    def evaluate_shared(self, env: Environment = None) -> bool:
+        """Evaluates the term the same way as `evaluate`, but every term
+        contained in this term more than once is evaluated at most once.
+        This prevents repeated evaluation of the shared terms, which may be
+        exponential for terms built by reusing their parts.
+
+        Parameters
+        -----------
+        env: Environment
+            Declaration of values for specified variables.
+
+        Raises
+        ------
+        Exception
+            When the evaluation cannot be done.
+        """
+        return self.evaluate(env)
+
+    def partial_evaluate(self, env: Environment = None) -> "Term":
+        """Evaluates the term as far as the known values allow. The
+        variables without a value are treated as unknown (so called Kleene
+        three-valued logic); the operators known by some of their terms
+        (e.g. the conjunction with a false term) are turned into constants
+        without evaluating the rest of their terms, while the others are
+        simplified (e.g. the conjunction with a true term is just the other
+        term).
+
+        Returns the constant if the value of the term is known, otherwise
+        the residual term over the unknown variables only. The residual is
+        a new term (unless it's interned) keeping the shared terms shared;
+        this term stays untouched.
+
+        Parameters
+        -----------
+        env: Environment, optional
+            Declaration of values for specified variables.
+        """
+        return _drive_partial_evaluation(self, env)
+
+    def postorder(self) -> Iterator["Term"]:
+        """Yields this term and all the contained terms, each of them once;
+        the terms of every operation are yielded before the operation
+        itself, from the first to the last one. The traversal does not use
+        recursion, so it works for terms of any depth.
+
+        The terms of a clone still shared with the cloned operation are
+        copied first (see `Operation.clone`), so the yielded terms are the
+        clone's own.
+        """
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            term, expanded = stack.pop()
+            if expanded:
+                yield term
+            elif id(term) not in visited:
+                visited.add(id(term))
+                stack.append((term, True))
+                if isinstance(term, Operation):
+                    term._own_terms()
+                    stack.extend((t, False) for t in reversed(term._terms))
+
+    def interpret(self, algebra: Algebra):
+        """Interprets the term in the given algebra. The atoms are turned
+        into the values provided by the algebra and these are combined by
+        the operations from the bottom of the term up to it's root. Terms
+        contained more than once are interpreted only once.
+
+        Parameters
+        ----------
+        algebra: Algebra
+            Algebra providing the values of the atoms.
+        """
+        terms = list(self.postorder())
+
+        # Number of occurrences of every contained term
+        occurrences = dict.fromkeys(map(id, terms), 0)
+        for term in terms:
+            if isinstance(term, Operation):
+                for subterm in term._terms:
+                    occurrences[id(subterm)] += 1
+
+        results = {}
+        for term in terms:
+            if isinstance(term, Atom):
+                value = (algebra.constant(term.value) if term.is_defined
+                         else algebra.variable(term.atom_name))
+            elif isinstance(term, Operation):
+                values = tuple(results[id(t)] for t in term._terms)
+                value = term.combine(values, algebra)
+            else:
+                raise Exception(f"Term '{term}' cannot be interpreted")
+
+            if occurrences[id(term)] > 1:
+                value = algebra.shared(value)
+            results[id(term)] = value
+        return results[id(self)]
+
+    def compile(self) -> CompiledTerm:
+        """Compiles the term into a reusable evaluator. The evaluator accepts
+        an assignment of values to the variables (in order of
+        `variable_names` or as a mapping) and returns the logical value of
+        the term. Constant parts of the term are folded during the
+        compilation, while the short-circuiting of the operators is kept.
+        """
+        return CompiledTerm(self)
+
+
 class Atom(Term):
     """Atom is the most basic logic element. It consists of either constant
     value or a variable for logical value itself.
@@ -52,6 +226,8 @@ class Atom(Term):
     using an environment), the evaluation fails.
     """
 
+    __slots__ = ("_atom_name", "_value")
+
     def __init__(self, atom_name: str, value: bool = None):
         """Instances of Atom class provides a definition of the most basic
         logic element. It consists of a name of the atom and it's value.
@@ -69,6 +245,9 @@ class Atom(Term):
             If not, the atom is variable. This value can be altered any time
             during the lifecycle of the instance.
         """
+        self._factory = None
+        self._hash = None
+        self._epoch = Term._clones
         self._atom_name = atom_name
         self._value = value
 
@@ -98,16 +277,24 @@ class Atom(Term):
     def atom_name(self, new_name: str):
         """Sets the current name to the atom. Should never be empty string.
         """
-        self._atom_name = new_name
+        self._check_mutable()
+        if new_name != self._atom_name:
+            self._atom_name = new_name
+            Term._changes += 1
+            if _watchers:
+                _notify(self)
 
     @value.setter
     def value(self, new_value: bool):
         """Sets the current new value of this atom. This setter allows
         None value."""
+        self._check_mutable()
         self._value = new_value
 
     @property
     def clone(self) -> "Term":
+        if self.is_interned:
+            return self
         return Atom(self.atom_name, self.value)
 
     def evaluate(self, env: Environment = None) -> bool:
@@ -120,18 +307,21 @@ class Atom(Term):
         If the value remains unresolved, it raises exception about the lack
         of certainty of the result.
         """
-        if self.is_defined:
-            return self.value
-        elif env and env.has_declaration(self.atom_name):
-            return env.declaration(self.atom_name).value
-        else:
-            raise Exception(f"Value of atom '{self.atom_name}' is not defined")
+        if self._value is not None:
+            return self._value
+        elif env is not None:
+            value = env.lookup(self._atom_name)
+            if value is not None:
+                return value
+        raise Exception(f"Value of atom '{self.atom_name}' is not defined")
 
 
 class Constant(Atom):
     """Special type of the atom. It's given value is constantly set and
     should not be changed."""
 
+    __slots__ = ()
+
     def __init__(self, value: bool, constant_name: str = None):
         """Constant type of the atom with given logical value and name.
         The name is optional and if not given, it will be changed to
@@ -152,9 +342,10 @@ class Constant(Atom):
         if not self.is_defined:
             raise Exception(f"Constant has to be defined")
 
-        # If name is not set as non-empty string
+        # If name is not set as non-empty string; the name is set directly,
+        # as a new constant changes no other term
         if not self.atom_name:
-            self.atom_name = "TRUE" if value else "FALSE"
+            self._atom_name = "TRUE" if value else "FALSE"
 
     @property
     def value(self) -> bool:
@@ -171,6 +362,12 @@ class Constant(Atom):
     def variable_names(self) -> tuple[str]:
         return tuple()
 
+    @property
+    def clone(self) -> "Term":
+        if self.is_interned:
+            return self
+        return Constant(self.value, self.atom_name)
+
 
 class Operation(Term):
     """This class defines instances of the logical operators.
@@ -178,10 +375,25 @@ class Operation(Term):
     process it's evaluation.
     """
 
+    # Cached variable names, index of them and the number of changes
+    # of the terms at the time of caching (None if not cached yet), and the
+    # session of the clone, which terms are still shared with the cloned
+    # operation (None if the operation has it's own terms)
+    __slots__ = ("_terms", "_variables_cache", "_session")
+
+    # If the operation works with any number (at least two) of terms; the
+    # cardinality is then the number of the actual terms
+    variadic = False
+
     def __init__(self, terms: Iterable[Term]):
         """Abstract logical operator build over given terms. These has to
         obey the set cardinality. When there is more or less of the terms,
         it raises exception."""
+        self._factory = None
+        self._hash = None
+        self._epoch = Term._clones
+        self._variables_cache = None
+        self._session = None
         self._terms = list(terms)
 
         # Checks the correctness of the given terms
@@ -192,29 +404,218 @@ class Operation(Term):
     def cardinality(self) -> int:
         """The number of parameters this operation works with."""
 
+    @property
+    def clone(self) -> "Term":
+        """Returns a copy of this operation, which behaves as a deep copy.
+        The terms contained more than once stay shared in the copy too,
+        while the interned terms are not copied at all.
+
+        The copy is made lazily (copy-on-write), so cloning takes constant
+        time. The clone shares the terms with this operation until they are
+        reached by `terms` (or `postorder`, or the instrumented evaluation);
+        then the terms (just one level of them) are copied. Changing a clone
+        thus copies only the path to the changed term. When a term still
+        shared by some clone is about to be changed (e.g. a term of this
+        operation), such clone is copied whole first, so it keeps the term
+        as it was; the other clones are left lazy.
+
+        Once there is any custom operation, the paths to the custom
+        operations are copied right away (which walks the whole term), so
+        their evaluators are given the terms of the clone."""
+        if self.is_interned:
+            return self
+
+        Term._clones += 1
+        session = _CloneSession()
+        clone = session.copy(self)
+        if CustomOperation._made:
+            session.own_custom_operations(clone)
+        return clone
+
+    def _shallow_copy(self) -> "Operation":
+        """Returns a copy of this operation sharing it's terms. Subclasses
+        defining their own slots have to copy these too."""
+        operation = object.__new__(type(self))
+        operation._factory = self._factory
+        operation._hash = self._hash
+        operation._epoch = Term._clones
+        operation._terms = self._terms
+        operation._variables_cache = self._variables_cache
+        operation._session = None
+        if type(self).__dictoffset__:
+            operation.__dict__.update(self.__dict__)
+        return operation
+
+    def evaluate_shared(self, env: Environment = None) -> bool:
+        return self._evaluate_iteratively(env, {})
+
+    def _evaluate_iteratively(self, env: Environment,
+                              cache: dict = None) -> bool:
+        """Evaluates the operation without recursion by driving it's
+        evaluation steps. The operators evaluate their terms recursively
+        (which is faster), but they fall back to this evaluation when the
+        term is too deep to be evaluated recursively.
+
+        Parameters
+        ----------
+        env: Environment
+            Environment containing declaration of values set to the variables
+
+        cache: dict, optional
+            Values of already evaluated terms indexed by their identity. When
+            given, every term is evaluated at most once.
+        """
+        return _drive_evaluation(self, env, cache)
+
+    def _evaluation_steps(self, env: Environment):
+        """Generator of the evaluation of this operation. It yields the terms
+        it needs the values of (one by one, so the evaluation can be
+        short-circuited), receives these values and finally returns the
+        value of the operation.
+
+        The steps have to give the same result as `evaluate`. Operations
+        not defining the steps are evaluated by their `evaluate` method as a
+        whole.
+
+        Parameters
+        ----------
+        env: Environment
+            Environment containing declaration of values set to the variables
+        """
+        return self.evaluate(env)
+        yield
+
+    def _partial_steps(self):
+        """Generator of the partial evaluation of this operation (see
+        `Term.partial_evaluate`). It yields the terms it needs the results
+        of, receives these results (the constants or the residual terms)
+        and finally returns the result of the operation.
+
+        Operations not defining the steps are turned into the constants
+        only when all their terms are known."""
+        terms = []
+        for term in self._terms:
+            terms.append((yield term))
+        values = [getattr(term, "_value", None) for term in terms]
+        if None in values:
+            return self._with_terms(terms)
+        return _constant(self.evaluate_values(values), self)
+
+    def _with_terms(self, terms: list[Term]) -> "Operation":
+        """Returns the new operation like this one over the given terms;
+        it's interned by the same factory as this one."""
+        operation = self._shallow_copy()
+        operation._factory = operation._hash = None
+        operation._variables_cache = None
+        operation._terms = terms
+        if self._factory is not None:
+            return self._factory.intern(operation)
+        return operation
+
     @property
     def terms(self) -> tuple[Term]:
-        """Tuple of all terms this operation works with."""
+        """Tuple of all terms this operation works with. The terms of the
+        clone still shared with the cloned operation are copied first (see
+        `clone`)."""
+        self._own_terms()
         return tuple(self._terms)
 
+    def _own_terms(self):
+        """Replaces the terms still shared with the cloned operation by
+        their copies (see `clone`)."""
+        if self._session is not None:
+            self._session.own_terms(self)
+
     @terms.setter
     def terms(self, terms: Iterable[Term]):
         """Sets the terms. These has to obey the cardinality rule. When
         there is more or less of the terms, it raises exception.
         """
+        self._check_mutable()
         terms = list(terms)
         self._check_terms(terms)
+        if self._session is not None:
+            self._session.leave(self)
         self._terms = terms
+        Term._changes += 1
+        if _watchers:
+            _notify(self)
 
     @property
     def variable_names(self) -> tuple[str]:
-        """Returns all the variable names from the contained terms."""
-        names = []
-        for term in self.terms:
-            for variable_name in term.variable_names:
-                if variable_name not in names:
-                    names.append(variable_name)
-        return tuple(names)
+        """Returns all the variable names from the contained terms.
+
+        The names are cached until any of the terms is changed (the terms of
+        an operation or the name of an atom), while the cache of interned
+        terms is valid forever."""
+        return self._variables()[0]
+
+    @property
+    def variable_index(self) -> dict[str, int]:
+        return self._variables()[1]
+
+    def _variables(self) -> tuple[tuple[str], dict[str, int]]:
+        """Returns the cached variable names and index of them. When the
+        cache is not valid, it's rebuilt by a single walk through the
+        contained terms, reusing the valid caches of them."""
+        if not self._has_valid_variables():
+            names = {}
+            visited = set()
+            stack = list(reversed(self._terms))
+            while stack:
+                term = stack.pop()
+                if id(term) in visited:
+                    continue
+                visited.add(id(term))
+                if isinstance(term, Operation):
+                    if term._has_valid_variables():
+                        names.update(term._variables_cache[1])
+                    else:
+                        stack.extend(reversed(term._terms))
+                else:
+                    names.update(dict.fromkeys(term.variable_names))
+
+            names = tuple(names)
+            index = {name: position for position, name in enumerate(names)}
+            self._variables_cache = (names, index, Term._changes)
+        return self._variables_cache
+
+    def _has_valid_variables(self) -> bool:
+        """Returns if the cached variable names are still valid."""
+        cache = self._variables_cache
+        return cache is not None and (
+            self._factory is not None or cache[2] == Term._changes)
+
+    def combine(self, values: tuple, algebra: Algebra):
+        """Combines the values the terms of this operation were interpreted
+        to in the given algebra (see `Term.interpret`). The operators should
+        express themselves by the bitwise operators of the values. When it
+        is not possible, the interpretation is left to the algebra itself.
+
+        Parameters
+        ----------
+        values: tuple
+            Values of the terms in the order of the terms.
+
+        algebra: Algebra
+            Algebra the values come from.
+        """
+        return algebra.operation(self, values)
+
+    def evaluate_values(self, values: Iterable[bool]) -> bool:
+        """Evaluates this operation as if it's terms were constants of the
+        given logical values.
+
+        Parameters
+        ----------
+        values: Iterable of bool
+            Logical values of the terms in the order of the terms.
+        """
+        operation = self._shallow_copy()
+        operation._terms = [Constant(bool(value)) for value in values]
+        operation._variables_cache = None
+        self._check_terms(operation._terms)
+        return operation.evaluate()
 
     def can_be_applied(self, terms: Iterable[Term]) -> bool:
         """Returns if the given terms can be set for this operation."""
@@ -231,8 +632,13 @@ class Operation(Term):
         # Only actual terms stays there
         terms = [term for term in terms if isinstance(term, Term)]
 
+        if self.variadic:
+            if len(terms) < 2:
+                raise Exception(
+                    f"Number of terms ({len(terms)}) is lower than two, "
+                    f"the least number of terms of the operator")
         # If it does not match the cardinality
-        if len(terms) != self.cardinality:
+        elif len(terms) != self.cardinality:
             raise Exception(
                 f"Number of terms ({len(self._terms)}) is not equal to "
                 f"cardinality of the operator ({self.cardinality})")
@@ -242,8 +648,14 @@ class CustomOperation(Operation):
     """This class provides ability to define and use custom operators
     for any cardinality and with custom way of their evaluation."""
 
+    __slots__ = ("_cardinality", "_evaluator", "_vectorized_evaluator")
+
+    # Number of the custom operations made so far; the clones copy the
+    # paths to them only when there is some (see `Operation.clone`)
+    _made = 0
+
     def __init__(self, cardinality: int, terms: Iterable[Term],
-                 evaluator: Callable):
+                 evaluator: Callable, vectorized_evaluator: Callable = None):
         """Initor creating the custom operation.
 
         Parameters
@@ -261,6 +673,13 @@ class CustomOperation(Operation):
             logical value. This function has to accept as parameters an
             environment (`scripts.src.environment.Environment`) instance
             and a tuple of terms.
+
+        vectorized_evaluator: Callable, optional
+            The function evaluating the operation over many assignments at
+            once (see `scripts.src.batch.evaluate_batch`). It accepts a tuple
+            of boolean NumPy arrays (values of the terms, one item per
+            assignment) and returns the boolean array of the results. When
+            not given, such evaluation falls back to the evaluator.
         """
         self._cardinality = cardinality
         if self._cardinality < 0:
@@ -268,6 +687,8 @@ class CustomOperation(Operation):
                 f"The cardinality cannot be negative: {self._cardinality}")
         Operation.__init__(self, terms)
         self._evaluator = evaluator
+        self._vectorized_evaluator = vectorized_evaluator
+        CustomOperation._made += 1
 
     @property
     def cardinality(self) -> int:
@@ -275,6 +696,418 @@ class CustomOperation(Operation):
         the operator can deal with."""
         return self._cardinality
 
+    @property
+    def vectorized_evaluator(self) -> Callable:
+        """Returns the function evaluating the operation over many
+        assignments at once. May be None if it was not given."""
+        return self._vectorized_evaluator
+
+    def _shallow_copy(self) -> "Operation":
+        operation = Operation._shallow_copy(self)
+        operation._cardinality = self._cardinality
+        operation._evaluator = self._evaluator
+        operation._vectorized_evaluator = self._vectorized_evaluator
+        return operation
+
     def evaluate(self, env: Environment = None) -> bool:
         """Invokes the given function for evaluating the given terms."""
         return self._evaluator(env, self.terms)
+
+    def evaluate_values(self, values: Iterable[bool]) -> bool:
+        """Invokes the given function for the constants of the given values;
+        the constants are shared, so no terms are made."""
+        terms = [_CONSTANTS[bool(value)] for value in values]
+        self._check_terms(terms)
+        return self._evaluator(None, tuple(terms))
+
+
+class _CloneSession:
+    """Copying of the terms of one clone (see `Operation.clone`). It keeps
+    the copies of the terms made so far, so the terms contained more than
+    once are copied just once, and counts the operations of the clone,
+    which terms are still shared (the lazy ones).
+
+    Only the terms made before the session (or their copies) can be shared
+    by the clone. When such term is about to be changed, the index of the
+    terms shared by the clone (made by the first such change and kept up to
+    date then) tells if the clone has to be copied."""
+
+    __slots__ = ("_epoch", "_copies", "_sources", "_lazy", "_shared",
+                 "__weakref__")
+
+    def __init__(self):
+        # Number of the clones made before this one, including it; the terms
+        # made later are not shared, unless these are the copies of the
+        # shared ones
+        self._epoch = Term._clones
+
+        # Copies indexed by the ids of the copied terms, which are kept
+        # alive here, and the copied terms indexed by the ids of the
+        # copies; the copies are referenced weakly, so the session is not
+        # kept alive by them
+        self._copies: dict[int, tuple[Term, ref]] = {}
+        self._sources: dict[int, Term] = {}
+        self._lazy = 0
+
+        # Terms reachable from the lazy operations with the numbers of the
+        # shared terms and the lazy operations containing them, indexed by
+        # their ids; None until some shared term may be changed
+        self._shared: dict[int, list] = None
+
+    def __reduce__(self):
+        # The unpickled terms are new copies, which own their terms
+        return type(None), ()
+
+    def copy(self, term: Term) -> Term:
+        """Returns the copy of the given term; the copies of the operations
+        share their terms with the copied ones. The lazy operation of some
+        other clone is made to own it's terms first, so the copy shares the
+        terms of that clone instead of the ones it was copied from."""
+        if term._factory is not None:
+            return term
+        entry = self._copies.get(id(term))
+        copy = None if entry is None else entry[1]()
+        if copy is None:
+            if isinstance(term, Operation):
+                term._own_terms()
+                copy = term._shallow_copy()
+                copy._session = self
+                if not self._lazy:
+                    _sessions.add(self)
+                self._lazy += 1
+                if self._shared is not None:
+                    self._index(copy._terms)
+            else:
+                copy = term.clone
+            # The copy stands for the copied term, so it may be shared by
+            # the clones the copied term may be shared by
+            copy._epoch = term._epoch
+            self._copies[id(term)] = (term, ref(copy))
+            self._sources[id(copy)] = term
+        return copy
+
+    def source(self, copy: Term) -> Term:
+        """Returns the term the given term is the copy of, or None if it's
+        not a copy made by this session."""
+        term = self._sources.get(id(copy))
+        if term is None or self._copies[id(term)][1]() is not copy:
+            return None
+        return term
+
+    def own_terms(self, operation: Operation):
+        """Replaces the shared terms of the operation by their copies. The
+        other clones may share the operation, so their indices of the
+        shared terms are updated."""
+        terms = operation._terms
+        copies = [self.copy(term) for term in terms]
+        self.leave(operation)
+        operation._terms = copies
+        for session in list(_indexed):
+            if id(operation) in session._shared:
+                session._index(copies)
+                session._unindex(terms)
+
+    def leave(self, operation: Operation):
+        """Marks the operation as the one not sharing it's terms."""
+        if self._shared is not None:
+            self._unindex(operation._terms)
+        operation._session = None
+        self._lazy -= 1
+        if not self._lazy:
+            self._discard()
+
+    def shares(self, term: Term) -> bool:
+        """Returns if the term can be reached from the lazy operations."""
+        if self._shared is None:
+            self._shared = {}
+            _indexed.add(self)
+            for operation in self._lazy_operations():
+                self._index(operation._terms)
+        return id(term) in self._shared
+
+    def copy_all(self):
+        """Copies all the shared terms of the clone."""
+        self._shared = None
+        _indexed.discard(self)
+        stack = self._lazy_operations()
+        while stack:
+            operation = stack.pop()
+            if operation._session is self:
+                self.own_terms(operation)
+                stack.extend(term for term in operation._terms
+                             if getattr(term, "_session", None) is self)
+        # The copies dropped while still lazy are not counted anymore
+        self._discard()
+
+    def own_custom_operations(self, operation: Operation):
+        """Copies the paths of the clone leading to the custom operations,
+        so these are evaluated over the terms of the clone."""
+        # Terms with the flags if they contain some custom operation, by
+        # their ids
+        containing: dict[int, tuple[Term, bool]] = {}
+        stack = [operation]
+        while stack:
+            operation = stack.pop()
+            if operation._session is self and \
+                    _contains_custom(operation, containing):
+                self.own_terms(operation)
+                stack.extend(term for term in operation._terms
+                             if isinstance(term, Operation))
+
+    def _lazy_operations(self) -> list[Operation]:
+        """Returns the copies still sharing their terms."""
+        operations = []
+        for _, reference in self._copies.values():
+            copy = reference()
+            if getattr(copy, "_session", None) is self:
+                operations.append(copy)
+        return operations
+
+    def _index(self, terms: Iterable[Term]):
+        """Adds the given terms contained in some shared or lazy operation
+        to the index of the shared terms (see `_shared`)."""
+        shared = self._shared
+        stack = list(terms)
+        while stack:
+            term = stack.pop()
+            if term._factory is not None:
+                continue
+            entry = shared.get(id(term))
+            if entry is not None:
+                entry[1] += 1
+                continue
+            shared[id(term)] = [term, 1]
+            if isinstance(term, Operation):
+                stack.extend(term._terms)
+
+    def _unindex(self, terms: Iterable[Term]):
+        """Removes the given terms not contained in the operation anymore
+        from the index of the shared terms (see `_shared`)."""
+        shared = self._shared
+        stack = list(terms)
+        while stack:
+            term = stack.pop()
+            entry = shared.get(id(term))
+            if entry is None:
+                continue
+            entry[1] -= 1
+            if not entry[1]:
+                del shared[id(term)]
+                if isinstance(term, Operation):
+                    stack.extend(term._terms)
+
+    def _discard(self):
+        """Forgets the copies once no operation is lazy."""
+        self._lazy = 0
+        _sessions.discard(self)
+        self._copies.clear()
+        self._sources.clear()
+        self._shared = None
+        _indexed.discard(self)
+
+
+# Sessions of the clones still sharing some terms, and the ones of them
+# with the index of the shared terms
+_sessions = WeakSet()
+_indexed = WeakSet()
+
+
+def _prepare_change(term: Term):
+    """Copies the clones, which still share the term about to be changed.
+    The clone the term is the copy for is copied when it still shares the
+    copied term (or the term that one is the copy of, when read through the
+    lazy operations of an older clone), as the whole clone is changed; the
+    newer clones may read the term through it, so it's copied first."""
+    sessions = sorted(_sessions, key=lambda session: session._epoch)
+    for session in sessions:
+        source = session.source(term)
+        while source is not None:
+            if session.shares(source):
+                session.copy_all()
+                break
+            source = next(filter(None, (other.source(source)
+                                        for other in sessions)), None)
+    for session in sessions:
+        if session._lazy and term._epoch < session._epoch and \
+                session.source(term) is None and session.shares(term):
+            session.copy_all()
+
+
+def _contains_custom(term: Term, containing: dict[int, tuple[Term, bool]]
+                     ) -> bool:
+    """Returns if the term contains some custom operation; the results for
+    the subterms are kept in the given dictionary."""
+    stack = [(term, False)]
+    while stack:
+        subterm, expanded = stack.pop()
+        if expanded:
+            containing[id(subterm)] = (subterm, isinstance(
+                subterm, CustomOperation) or any(
+                containing[id(t)][1] for t in subterm._terms))
+        elif id(subterm) not in containing:
+            if isinstance(subterm, Operation) and subterm._factory is None:
+                stack.append((subterm, True))
+                stack.extend((t, False) for t in subterm._terms)
+            else:
+                containing[id(subterm)] = (subterm, False)
+    return containing[id(term)][1]
+
+
+def _structurally_equal(first: Term, second: Term) -> bool:
+    """Returns if the interned terms of different factories are
+    structurally equal. The terms are walked together without recursion and
+    every pair of their subterms is compared once; the factories stay
+    untouched."""
+    compared = set()
+    stack = [(first, second)]
+    while stack:
+        first, second = stack.pop()
+        if first is second or (id(first), id(second)) in compared:
+            continue
+        compared.add((id(first), id(second)))
+        if (type(first) is not type(second) or first._hash != second._hash
+                or first._factory is second._factory):
+            return False
+        if isinstance(first, Atom):
+            if (first._atom_name != second._atom_name
+                    or first._value != second._value):
+                return False
+        elif len(first._terms) != len(second._terms):
+            return False
+        else:
+            if isinstance(first, CustomOperation) and (
+                    first._cardinality != second._cardinality
+                    or first._evaluator is not second._evaluator
+                    or first._vectorized_evaluator
+                    is not second._vectorized_evaluator):
+                return False
+            stack.extend(zip(first._terms, second._terms))
+    return True
+
+
+# Constants the custom operations are evaluated for (see
+# `CustomOperation.evaluate_values`), indexed by their values
+_CONSTANTS = (Constant(False), Constant(True))
+
+# Weak references to the watchers of the changes of the terms (the
+# structure of the operations and the names of the atoms) indexed by the ids
+# of the watched terms; see `_watch`
+_watchers: dict[int, list[ref]] = {}
+
+
+def _watch(keys: Iterable[int], watcher: ref):
+    """Registers the watcher to be notified about the changes of the terms
+    of the given ids. The watcher is a weak reference to an object with
+    method `_term_changed`, which is called with the changed term."""
+    for key in keys:
+        watchers = _watchers.get(key)
+        if watchers is None:
+            _watchers[key] = [watcher]
+        else:
+            watchers.append(watcher)
+
+
+def _unwatch(keys: Iterable[int], watcher: ref):
+    """Stops notifying the watcher about the changes of the terms of the
+    given ids."""
+    for key in keys:
+        watchers = _watchers.get(key)
+        if watchers is not None and watcher in watchers:
+            watchers.remove(watcher)
+            if not watchers:
+                del _watchers[key]
+
+
+def _notify(term: Term):
+    """Notifies the watchers of the term about it's change."""
+    for watcher in _watchers.get(id(term), ()):
+        watcher = watcher()
+        if watcher is not None:
+            watcher._term_changed(term)
+
+
+def _constant(value: bool, like: Term) -> Constant:
+    """Returns the constant of the given value made like the given term."""
+    if like._factory is not None:
+        return like._factory.constant(value)
+    return Constant(value)
+
+
+def _partial_atom(atom: Term, env: Environment) -> Term:
+    """Returns the result of the partial evaluation of the atom; the
+    constant if it's value is known, otherwise the copy of the atom."""
+    if isinstance(atom, Constant) or not isinstance(atom, Atom):
+        return atom.clone
+    value = atom._value
+    if value is None and env is not None:
+        value = env.lookup(atom._atom_name)
+    if value is None:
+        return atom.clone
+    return _constant(value, atom)
+
+
+def _drive_partial_evaluation(term: Term, env: Environment) -> Term:
+    """Evaluates the term partially by driving the partial evaluation
+    steps of all the contained operations by an explicit stack. Every
+    contained term is evaluated at most once."""
+    if not isinstance(term, Operation):
+        return _partial_atom(term, env)
+
+    cache = {}
+    result = None
+    evaluations = [(term, term._partial_steps())]
+    while evaluations:
+        try:
+            subterm = evaluations[-1][1].send(result)
+        except StopIteration as stop:
+            result = stop.value
+            cache[id(evaluations.pop()[0])] = result
+            continue
+
+        if id(subterm) in cache:
+            result = cache[id(subterm)]
+        elif isinstance(subterm, Operation):
+            evaluations.append((subterm, subterm._partial_steps()))
+            result = None
+        else:
+            result = cache[id(subterm)] = _partial_atom(subterm, env)
+    return result
+
+
+def _drive_evaluation(operation: Operation, env: Environment,
+                      cache: dict) -> bool:
+    """Evaluates the operation by driving the evaluation steps of it and of
+    all the contained operations by an explicit stack.
+
+    Parameters
+    ----------
+    operation: Operation
+        The operation to be evaluated.
+
+    env: Environment
+        Environment containing declaration of values set to the variables
+
+    cache: dict
+        Values of already evaluated terms indexed by their identity. When
+        given, every term is evaluated at most once.
+    """
+    value = None
+    evaluations = [(operation, operation._evaluation_steps(env))]
+    while evaluations:
+        try:
+            term = evaluations[-1][1].send(value)
+        except StopIteration as stop:
+            value = stop.value
+            term = evaluations.pop()[0]
+            if cache is not None:
+                cache[id(term)] = value
+            continue
+
+        if cache is not None and id(term) in cache:
+            value = cache[id(term)]
+        elif isinstance(term, Operation):
+            evaluations.append((term, term._evaluation_steps(env)))
+            value = None
+        else:
+            value = term.evaluate(env)
+    return value
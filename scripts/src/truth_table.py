@@ -0,0 +1,162 @@
+"""This module contains a truth table of terms. The truth table is computed
+bit-parallel; the values of the term for all the assignments are encoded as
+bits of one integer, so every operator is computed by a single operation
+over the big integers instead of evaluating the term row by row."""
+
+from typing import Iterable, Iterator
+
+from scripts.src.algebra import Algebra
+from scripts.src.term import Term
+
+
+class _BitAlgebra(Algebra):
+    """Algebra interpreting the atoms as the integers, which bits are the
+    values of the variable in all the rows of the truth table. The constant
+    true is represented by -1 (i.e. infinitely many ones), so the results
+    have to be masked by the number of rows.
+
+    Some variables may be fixed to the given values instead; these are
+    interpreted as the constants."""
+
+    def __init__(self, variable_names: tuple[str],
+                 fixed: dict[str, bool] = None):
+        self._variables = {
+            name: index for index, name in enumerate(variable_names)}
+        self._size = len(variable_names)
+        self._fixed = fixed or {}
+
+    def variable(self, name: str) -> int:
+        if name in self._fixed:
+            return self.constant(self._fixed[name])
+
+        # The first variable is the most significant bit of the row number
+        block = 1 << (self._size - 1 - self._variables[name])
+
+        # Pattern of 'block' zeros followed by 'block' ones, repeated
+        pattern = ((1 << block) - 1) << block
+        width = 2 * block
+        while width < 1 << self._size:
+            pattern |= pattern << width
+            width *= 2
+        return pattern
+
+    def constant(self, value: bool) -> int:
+        return -1 if value else 0
+
+
+class TruthTable:
+    """Truth table of a term over the given variables. The rows are ordered
+    as binary numbers made of the values of the variables, the first
+    variable being the most significant one. Thus the first row assigns
+    False to all the variables and the last one assigns True to all of them.
+    """
+
+    def __init__(self, term: Term, variable_names: Iterable[str] = None):
+        """Computes the truth table of the given term.
+
+        Parameters
+        ----------
+        term: Term
+            The term the truth table is computed for.
+
+        variable_names: Iterable of str, optional
+            Names of the variables the table is built over. These have to
+            contain all the variables of the term. When not given, the
+            variables of the term are used.
+
+        Raises
+        ------
+        Exception
+            When there is a variable of the term not contained in the given
+            variable names.
+        """
+        if variable_names is None:
+            variable_names = term.variable_names
+        self._variable_names = tuple(variable_names)
+
+        missing = set(term.variable_names) - set(self._variable_names)
+        if missing:
+            raise Exception(
+                f"Variables {sorted(missing)} are not in the truth table")
+
+        bits = term.interpret(_BitAlgebra(self._variable_names))
+        self._bits = bits & ((1 << len(self)) - 1)
+
+    @property
+    def variable_names(self) -> tuple[str]:
+        """Names of the variables in order of the columns of the table."""
+        return self._variable_names
+
+    @property
+    def bits(self) -> int:
+        """Integer which bits are the values of the term in the rows;
+        the lowest bit stands for the first row."""
+        return self._bits
+
+    @property
+    def is_tautology(self) -> bool:
+        """Returns if the term is true for all the assignments."""
+        return self._bits == (1 << len(self)) - 1
+
+    @property
+    def is_satisfiable(self) -> bool:
+        """Returns if the term is true for at least one assignment."""
+        return self._bits != 0
+
+    @property
+    def count_models(self) -> int:
+        """Returns the number of assignments the term is true for."""
+        return bin(self._bits).count("1")
+
+    def value(self, row: int) -> bool:
+        """Returns the value of the term in the given row.
+
+        Parameters
+        ----------
+        row: int
+            Index of the row of the table.
+        """
+        return bool(self._bits >> row & 1)
+
+    def rows(self) -> Iterator[tuple[tuple[bool], bool]]:
+        """Yields the rows of the table. Every row is a pair of the values
+        of the variables and the value of the term."""
+        size = len(self._variable_names)
+        for row in range(len(self)):
+            values = tuple(bool(row >> (size - 1 - index) & 1)
+                           for index in range(size))
+            yield values, self.value(row)
+
+    @property
+    def table(self) -> tuple[tuple[tuple[bool], bool]]:
+        """Returns the whole materialised table (see `rows`)."""
+        return tuple(self.rows())
+
+    def __len__(self) -> int:
+        """Returns the number of rows of the table."""
+        return 1 << len(self._variable_names)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TruthTable):
+            return NotImplemented
+        return (self._variable_names == other._variable_names
+                and self._bits == other._bits)
+
+    def __hash__(self) -> int:
+        return hash((self._variable_names, self._bits))
+
+
+def are_equivalent(first: Term, second: Term) -> bool:
+    """Returns if both the terms have the same value for every assignment
+    of their variables.
+
+    Parameters
+    ----------
+    first: Term
+        The first of the compared terms.
+
+    second: Term
+        The second of the compared terms.
+    """
+    names = tuple(dict.fromkeys(first.variable_names + second.variable_names))
+    return TruthTable(first, names) == TruthTable(second, names)
@@ -53,9 +53,9 @@ class TestAtoms(unittest.TestCase):
         # Should raise an exception when evaluated without value definition
         self.assertRaises(Exception, atom.evaluate)
 
-
-
-
-
-
-
+    def test_constant_clone(self):
+        """Tests that the clone of the constant is a constant."""
+        clone = tested.Constant(False, "zero").clone
+        self.assertIsInstance(clone, tested.Constant)
+        self.assertEqual("zero", clone.atom_name)
+        self.assertEqual((), clone.variable_names)
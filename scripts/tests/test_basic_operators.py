@@ -1,7 +1,8 @@
 import unittest
 
 from scripts.src.operators import *
-from scripts.src.term import Constant
+from scripts.src.environment import Environment
+from scripts.src.term import Atom, Constant, CustomOperation
 
 
 class TestOperators(unittest.TestCase):
@@ -27,6 +28,46 @@ class TestOperators(unittest.TestCase):
         self.assertEqual(True,  Disjunction([self.t, self.f]).evaluate())
         self.assertEqual(True,  Disjunction([self.t, self.t]).evaluate())
 
+    def test_nary_operators(self):
+        """Tests the conjunctions and the disjunctions of more than two
+        terms, including the short-circuit and the number of terms."""
+        def failing(env, terms):
+            raise Exception("Should not be evaluated")
+
+        custom = CustomOperation(0, [], failing)
+        conjunction = Conjunction([self.t, self.t, self.f, custom])
+        self.assertEqual(False, conjunction.evaluate())
+        self.assertEqual(False, conjunction.evaluate_shared())
+        self.assertEqual(4, conjunction.cardinality)
+        self.assertEqual(True, Disjunction([self.f, self.f, self.t, custom])
+                         .evaluate())
+        self.assertEqual(True, Conjunction([self.t] * 5).evaluate())
+        self.assertEqual(False, Disjunction([self.f] * 5).evaluate())
+
+        self.assertRaises(Exception, Conjunction, [self.t])
+        self.assertFalse(conjunction.can_be_applied([self.t]))
+        conjunction.terms = [self.t] * 3
+        self.assertEqual(3, conjunction.cardinality)
+        self.assertRaises(Exception, Implication, [self.t] * 3)
+
+    def test_wide_terms(self):
+        """Tests the conjunction of many clauses, which is evaluated
+        without the recursion."""
+        atoms = [Atom(f"x{i}") for i in range(100)]
+        term = Conjunction([Disjunction([atoms[i % 100],
+                                         Negation([atoms[i * 7 % 100]]),
+                                         atoms[i * 13 % 100]])
+                            for i in range(10000)])
+        env = Environment()
+        for i, atom in enumerate(atoms):
+            env.add_values(atom.atom_name, i % 3 == 0)
+        expected = all(
+            i % 3 == 0 or i * 7 % 100 % 3 != 0 or i * 13 % 100 % 3 == 0
+            for i in range(100))
+        self.assertEqual(expected, term.evaluate(env))
+        self.assertEqual(expected, term.evaluate_shared(env))
+        self.assertEqual(100, len(term.variable_names))
+
     def test_implication(self):
         self.assertEqual(True,  Implication([self.f, self.f]).evaluate())
         self.assertEqual(True,  Implication([self.f, self.t]).evaluate())
@@ -39,6 +80,131 @@ class TestOperators(unittest.TestCase):
         self.assertEqual(False, Equivalence([self.t, self.f]).evaluate())
         self.assertEqual(True,  Equivalence([self.t, self.t]).evaluate())
 
+    def test_custom_operation_clone(self):
+        custom = CustomOperation(
+            2, [self.t, self.f],
+            lambda env, terms: terms[0].evaluate(env) or terms[1].evaluate(env))
+        clone = custom.clone
+        self.assertIsNot(custom, clone)
+        self.assertEqual(2, clone.cardinality)
+        self.assertEqual(True, clone.evaluate())
+
+    def test_evaluate_shared_equals_evaluate(self):
+        a, b = Atom("a"), Atom("b")
+        shared = Implication([a, Negation([b])])
+        term = Equivalence([
+            Conjunction([shared, b]), Disjunction([shared, Negation([a])])])
+        for values in ((False, False), (False, True),
+                       (True, False), (True, True)):
+            env = Environment()
+            env.add_values("a", values[0])
+            env.add_values("b", values[1])
+            self.assertEqual(term.evaluate(env), term.evaluate_shared(env))
+
+    def test_evaluate_shared_evaluates_once(self):
+        calls = []
+
+        def evaluator(env, terms):
+            calls.append(env)
+            return terms[0].evaluate(env)
+
+        term = CustomOperation(1, [self.t], evaluator)
+        for _ in range(50):
+            term = Equivalence([term, term])
+
+        self.assertEqual(True, term.evaluate_shared())
+        self.assertEqual(1, len(calls))
+
+    def test_evaluate_shared_short_circuit(self):
+        undefined = Atom("undefined")
+        term = Disjunction([self.t, Conjunction([undefined, undefined])])
+        self.assertEqual(True, term.evaluate_shared())
+        self.assertRaises(
+            Exception, Negation([undefined]).evaluate_shared)
+
+    def test_variable_names_order(self):
+        a, b, c = Atom("a"), Atom("b"), Atom("c")
+        term = Conjunction([Disjunction([b, a]), Implication([a, c])])
+        self.assertEqual(("b", "a", "c"), term.variable_names)
+        self.assertEqual({"b": 0, "a": 1, "c": 2}, term.variable_index)
+        self.assertEqual((), Negation([self.t]).variable_names)
+
+    def test_variable_names_cache_invalidation(self):
+        a, b = Atom("a"), Atom("b")
+        inner = Disjunction([a, self.t])
+        term = Conjunction([inner, Negation([b])])
+        self.assertEqual(("a", "b"), term.variable_names)
+        self.assertIs(term.variable_names, term.variable_names)
+
+        # Making new terms or renaming to the same name changes nothing
+        names = term.variable_names
+        Constant(True), Negation([Atom("z")])
+        b.atom_name = "b"
+        self.assertIs(names, term.variable_names)
+
+        # Renaming of the atom deep inside the term
+        a.atom_name = "x"
+        self.assertEqual(("x", "b"), term.variable_names)
+
+        # Replacing the terms of the contained operation
+        inner.terms = [Atom("y"), b]
+        self.assertEqual(("y", "b"), term.variable_names)
+        self.assertEqual({"y": 0, "b": 1}, term.variable_index)
+
+    def test_deep_terms(self):
+        depth = 20000
+        term = Atom("x0")
+        for i in range(depth):
+            term = (Implication([Atom(f"x{i % 7}"), term]) if i % 2
+                    else Conjunction([term, Negation([Atom("y")])]))
+
+        env = Environment()
+        env.add_values("y", False)
+        for i in range(7):
+            env.add_values(f"x{i}", True)
+
+        self.assertEqual(True, term.evaluate(env))
+        self.assertEqual(True, term.evaluate_shared(env))
+        self.assertEqual(8, len(term.variable_names))
+
+        clone = term.clone
+        self.assertIsNot(term, clone)
+        self.assertEqual(True, clone.evaluate(env))
+
+        # Every node is visited; atoms are separate objects
+        self.assertEqual(2 * depth + depth // 2 + 1,
+                         len(list(term.postorder())))
+
+        # The undefined variable is still reported
+        self.assertRaises(Exception, term.evaluate, Environment())
+
+    def test_postorder(self):
+        a = Atom("a")
+        negation = Negation([a])
+        term = Conjunction([negation, a])
+        self.assertEqual([a, negation, term], list(term.postorder()))
+
+    def test_clone_keeps_sharing(self):
+        a = Atom("a")
+        term = Disjunction([a, Negation([a])])
+        clone = term.clone
+        self.assertIsNot(a, clone.terms[0])
+        self.assertIs(clone.terms[0], clone.terms[1].terms[0])
 
+    def test_slots(self):
+        """Tests that the terms keep no dictionary of attributes, while the
+        subclasses without slots still work."""
+        a = Atom("a")
+        for term in (a, Constant(True), Negation([a]),
+                     Conjunction([a, a]),
+                     CustomOperation(1, [a], lambda env, terms: True)):
+            self.assertFalse(hasattr(term, "__dict__"))
 
+        class Marked(Negation):
+            pass
 
+        marked = Marked([a])
+        marked.mark = 1
+        clone = marked.clone
+        self.assertEqual(1, clone.mark)
+        self.assertIsNot(a, clone.terms[0])
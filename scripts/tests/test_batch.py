@@ -0,0 +1,91 @@
+import unittest
+from itertools import product
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+
+try:
+    import numpy
+    from scripts.src.batch import evaluate_batch
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestBatch(unittest.TestCase):
+    """Tests of evaluating terms over batches of assignments."""
+
+    def setUp(self):
+        """Prepares the term and all it's assignments."""
+        self.a = Atom("a")
+        self.b = Atom("b")
+        self.c = Atom("c")
+
+        # (a => b) <=> (~c | (a & b))
+        self.term = Equivalence([
+            Implication([self.a, self.b]),
+            Disjunction([Negation([self.c]), Conjunction([self.a, self.b])])
+        ])
+        self.rows = list(product((False, True), repeat=3))
+
+    def _expected(self, term) -> list[bool]:
+        """Evaluates the term for every row one by one."""
+        results = []
+        for row in self.rows:
+            env = Environment()
+            for name, value in zip(term.variable_names, row):
+                env.add_values(name, value)
+            results.append(term.evaluate(env))
+        return results
+
+    def test_batch_equals_evaluated(self):
+        """Tests that the results are the same as from evaluate."""
+        result = evaluate_batch(self.term, numpy.array(self.rows))
+        self.assertEqual(numpy.bool_, result.dtype.type)
+        self.assertEqual(self._expected(self.term), result.tolist())
+
+    def test_batch_in_chunks(self):
+        """Tests that the chunking does not change the results."""
+        result = evaluate_batch(self.term, numpy.array(self.rows),
+                                chunk_size=3)
+        self.assertEqual(self._expected(self.term), result.tolist())
+
+    def test_batch_with_constants(self):
+        """Tests that the constants are broadcast to the whole batch."""
+        term = Disjunction([Constant(False), Negation([self.a])])
+        result = evaluate_batch(term, numpy.array([[True], [False]]))
+        self.assertEqual([False, True], result.tolist())
+
+    def test_batch_wrong_shape(self):
+        """Tests that the matrix has to match the variables."""
+        self.assertRaises(Exception, evaluate_batch, self.term,
+                          numpy.zeros((4, 2), dtype=bool))
+
+    def test_custom_operation_vectorized(self):
+        """Tests that the vectorized evaluator of the custom operation is
+        used when it's given."""
+        calls = []
+
+        def vectorized(values):
+            calls.append(values)
+            return values[0] ^ values[1]
+
+        custom = CustomOperation(
+            2, [self.a, self.c],
+            lambda env, terms: terms[0].evaluate(env) != terms[1].evaluate(env),
+            vectorized)
+        term = Conjunction([self.b, custom])
+        result = evaluate_batch(term, numpy.array(self.rows))
+        self.assertEqual(self._expected(term), result.tolist())
+        self.assertEqual(1, len(calls))
+
+    def test_custom_operation_fallback(self):
+        """Tests that the custom operation without vectorized evaluator is
+        evaluated row by row."""
+        custom = CustomOperation(
+            2, [self.a, self.c],
+            lambda env, terms: terms[0].evaluate(env) != terms[1].evaluate(env))
+        term = Disjunction([custom, self.b])
+        result = evaluate_batch(term, numpy.array(self.rows), chunk_size=5)
+        self.assertEqual(self._expected(term), result.tolist())
@@ -0,0 +1,160 @@
+import random
+import unittest
+
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+import scripts.src.bdd as tested
+
+
+def _random_term(generator: random.Random, variables: int, size: int):
+    """Returns a random term over the given number of variables."""
+    operators = (Conjunction, Disjunction, Implication, Equivalence)
+    terms = [Atom(f"x{generator.randrange(variables)}") for _ in range(size)]
+    while len(terms) > 1:
+        first = terms.pop(generator.randrange(len(terms)))
+        second = terms.pop(generator.randrange(len(terms)))
+        term = generator.choice(operators)([first, second])
+        if generator.random() < 0.3:
+            term = Negation([term])
+        terms.append(term)
+    return terms[0]
+
+
+class TestBdd(unittest.TestCase):
+    """Tests of the binary decision diagrams."""
+
+    def setUp(self):
+        """Prepares the manager and random terms."""
+        self.manager = tested.BddManager([f"x{i}" for i in range(5)])
+        generator = random.Random(5)
+        self.terms = [_random_term(generator, 5, 8) for _ in range(40)]
+
+    def test_count_models(self):
+        """Tests that the models are counted as by the truth table."""
+        for term in self.terms:
+            table = TruthTable(term)
+            diagram = self.manager.build(term)
+            self.assertEqual(table.count_models,
+                             diagram.count_models(table.variable_names))
+            unused = 5 - len(table.variable_names)
+            self.assertEqual(table.count_models << unused,
+                             diagram.count_models())
+
+    def test_equivalence(self):
+        """Tests that the equivalent terms have the same diagram."""
+        a, b, c = Atom("x0"), Atom("x1"), Atom("x2")
+        first = Implication([a, Conjunction([b, c])])
+        second = Conjunction([Disjunction([Negation([a]), b]),
+                              Disjunction([Negation([a]), c])])
+        self.assertEqual(self.manager.build(first),
+                         self.manager.build(second))
+        self.assertNotEqual(self.manager.build(first),
+                            self.manager.build(Implication([a, b])))
+        for term in self.terms:
+            self.assertEqual(
+                self.manager.build(term),
+                self.manager.build(Negation([Negation([term])])))
+
+    def test_constants(self):
+        """Tests the tautology and the contradiction."""
+        a = Atom("a")
+        self.assertEqual(True, self.manager.build(
+            Disjunction([a, Negation([a])])).is_tautology)
+        self.assertEqual(False, self.manager.build(
+            Conjunction([a, Constant(False)])).is_satisfiable)
+        self.assertEqual(self.manager.true,
+                         self.manager.build(Constant(True)))
+
+    def test_restrict(self):
+        """Tests fixing the values of the variables."""
+        a, b, c = Atom("x0"), Atom("x1"), Atom("x2")
+        diagram = self.manager.build(
+            Disjunction([Conjunction([a, b]), c]))
+        self.assertEqual(self.manager.build(Disjunction([b, c])),
+                         diagram.restrict({"x0": True}))
+        self.assertEqual(self.manager.build(c),
+                         diagram.restrict({"x0": False, "unknown": True}))
+        self.assertEqual(("x2",), diagram.restrict({"x0": False}).support)
+
+    def test_custom_operation(self):
+        """Tests the diagram of the custom operation."""
+        majority = CustomOperation(
+            3, [Atom("x0"), Atom("x1"), Atom("x2")],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        self.assertEqual(4, self.manager.build(majority)
+                         .count_models(["x0", "x1", "x2"]))
+
+    def test_missing_variables(self):
+        """Tests counting over variables not containing the support."""
+        diagram = self.manager.build(Conjunction([Atom("x0"), Atom("x1")]))
+        self.assertRaises(Exception, diagram.count_models, ["x0"])
+        self.assertEqual(2, diagram.count_models(["x0", "x1", "y"]))
+
+    def test_managers_cannot_be_mixed(self):
+        """Tests combining the diagrams of different managers."""
+        other = tested.BddManager()
+        self.assertRaises(Exception, lambda: self.manager.variable("a")
+                          & other.variable("a"))
+
+    def test_reorder(self):
+        """Tests that the diagrams stay valid when reordered."""
+        diagrams = [self.manager.build(term) for term in self.terms]
+        counts = [d.count_models() for d in diagrams]
+        self.manager.reorder(["x4", "x2", "x0"])
+        self.assertEqual(("x4", "x2", "x0", "x1", "x3"), self.manager.order)
+        self.assertEqual(counts, [d.count_models() for d in diagrams])
+        for term, diagram in zip(self.terms, diagrams):
+            self.assertEqual(diagram, self.manager.build(term))
+
+    def test_sift(self):
+        """Tests that sifting finds the good order of the comparator,
+        which is exponential in the interleaved order."""
+        names = [f"a{i}" for i in range(8)] + [f"b{i}" for i in range(8)]
+        manager = tested.BddManager(names)
+        term = Constant(True)
+        for i in range(8):
+            term = Conjunction([term, Equivalence([Atom(f"a{i}"),
+                                                   Atom(f"b{i}")])])
+        diagram = manager.build(term)
+        size = len(diagram)
+        manager.sift()
+        self.assertLess(len(diagram), size)
+        self.assertEqual(3 * 8 + 2, len(diagram))
+        self.assertEqual(diagram, manager.build(term))
+        self.assertEqual(1 << 8, diagram.count_models())
+
+    def test_garbage_collection(self):
+        """Tests that the nodes of the dropped diagrams are freed."""
+        term = Equivalence([Atom("x0"), Atom("x3")])
+        diagram = self.manager.build(term)
+        for other in self.terms:
+            self.manager.build(other)
+        self.manager.collect_garbage()
+        self.assertEqual(len(diagram), len(self.manager))
+        self.assertEqual(diagram, self.manager.build(term))
+
+    def test_small_cache(self):
+        """Tests that the results do not depend on the cache size."""
+        manager = tested.BddManager(cache_size=1)
+        for term in self.terms:
+            self.assertEqual(TruthTable(term).count_models,
+                             manager.build(term).count_models(
+                                 TruthTable(term).variable_names))
+
+    def test_many_variables(self):
+        """Tests the diagrams deeper than the recursion limit."""
+        atoms = [Atom(f"y{i}") for i in range(1100)]
+        manager = tested.BddManager(atom.atom_name for atom in atoms)
+        diagram = manager.build(Conjunction(atoms[::-1]))
+        self.assertEqual(1, diagram.count_models())
+        self.assertEqual(1102, len(diagram))
+        negation = ~diagram
+        self.assertEqual((1 << 1100) - 1, negation.count_models())
+        self.assertEqual(diagram, ~negation)
+
+        pairs = manager.build(Disjunction([
+            Conjunction(atoms[i:i + 2]) for i in range(1098, -1, -2)]))
+        self.assertFalse((pairs & ~pairs).is_satisfiable)
+        self.assertTrue(pairs.restrict({"y0": True, "y1": True})
+                        .is_tautology)
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from scripts.benchmarks.generators import (random_term, random_3sat,
+                                           random_environment, term_text)
+from scripts.benchmarks.harness import Benchmark, compare, load, run, save
+from scripts.src.operators import Negation, Conjunction
+from scripts.src.parser import parse
+from scripts.src.term import Atom
+from scripts.src.truth_table import TruthTable
+
+
+def _depth(term) -> int:
+    depths = {}
+    for subterm in term.postorder():
+        if isinstance(subterm, Atom):
+            depths[id(subterm)] = 0
+        else:
+            depths[id(subterm)] = 1 + max(
+                depths[id(each)] for each in subterm.terms)
+    return depths[id(term)]
+
+
+class TestGenerators(unittest.TestCase):
+    """Tests of the seeded generators of the benchmark data."""
+
+    def test_determinism(self):
+        """Tests that the same seed gives the same term and another seed
+        gives another one."""
+        first = random_term(8, 6, width=3, seed=5)
+        second = random_term(8, 6, width=3, seed=5)
+        self.assertEqual(term_text(first), term_text(second))
+        self.assertNotEqual(term_text(first),
+                            term_text(random_term(8, 6, width=3, seed=6)))
+        self.assertEqual(term_text(random_3sat(10, 20, seed=1)),
+                         term_text(random_3sat(10, 20, seed=1)))
+        self.assertEqual(
+            [declaration.value
+             for declaration in random_environment(10, 3).declarations],
+            [declaration.value
+             for declaration in random_environment(10, 3).declarations])
+
+    def test_shape(self):
+        """Tests the depth, the width and the variables of the terms."""
+        self.assertIsInstance(random_term(4, 0), Atom)
+        for depth in (1, 4, 9):
+            self.assertEqual(depth, _depth(random_term(6, depth, seed=2)))
+        term = random_term(6, 3, width=4, operators={Negation: 1})
+        conjunctions = [each for each in term.postorder()
+                        if isinstance(each, Conjunction)]
+        self.assertEqual(3, len(conjunctions))
+        self.assertTrue(set(term.variable_names) <= {
+            f"x{index}" for index in range(6)})
+
+    def test_text(self):
+        """Tests that the text of the term is parsed back to it."""
+        for seed in range(10):
+            term = random_term(5, 4, width=2, seed=seed)
+            self.assertEqual(TruthTable(term),
+                             TruthTable(parse(term_text(term)),
+                                        term.variable_names))
+
+
+class TestHarness(unittest.TestCase):
+    """Tests of the measuring and comparing of the benchmarks."""
+
+    def test_run(self):
+        """Tests the measurement and the selection of the benchmarks."""
+        calls = []
+        suite = [Benchmark("first", lambda: lambda: calls.append(1)),
+                 Benchmark("second", lambda: lambda: None)]
+        results = run(suite, "first", rounds=2)
+        self.assertEqual(["first"], list(results["results"]))
+        result = results["results"]["first"]
+        self.assertGreater(result["seconds"], 0)
+        # The calibration makes one of the rounds
+        self.assertGreaterEqual(len(calls), 2 * result["calls"])
+
+    def test_compare(self):
+        """Tests that just the slowdowns above the tolerance are
+        reported."""
+        baseline = {"results": {"a": {"seconds": 1.0},
+                                "b": {"seconds": 1.0},
+                                "c": {"seconds": 1.0}}}
+        results = {"results": {"a": {"seconds": 1.1},
+                               "b": {"seconds": 1.5},
+                               "c": {"seconds": 0.5},
+                               "d": {"seconds": 9.0}}}
+        self.assertEqual([("b", 1.5)], compare(results, baseline, 0.2))
+        self.assertEqual([], compare(results, baseline, 0.6))
+
+    def test_save_load(self):
+        """Tests that the stored results are loaded back."""
+        results = run([Benchmark("a", lambda: lambda: None)], rounds=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            save(results, path)
+            self.assertEqual(results, load(path))
@@ -0,0 +1,159 @@
+import pickle
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.instrumentation import Instrumentation
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+
+
+def _env(**values) -> Environment:
+    env = Environment()
+    for name, value in values.items():
+        env.add_values(name, value)
+    return env
+
+
+class TestClone(unittest.TestCase):
+    """Tests of the copy-on-write clones of the operations."""
+
+    def setUp(self):
+        self.a, self.b, self.c = Atom("a"), Atom("b", True), Atom("c")
+        self.shared = Disjunction([self.a, self.b])
+        self.term = Conjunction([Negation([self.shared]),
+                                 Implication([self.shared, self.c])])
+
+    def test_changed_clone(self):
+        """Tests that changing the clone keeps the original unchanged."""
+        table = TruthTable(self.term)
+        clone = self.term.clone
+        first, second = clone.terms
+        first.terms[0].terms[1].value = False
+        second.terms = [Atom("d"), Constant(False)]
+        self.assertEqual(table, TruthTable(self.term))
+        self.assertTrue(self.b.value)
+        self.assertIs(self.shared, self.term.terms[1].terms[0])
+        self.assertEqual(("a", "b", "d"), clone.variable_names)
+        self.assertEqual(("a", "b", "c"), self.term.variable_names)
+
+    def test_changed_original(self):
+        """Tests that changing the original through the references held
+        before cloning keeps the clone unchanged."""
+        table = TruthTable(self.term)
+        clone = self.term.clone
+        self.a.atom_name = "x"
+        self.shared.terms = [self.c, self.c]
+        self.term.terms[1].terms = [Constant(True), Constant(False)]
+        self.assertEqual(table, TruthTable(clone))
+        self.assertEqual(("a", "b", "c"), clone.variable_names)
+
+        # The clone of the clone is independent of both of them
+        other = clone.clone
+        clone.terms[0].terms[0].terms[0].atom_name = "y"
+        self.assertEqual("a", other.terms[1].terms[0].terms[0].atom_name)
+        self.assertEqual("y", clone.terms[1].terms[0].terms[0].atom_name)
+
+    def test_path_copying(self):
+        """Tests that only the path to the reached terms is copied and that
+        the shared terms stay shared in the clone."""
+        clone = self.term.clone
+        self.assertIsNot(self.term, clone)
+        negation = clone.terms[0]
+        self.assertIsNot(self.term.terms[0], negation)
+        self.assertIs(self.term.terms[0]._terms, negation._terms)
+        self.assertIs(self.term.terms[1]._terms, clone.terms[1]._terms)
+
+        shared = negation.terms[0]
+        self.assertIsNot(self.shared, shared)
+        self.assertIs(shared, clone.terms[1].terms[0])
+        self.assertIsNot(self.a, shared.terms[0])
+
+        factory = TermFactory()
+        interned = Negation([factory.intern(self.term)])
+        self.assertIs(interned.terms[0], interned.clone.terms[0])
+
+    def test_evaluation(self):
+        """Tests that the clone is evaluated without copying it's terms."""
+        clone = self.term.clone
+        env = _env(a=False, b=False, c=True)
+        self.assertEqual(self.term.evaluate(env), clone.evaluate(env))
+        self.assertEqual(self.term.variable_names, clone.variable_names)
+        self.assertIs(self.term.terms[0]._terms, clone._terms[0]._terms)
+
+    def test_pickled_clone(self):
+        """Tests that the unpickled clone owns it's terms."""
+        clone = pickle.loads(pickle.dumps(self.term.clone))
+        self.assertIsNone(clone._session)
+        self.a.atom_name = "x"
+        self.assertEqual(("a", "b", "c"), clone.variable_names)
+        self.assertIs(clone.terms[0].terms[0], clone.terms[1].terms[0])
+
+    def test_deep_term(self):
+        """Tests the clone of the term much deeper than the recursion
+        limit, changed at the bottom."""
+        bottom = Atom("a")
+        term = bottom
+        for _ in range(20000):
+            term = Negation([term])
+        clone = term.clone
+        bottom.value = True
+        self.assertTrue(term.evaluate())
+
+        subterm = clone
+        while isinstance(subterm, Negation):
+            subterm = subterm.terms[0]
+        self.assertIsNone(subterm.value)
+        subterm.atom_name = "b"
+        self.assertEqual(("b",), clone.variable_names)
+        self.assertEqual(("a",), term.variable_names)
+
+    def test_unrelated_change(self):
+        """Tests that changing a term copies just the clones still sharing
+        it, while changing the clone copies just the path to the changed
+        term."""
+        other = Negation([Atom("x")])
+        first = Disjunction([Atom("d"), Negation([Atom("e")])])
+        second = Conjunction([Atom("f"), Negation([Atom("g")])])
+        term = Implication([first, second])
+        clone, partial = term.clone, first.clone
+        other.terms = [Atom("y")]
+        self.assertIs(term._terms, clone._terms)
+
+        second.terms[1].terms[0].value = True
+        self.assertIsNot(term._terms, clone._terms)
+        self.assertIsNone(clone.terms[1].terms[1].terms[0].value)
+        self.assertEqual(("d", "e", "f", "g"), clone.variable_names)
+        self.assertIs(first._terms, partial._terms)
+
+        partial.terms[0].atom_name = "z"
+        self.assertEqual(("d", "e"), first.variable_names)
+        self.assertEqual(("z", "e"), partial.variable_names)
+        self.assertIs(first._terms[1]._terms, partial._terms[1]._terms)
+
+    def test_owned_traversals(self):
+        """Tests that the traversals of the clone (the postorder, the
+        instrumented evaluation and the custom evaluators) reach just the
+        terms of the clone."""
+        original = {id(term) for term in self.term.postorder()}
+        clone = self.term.clone
+        self.assertFalse(original & {id(t) for t in clone.postorder()})
+
+        traced = []
+        Instrumentation(lambda event, term, value: traced.append(term),
+                        timing=False).evaluate(self.term.clone,
+                                               _env(a=True, c=False))
+        self.assertFalse(original & {id(term) for term in traced})
+
+        def evaluator(env, terms):
+            terms[0].atom_name = "y"
+            return terms[0].evaluate(env)
+
+        custom = CustomOperation(1, [self.a], evaluator)
+        term = Conjunction([Negation([custom]), self.c])
+        clone = term.clone
+        self.assertFalse(clone.evaluate(_env(y=True, c=True)))
+        self.assertEqual("a", self.a.atom_name)
+        self.assertEqual(("a", "c"), term.variable_names)
+        self.assertEqual(("y", "c"), clone.variable_names)
@@ -0,0 +1,101 @@
+import random
+import types
+import unittest
+
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+import scripts.src.cnf as tested
+
+
+def _models(clauses: list[list[int]], count: int) -> list[dict[int, bool]]:
+    """Returns all the models of the clauses over the given variables."""
+    models = []
+    for bits in range(1 << count):
+        model = {v: bool(bits >> (v - 1) & 1) for v in range(1, count + 1)}
+        if all(any(model[abs(l)] == (l > 0) for l in c) for c in clauses):
+            models.append(model)
+    return models
+
+
+class TestCnf(unittest.TestCase):
+    """Tests of encoding terms into clauses."""
+
+    def setUp(self):
+        """Prepares random terms over few variables."""
+        generator = random.Random(11)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        self.terms = []
+        for _ in range(30):
+            terms = [Atom(f"x{generator.randrange(4)}") for _ in range(6)]
+            while len(terms) > 1:
+                first = terms.pop(generator.randrange(len(terms)))
+                second = terms.pop(generator.randrange(len(terms)))
+                term = generator.choice(operators)([first, second])
+                if generator.random() < 0.3:
+                    term = Negation([term])
+                terms.append(term)
+            self.terms.append(terms[0])
+
+    def test_clauses_are_streamed(self):
+        """Tests that the clauses are generated lazily."""
+        term = Conjunction([Atom("a"), Atom("b")])
+        self.assertIsInstance(tested.clauses(term), types.GeneratorType)
+
+    def test_models_are_preserved(self):
+        """Tests that every model of the term extends to exactly one model
+        of the clauses with the same values of the atoms."""
+        for term in self.terms:
+            encoding = tested.CnfEncoding(term)
+            clauses = list(encoding.clauses())
+            models = _models(clauses, encoding.variable_count)
+            self.assertEqual(TruthTable(term).count_models, len(models))
+            for model in models:
+                self.assertEqual(
+                    True, term.evaluate(encoding.environment(model)))
+
+    def test_polarity_preserves_satisfiability(self):
+        """Tests that the Plaisted-Greenbaum clauses are satisfiable iff
+        the term is and that there are not more of them."""
+        for term in self.terms:
+            encoding = tested.CnfEncoding(term, polarity=True)
+            clauses = list(encoding.clauses())
+            models = _models(clauses, encoding.variable_count)
+            self.assertEqual(TruthTable(term).is_satisfiable, bool(models))
+            for model in models:
+                self.assertEqual(
+                    True, term.evaluate(encoding.environment(model)))
+            self.assertLessEqual(
+                len(clauses), len(list(tested.clauses(term))))
+
+    def test_variables(self):
+        """Tests the map of the variables back to the atoms."""
+        encoding = tested.CnfEncoding(Implication([Atom("p"), Atom("q")]))
+        self.assertEqual({"p": 2, "q": 3}, encoding.variables)
+        self.assertEqual(4, encoding.variable_count)
+        self.assertEqual(-4, encoding.root)
+
+    def test_constants_are_folded(self):
+        """Tests that the constants do not make any gate."""
+        term = Disjunction([Conjunction([Atom("a"), Constant(True)]),
+                            Constant(False)])
+        self.assertEqual([[tested.TRUE], [2]], list(tested.clauses(term)))
+        self.assertEqual([[tested.TRUE], [-tested.TRUE]],
+                         list(tested.clauses(Constant(False))))
+
+    def test_equivalence_heavy_term(self):
+        """Tests that the number of clauses stays linear for the nested
+        equivalences, which blow up the distributive conversion."""
+        term = Atom("x0")
+        for i in range(1, 200):
+            term = Equivalence([term, Implication([Atom(f"x{i}"), term])])
+        self.assertLessEqual(len(list(tested.clauses(term))), 4 * 400 + 2)
+
+    def test_custom_operation(self):
+        """Tests that the custom operation is encoded by it's values."""
+        majority = CustomOperation(
+            3, [Atom("a"), Atom("b"), Atom("c")],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        encoding = tested.CnfEncoding(majority)
+        models = _models(list(encoding.clauses()), encoding.variable_count)
+        self.assertEqual(4, len(models))
@@ -0,0 +1,142 @@
+import random
+import unittest
+from itertools import product
+
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.operators import *
+from scripts.src.rewriting import flatten
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable, _BitAlgebra
+import scripts.src.compact as tested
+
+
+def _random_term(generator: random.Random, size: int):
+    operators = (Conjunction, Disjunction, Implication, Equivalence)
+    terms = [Atom(f"x{generator.randrange(5)}") for _ in range(size)]
+    terms.append(Constant(generator.random() < 0.5))
+    while len(terms) > 1:
+        first = terms.pop(generator.randrange(len(terms)))
+        second = terms.pop(generator.randrange(len(terms)))
+        term = generator.choice(operators)([first, second])
+        if generator.random() < 0.3:
+            term = Negation([term])
+        terms.append(term)
+    return terms[0]
+
+
+class TestCompactTerm(unittest.TestCase):
+    """Tests of the array-backed terms."""
+
+    def test_evaluate(self):
+        """Tests that the values match `Term.evaluate` for all the
+        assignments."""
+        generator = random.Random(3)
+        for _ in range(30):
+            term = _random_term(generator, 8)
+            compact = tested.CompactTerm(term)
+            self.assertEqual(term.variable_names, compact.variable_names)
+            names = term.variable_names
+            for values in product((False, True), repeat=len(names)):
+                env = Environment()
+                for name, value in zip(names, values):
+                    env.add_values(name, value)
+                self.assertEqual(term.evaluate(env), compact.evaluate(env))
+
+    def test_short_circuit(self):
+        """Tests that the terms not needed are not evaluated, while the
+        undefined variables needed are reported."""
+        term = Disjunction([Constant(True), Atom("a")])
+        self.assertTrue(tested.CompactTerm(term).evaluate())
+        term = Conjunction([Atom("a"), Constant(False)])
+        self.assertRaises(Exception, tested.CompactTerm(term).evaluate)
+
+    def test_round_trip(self):
+        """Tests the conversion back to the objects, including the shared
+        terms, the constants and the custom operations."""
+        a = Atom("a")
+        shared = Negation([a])
+        custom = CustomOperation(
+            1, [shared], lambda env, terms: not terms[0].evaluate(env))
+        term = Conjunction([Disjunction([shared, Constant(True, "T")]),
+                            Implication([custom, Atom("b", False)])])
+        compact = tested.CompactTerm(term)
+        self.assertEqual(8, len(compact))
+
+        restored = compact.to_term()
+        self.assertEqual(TruthTable(term), TruthTable(restored))
+        left, right = restored.terms
+        self.assertIs(left.terms[0], right.terms[0].terms[0])
+        self.assertEqual("T", left.terms[1].atom_name)
+        self.assertFalse(right.terms[1].value)
+        self.assertFalse(restored.is_interned)
+
+        factory = TermFactory()
+        interned = compact.to_term(factory)
+        self.assertTrue(interned.is_interned)
+        self.assertIs(factory.intern(term.terms[0]), interned.terms[0])
+
+    def test_traversal(self):
+        """Tests the opcodes, the names and the children of the nodes."""
+        a, b = Atom("a"), Atom("b")
+        compact = tested.CompactTerm(Implication([a, Negation([b])]))
+        self.assertEqual([tested.VARIABLE, tested.VARIABLE, tested.NEGATION,
+                          tested.IMPLICATION],
+                         [compact.opcode(node)
+                          for node in compact.postorder()])
+        self.assertEqual(3, compact.root)
+        self.assertEqual((0, 2), compact.children(3))
+        self.assertEqual("b", compact.name(compact.children(2)[0]))
+        self.assertRaises(Exception, compact.name, 3)
+        self.assertEqual(4 * 9, compact.nbytes)
+
+    def test_interpret(self):
+        """Tests that the interpretation matches the one of the term."""
+        generator = random.Random(5)
+        for _ in range(20):
+            term = _random_term(generator, 10)
+            table = TruthTable(term)
+            bits = tested.CompactTerm(term).interpret(
+                _BitAlgebra(table.variable_names))
+            self.assertEqual(table.bits, bits & ((1 << len(table)) - 1))
+
+    def test_nary_operations(self):
+        """Tests the conjunctions and the disjunctions of more than two
+        terms; their evaluation, interpretation and conversion back."""
+        generator = random.Random(9)
+        for _ in range(20):
+            term = flatten(_random_term(generator, 10))
+            compact = tested.CompactTerm(term)
+            table = TruthTable(term)
+            bits = compact.interpret(_BitAlgebra(table.variable_names))
+            self.assertEqual(table.bits, bits & ((1 << len(table)) - 1))
+            self.assertEqual(table, TruthTable(compact.to_term()))
+            names = term.variable_names
+            for values in product((False, True), repeat=len(names)):
+                env = Environment()
+                for name, value in zip(names, values):
+                    env.add_values(name, value)
+                self.assertEqual(term.evaluate(env), compact.evaluate(env))
+
+        a, b = Atom("a"), Atom("b")
+        compact = tested.CompactTerm(Conjunction([a, Negation([b]), a, b]))
+        self.assertEqual(tested.NARY_CONJUNCTION, compact.opcode(3))
+        self.assertEqual((0, 2, 0, 1), compact.children(3))
+        self.assertEqual(4, len(compact.to_term().terms))
+        self.assertEqual(4 * 9 + 4 * 4, compact.nbytes)
+        env = Environment()
+        env.add_values("a", False)
+        self.assertFalse(compact.evaluate(env))
+        self.assertTrue(tested.CompactTerm(Disjunction(
+            [Constant(False), Negation([a]), b])).evaluate(env))
+
+    def test_deep_term(self):
+        """Tests the term much deeper than the recursion limit."""
+        term = Atom("a")
+        for _ in range(20000):
+            term = Negation([term])
+        compact = tested.CompactTerm(term)
+        env = Environment()
+        env.add_values("a", True)
+        self.assertTrue(compact.evaluate(env))
+        self.assertEqual(20001, len(compact))
@@ -0,0 +1,134 @@
+import unittest
+from itertools import product
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+
+
+class TestCompilation(unittest.TestCase):
+    """Tests of compiling terms into evaluators."""
+
+    def setUp(self):
+        """Prepares the terms used in tests."""
+        self.a = Atom("a")
+        self.b = Atom("b")
+        self.c = Atom("c")
+
+        # (a => b) <=> (~c | (a & b))
+        self.term = Equivalence([
+            Implication([self.a, self.b]),
+            Disjunction([Negation([self.c]), Conjunction([self.a, self.b])])
+        ])
+
+    @staticmethod
+    def _environment(names, values) -> Environment:
+        env = Environment()
+        for name, value in zip(names, values):
+            env.add_values(name, value)
+        return env
+
+    def test_compiled_equals_evaluated(self):
+        """Tests that the compiled term returns the same values as the
+        evaluated one for all the assignments."""
+        compiled = self.term.compile()
+        names = compiled.variable_names
+        for values in product((False, True), repeat=len(names)):
+            env = self._environment(names, values)
+            self.assertEqual(self.term.evaluate(env), compiled(values))
+
+    def test_compiled_accepts_mapping_and_environment(self):
+        """Tests the named forms of the assignment."""
+        compiled = self.term.compile()
+        env = self._environment(("a", "b", "c"), (True, False, True))
+        expected = self.term.evaluate(env)
+        self.assertEqual(expected, compiled({"a": True, "b": False, "c": True}))
+        self.assertEqual(expected, compiled(env))
+
+    def test_compiled_missing_variable(self):
+        """Tests that the missing variable causes exception."""
+        compiled = self.term.compile()
+        self.assertRaises(Exception, compiled, {"a": True, "b": False})
+        self.assertRaises(Exception, compiled, (True, False))
+
+    def test_constants_are_folded(self):
+        """Tests that the constant subterms do not remain in the code."""
+        term = Disjunction([
+            Conjunction([self.a, Constant(False)]),
+            Implication([Constant(False), self.b])])
+        compiled = term.compile()
+        self.assertIn("return True", compiled.source)
+        self.assertEqual(True, compiled((False, False)))
+
+    def test_short_circuit_is_preserved(self):
+        """Tests that the right side is not evaluated when not needed."""
+        calls = []
+
+        def evaluator(env, terms):
+            calls.append(env)
+            return True
+
+        custom = CustomOperation(1, [self.b], evaluator)
+        compiled = Conjunction([self.a, custom]).compile()
+
+        self.assertEqual(False, compiled((False, True)))
+        self.assertEqual(0, len(calls))
+        self.assertEqual(True, compiled((True, True)))
+        self.assertEqual(1, len(calls))
+
+    def test_custom_operation_fallback(self):
+        """Tests that the custom operation gets the environment."""
+        custom = CustomOperation(
+            2, [self.a, self.b],
+            lambda env, terms: terms[0].evaluate(env) != terms[1].evaluate(env))
+        compiled = Negation([custom]).compile()
+        for values in product((False, True), repeat=2):
+            self.assertEqual(values[0] == values[1], compiled(values))
+
+    def test_deep_term(self):
+        """Tests that deeply nested term can be compiled."""
+        term = self.a
+        for i in range(300):
+            term = (Negation([term]) if i % 2
+                    else Conjunction([term, Atom(f"x{i % 5}")]))
+        compiled = term.compile()
+        names = compiled.variable_names
+        for values in product((False, True), repeat=len(names)):
+            env = self._environment(names, values)
+            self.assertEqual(term.evaluate(env), compiled(values))
+
+    def test_very_deep_term(self):
+        """Tests the term so deep that the calls of the generated functions
+        would exceed the recursion limit."""
+        term = self.a
+        for i in range(40000):
+            term = (Negation([term]) if i % 2
+                    else Implication([self.b, term]))
+        compiled = term.compile()
+        for values in product((False, True), repeat=2):
+            env = self._environment(("a", "b"), values)
+            self.assertEqual(term.evaluate(env), compiled(values))
+
+    def test_shared_terms(self):
+        """Tests that the repeatedly shared term does not blow the code."""
+        term = Disjunction([self.a, self.b])
+        for _ in range(12):
+            term = Equivalence([term, term])
+        compiled = term.compile()
+        self.assertLess(len(compiled.source), 10000)
+        self.assertEqual(True, compiled((False, False)))
+
+    def test_result_is_bool(self):
+        """Tests that the result is bool even for non-bool values."""
+        self.assertIs(True, Conjunction([self.a, self.b]).compile()((1, 1)))
+        self.assertIs(False, self.a.compile()((0,)))
+        self.assertIs(True, Equivalence([self.a, self.b]).compile()((1, 2)))
+
+    def test_compiled_custom_operation_is_snapshot(self):
+        """Tests that later change of the custom operation is not
+        reflected by the compiled term."""
+        custom = CustomOperation(
+            1, [self.a], lambda env, terms: terms[0].evaluate(env))
+        compiled = custom.compile()
+        custom.terms = [self.b]
+        self.assertEqual(True, compiled((True,)))
@@ -0,0 +1,99 @@
+import random
+import time
+import unittest
+
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+import scripts.src.counting as tested
+
+
+class TestCounting(unittest.TestCase):
+    """Tests of the exact model counter."""
+
+    def test_random_terms(self):
+        """Tests that the counts match the truth tables."""
+        generator = random.Random(29)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        for _ in range(40):
+            terms = [Atom(f"x{generator.randrange(8)}") for _ in range(12)]
+            while len(terms) > 1:
+                first = terms.pop(generator.randrange(len(terms)))
+                second = terms.pop(generator.randrange(len(terms)))
+                term = generator.choice(operators)([first, second])
+                if generator.random() < 0.3:
+                    term = Negation([term])
+                terms.append(term)
+            self.assertEqual(TruthTable(terms[0]).count_models,
+                             tested.count_models(terms[0]))
+
+    def test_clauses(self):
+        """Tests counting of the models of the clauses."""
+        self.assertEqual(3, tested.count_clauses([[1, 2]], 2))
+        self.assertEqual(6, tested.count_clauses([[1, 2], [1, -1]], 3))
+        self.assertEqual(0, tested.count_clauses([[1], [-1]], 1))
+        self.assertEqual(0, tested.count_clauses([[]], 1))
+        self.assertEqual(4, tested.count_clauses([], 2))
+        self.assertRaises(Exception, tested.count_clauses, [[3]], 2)
+        self.assertRaises(Exception, tested.count_clauses, [[0]], 2)
+
+    def test_components(self):
+        """Tests the count of the term of hundreds of variables, which is
+        decomposed into the independent parts."""
+        term = Constant(True)
+        for i in range(150):
+            term = Conjunction([term, Disjunction([Atom(f"a{i}"),
+                                                   Atom(f"b{i}")])])
+        self.assertEqual(3 ** 150, tested.count_models(term))
+
+    def test_cached_components(self):
+        """Tests the count of the chain, which components repeat."""
+        term = Atom("x0")
+        for i in range(1, 200):
+            term = Disjunction([Conjunction([term, Atom(f"x{i}")]),
+                                Negation([Atom(f"x{i}")])])
+        # Models with x_i true are the models of the shorter chain, while
+        # all the assignments of the previous variables are with x_i false
+        self.assertEqual(2 ** 200 - 1, tested.count_models(term))
+
+    def test_many_variables(self):
+        """Tests the count of the clauses of hundred variables, which are
+        local to the windows of eight neighbouring variables, within the
+        time budget."""
+        generator = random.Random(5)
+        atoms = [Atom(f"x{i}") for i in range(1, 101)]
+        clauses = []
+        for _ in range(250):
+            start = generator.randrange(93)
+            clauses.append([variable * generator.choice((1, -1))
+                            for variable in generator.sample(
+                                range(start + 1, start + 9), 3)])
+        term = Conjunction([
+            Disjunction([atoms[literal - 1] if literal > 0
+                         else Negation([atoms[-literal - 1]])
+                         for literal in clause])
+            for clause in clauses])
+
+        start = time.perf_counter()
+        count = tested.count_models(term, [a.atom_name for a in atoms])
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(tested.count_clauses(clauses, 100), count)
+
+    def test_variable_names(self):
+        """Tests counting over the given variables."""
+        term = Disjunction([Atom("a"), Atom("b")])
+        self.assertEqual(12, tested.count_models(term, ["a", "b", "c", "d"]))
+        self.assertRaises(Exception, tested.count_models, term, ["a"])
+
+    def test_custom_operation(self):
+        """Tests counting of the custom operation."""
+        majority = CustomOperation(
+            3, [Atom("a"), Atom("b"), Atom("c")],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        self.assertEqual(4, tested.count_models(majority))
+
+    def test_small_cache(self):
+        """Tests that the count does not depend on the cache size."""
+        term = Conjunction([Equivalence([Atom("a"), Atom("b")]),
+                            Disjunction([Atom("c"), Atom("a")])])
+        self.assertEqual(3, tested.count_models(term, cache_size=1))
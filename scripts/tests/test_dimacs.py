@@ -0,0 +1,123 @@
+import io
+import os
+import tempfile
+import unittest
+
+from scripts.src.counting import count_clauses
+from scripts.src.factory import TermFactory
+from scripts.src.operators import *
+from scripts.src.sat import Solver
+from scripts.src.term import Atom
+from scripts.src.truth_table import TruthTable
+import scripts.src.dimacs as tested
+
+
+_EXAMPLE = b"""c example
+c of the file
+p cnf 3 4
+1 -2 0
+2 3
+-1 0
+0
+-3 1 0
+%
+0
+"""
+
+
+def _depth(term) -> int:
+    depths = {}
+    for subterm in term.postorder():
+        depths[id(subterm)] = 1 + max(
+            (depths[id(t)] for t in getattr(subterm, "terms", ())),
+            default=-1)
+    return depths[id(term)]
+
+
+class TestDimacs(unittest.TestCase):
+    """Tests of reading and writing the DIMACS CNF files."""
+
+    def test_read(self):
+        """Tests reading the header and the clauses spanning the lines,
+        including the empty clause and the end marker."""
+        self.assertEqual((3, 4), tested.read_header(io.BytesIO(_EXAMPLE)))
+        self.assertEqual([(1, -2), (2, 3, -1), (), (-3, 1)],
+                         list(tested.read_clauses(io.BytesIO(_EXAMPLE))))
+
+    def test_small_chunks(self):
+        """Tests that the lines split by the chunks are read whole."""
+        data = b"p cnf 4 2\r\n1 -2 3 0\r\n-4 2 0"
+        for chunk_size in (1, 3, 7, 100):
+            self.assertEqual(
+                [(1, -2, 3), (-4, 2)],
+                list(tested.read_clauses(io.BytesIO(data), chunk_size)))
+
+    def test_invalid(self):
+        """Tests that the invalid headers and literals are reported."""
+        self.assertRaises(Exception, tested.read_header,
+                          io.BytesIO(b"1 2 0\n"))
+        self.assertRaises(Exception, tested.read_header,
+                          io.BytesIO(b"p dnf 1 1\n"))
+        self.assertRaises(Exception, list, tested.read_clauses(
+            io.BytesIO(b"p cnf 2 1\n1 x 0\n")))
+
+    def test_read_term(self):
+        """Tests the term of the clauses; the flat operations, the shared
+        atoms and the names of the variables."""
+        data = io.BytesIO(b"p cnf 2 1\n" + b"1 -2 1 2 -1 -2 1 2 0\n" * 9)
+        term = tested.read_term(data, {1: "a"})
+        self.assertEqual(("a", "x2"), term.variable_names)
+        self.assertTrue(TruthTable(term).is_tautology)
+        # Conjunction of 9 clauses, disjunctions of 8 literals, negations
+        self.assertEqual(3, _depth(term))
+        self.assertEqual(9, len(term.terms))
+        self.assertEqual(8, len(term.terms[0].terms))
+        atoms = {id(t) for t in term.postorder() if isinstance(t, Atom)}
+        self.assertEqual(2, len(atoms))
+
+        factory = TermFactory()
+        interned = tested.read_term(io.BytesIO(_EXAMPLE), factory=factory)
+        self.assertTrue(interned.is_interned)
+        self.assertFalse(TruthTable(interned).is_satisfiable)
+        self.assertTrue(TruthTable(
+            tested.read_term(io.BytesIO(b"p cnf 0 0\n"))).is_tautology)
+
+    def test_write(self):
+        """Tests that the written clauses are read back, with the header
+        counted while writing."""
+        clauses = [(1, -2), (3,), (-1, 2, -3)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clauses.cnf")
+            self.assertEqual(3, tested.write_clauses(
+                path, iter(clauses), 3, comments=["made by test"]))
+            self.assertEqual((3, 3), tested.read_header(path))
+            self.assertEqual(clauses, list(tested.read_clauses(path)))
+
+        target = io.BytesIO()
+        tested.write_clauses(target, clauses, 3, clause_count=3)
+        self.assertEqual(b"p cnf 3 3\n1 -2 0\n3 0\n-1 2 -3 0\n",
+                         target.getvalue())
+        self.assertRaises(Exception, tested.write_clauses, io.BytesIO(),
+                          clauses, 3, clause_count=2)
+
+    def test_write_term(self):
+        """Tests that the clauses of the term keep it's models and that
+        they can be fed into the solver."""
+        a, b, c = Atom("a"), Atom("b"), Atom("c")
+        term = Equivalence([Implication([a, b]), Disjunction([b, c])])
+        target = io.BytesIO()
+        encoding = tested.write_term(target, term)
+        self.assertIn(b"c 2 a\n", target.getvalue())
+
+        target.seek(0)
+        variables, _ = tested.read_header(target)
+        target.seek(0)
+        self.assertEqual(TruthTable(term).count_models, count_clauses(
+            tested.read_clauses(target), variables))
+
+        target.seek(0)
+        solver = Solver()
+        for clause in tested.read_clauses(target):
+            solver.add_clause(clause)
+        self.assertTrue(solver.solve())
+        self.assertTrue(term.evaluate(encoding.environment(solver.model)))
@@ -85,7 +85,66 @@ class TestEnvironment(unittest.TestCase):
         self.empty_env.add_declaration(self.decl1)
         self.assertIsNone(self.empty_env.declaration("non-existing-decl"))
 
+    def test_lookup_positive(self):
+        """"""
+        self.assertEqual(self.value1, self.env_with_both.lookup(self.name1))
+        self.assertEqual(self.value2, self.env_with_both.lookup(self.name2))
 
+    def test_lookup_negative(self):
+        """"""
+        self.assertIsNone(self.env_with_first.lookup(self.name2))
 
+    def test_failed_adding_keeps_original_declaration(self):
+        """"""
+        duplicate = tested.Declaration(self.name1, not self.value1)
+        self.assertRaises(
+            Exception, self.env_with_first.add_declaration, duplicate)
 
+        # The original declaration has to stay untouched
+        self.assertIs(self.decl1, self.env_with_first.declaration(self.name1))
+        self.assertEqual(self.value1, self.env_with_first.lookup(self.name1))
 
+    def test_getting_declarations_in_order(self):
+        """"""
+        self.assertEqual(
+            (self.decl1, self.decl2), self.env_with_both.declarations)
+
+    def test_mutable_environment_notifications(self):
+        """Tests that the changes of the values are announced."""
+        env = tested.MutableEnvironment()
+        changes = []
+        env.subscribe(lambda name, value: changes.append((name, value)))
+        env.add_values("a", True)
+        env.set_value("a", True)
+        env.set_value("a", False)
+        env.set_values({"b": True, "a": False})
+        self.assertEqual([("a", True), ("a", False), ("b", True)], changes)
+        self.assertEqual(False, env.lookup("a"))
+        self.assertEqual(False, env.declaration("a").value)
+        self.assertEqual(("a", "b"), env.declaration_names)
+
+    def test_mutable_environment_unsubscribe(self):
+        """Tests removing of the listeners."""
+        env = tested.MutableEnvironment()
+        changes = []
+
+        def listener(name, value):
+            changes.append(name)
+
+        env.subscribe(listener)
+        self.assertRaises(Exception, env.unsubscribe, print)
+        env.unsubscribe(listener)
+        env.add_values("a", True)
+        self.assertEqual([], changes)
+
+    def test_mutable_environment_removal(self):
+        """Tests removing of the declarations."""
+        env = tested.MutableEnvironment()
+        changes = []
+        env.subscribe(lambda name, value: changes.append((name, value)))
+        env.add_values("a", True)
+        env.remove_declaration("a")
+        self.assertEqual(None, env.lookup("a"))
+        self.assertEqual(0, len(env))
+        self.assertEqual([("a", True), ("a", None)], changes)
+        self.assertRaises(Exception, env.remove_declaration, "a")
@@ -0,0 +1,108 @@
+import gc
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+import scripts.src.factory as tested
+
+
+class TestFactory(unittest.TestCase):
+    """Tests of the factory of interned terms."""
+
+    def setUp(self):
+        """Prepares the factory used in tests."""
+        self.factory = tested.TermFactory()
+
+    def test_atoms_are_shared(self):
+        """Tests that the atoms of the same name are the same object."""
+        self.assertIs(self.factory.atom("a"), self.factory.atom("a"))
+        self.assertIsNot(self.factory.atom("a"), self.factory.atom("b"))
+        self.assertIs(self.factory.constant(True),
+                      self.factory.constant(True))
+
+    def test_operations_are_shared(self):
+        """Tests that structurally equal operations are the same object."""
+        f = self.factory
+        first = f.conjunction(f.atom("a"), f.negation(f.atom("b")))
+        second = f.conjunction(f.atom("a"), f.negation(f.atom("b")))
+        self.assertIs(first, second)
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertIsNot(first, f.disjunction(f.atom("a"),
+                                              f.negation(f.atom("b"))))
+        self.assertIs(f.conjunction(first, f.atom("c"), first),
+                      f.operation(Conjunction, [first, f.atom("c"), first]))
+        self.assertIsNot(first, f.conjunction(f.atom("a"),
+                                              f.negation(f.atom("b")),
+                                              f.atom("a")))
+
+    def test_intern_existing_term(self):
+        """Tests interning of the ordinary terms."""
+        a = Atom("a")
+        term = Implication([Conjunction([a, a]), Atom("b")])
+        interned = self.factory.intern(term)
+
+        self.assertIs(interned, self.factory.intern(term.clone))
+        self.assertIs(interned.terms[0].terms[0], interned.terms[0].terms[1])
+        self.assertIsNot(term, interned)
+        self.assertNotEqual(term, term.clone)
+
+        env = Environment()
+        env.add_values("a", True)
+        env.add_values("b", False)
+        self.assertEqual(term.evaluate(env), interned.evaluate(env))
+
+    def test_interned_terms_are_immutable(self):
+        """Tests that the interned terms cannot be changed."""
+        atom = self.factory.atom("a")
+        negation = self.factory.negation(atom)
+        self.assertEqual(True, negation.is_interned)
+        self.assertRaises(Exception, setattr, atom, "atom_name", "b")
+        self.assertRaises(Exception, setattr, atom, "value", True)
+        self.assertRaises(Exception, setattr, negation, "terms", [atom])
+
+    def test_clone_is_free(self):
+        """Tests that the clone of the interned term is the term itself."""
+        term = self.factory.equivalence(self.factory.atom("a"),
+                                        self.factory.constant(False))
+        self.assertIs(term, term.clone)
+
+    def test_custom_operations(self):
+        """Tests that custom operations are shared by their evaluators."""
+        def evaluator(env, terms):
+            return terms[0].evaluate(env)
+
+        a = self.factory.atom("a")
+        first = self.factory.custom(1, [a], evaluator)
+        self.assertIs(first, self.factory.custom(1, [a], evaluator))
+        self.assertIsNot(first, self.factory.custom(
+            1, [a], lambda env, terms: True))
+        self.assertIs(first, self.factory.intern(
+            CustomOperation(1, [Atom("a")], evaluator)))
+
+    def test_different_factories(self):
+        """Tests that interned terms of different factories are equal when
+        they are structurally equal."""
+        other = tested.TermFactory()
+        term = Disjunction([Atom("a"), Constant(True)])
+        self.assertEqual(self.factory.intern(term), other.intern(term))
+        self.assertNotEqual(self.factory.intern(term),
+                            other.intern(Negation([term])))
+
+        # The comparison does not intern the terms into the factories
+        first = self.factory.intern(Conjunction([term, Atom("b")]))
+        second = other.intern(Conjunction([term, Atom("b")]))
+        third = other.intern(Conjunction([term, Atom("c")]))
+        sizes = len(self.factory), len(other)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(sizes, (len(self.factory), len(other)))
+
+    def test_unused_terms_are_dropped(self):
+        """Tests that the table does not keep the terms alive."""
+        term = self.factory.negation(self.factory.atom("a"))
+        self.assertEqual(2, len(self.factory))
+        del term
+        gc.collect()
+        self.assertEqual(0, len(self.factory))
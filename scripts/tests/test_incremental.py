@@ -0,0 +1,170 @@
+import random
+import unittest
+
+from scripts.src.environment import Environment, MutableEnvironment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+import scripts.src.incremental as tested
+
+
+class TestIncrementalEvaluation(unittest.TestCase):
+    """Tests of the incremental evaluation of the terms."""
+
+    def setUp(self):
+        """Prepares the environment and a random term."""
+        self.env = MutableEnvironment()
+        self.names = [f"x{i}" for i in range(8)]
+        for name in self.names:
+            self.env.add_values(name, False)
+
+        generator = random.Random(7)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        terms = [Atom(generator.choice(self.names)) for _ in range(60)]
+        while len(terms) > 1:
+            first = terms.pop(generator.randrange(len(terms)))
+            second = terms.pop(generator.randrange(len(terms)))
+            term = generator.choice(operators)([first, second])
+            if generator.random() < 0.3:
+                term = Negation([term])
+            terms.append(term)
+        self.term = terms[0]
+
+    def test_nary_operations(self):
+        """Tests the conjunctions and the disjunctions of more than two
+        terms, including the undefined atoms."""
+        terms = [Atom(name) for name in self.names[:4]]
+        term = Disjunction([Conjunction(terms), Conjunction(terms[2:] + [
+            Atom("undefined")]), Negation([terms[0]])])
+        for name in ("x0", "x2", "x3"):
+            self.env.set_value(name, True)
+        evaluation = tested.IncrementalEvaluation(term, self.env)
+        self.assertIsNone(evaluation.partial_value)
+        self.env.set_value("x1", True)
+        self.assertTrue(evaluation.partial_value)
+        self.env.set_value("x1", False)
+        self.assertIsNone(evaluation.partial_value)
+        self.env.set_value("x3", False)
+        self.assertIs(False, evaluation.partial_value)
+
+    def test_values_follow_changes(self):
+        """Tests that the value matches the evaluation after every change.
+        """
+        evaluation = tested.IncrementalEvaluation(self.term, self.env)
+        generator = random.Random(3)
+        for _ in range(200):
+            name = generator.choice(self.names)
+            self.env.set_value(name, not self.env.lookup(name))
+            self.assertEqual(self.term.evaluate(self.env), evaluation.value)
+
+    def test_only_ancestors_are_recomputed(self):
+        """Tests that only the operations containing the changed atom are
+        evaluated again."""
+        a, b = Atom("a"), Atom("b")
+        chain = a
+        for _ in range(100):
+            chain = Disjunction([chain, b])
+        self.env.add_values("a", False)
+        self.env.add_values("b", False)
+        term = Conjunction([chain, Negation([Atom("x0")])])
+        evaluation = tested.IncrementalEvaluation(term, self.env)
+        self.assertEqual(False, evaluation.value)
+
+        self.env.set_value("x0", True)
+        self.assertEqual(False, evaluation.value)
+        self.assertEqual(2, evaluation.recomputed)
+
+        # The first disjunction is true, the next ones stay true
+        self.env.set_value("x0", False)
+        self.env.set_value("b", True)
+        self.assertEqual(True, evaluation.value)
+        self.assertEqual(102, evaluation.recomputed)
+        self.env.set_value("a", True)
+        self.assertEqual(True, evaluation.value)
+        self.assertEqual(1, evaluation.recomputed)
+
+    def test_unchanged_value(self):
+        """Tests that setting the same value does not evaluate anything."""
+        evaluation = tested.IncrementalEvaluation(self.term, self.env)
+        evaluation.value
+        self.env.set_value("x0", False)
+        evaluation.value
+        self.assertEqual(0, evaluation.recomputed)
+
+    def test_undefined_atoms(self):
+        """Tests the values depending on the undefined atoms."""
+        env = MutableEnvironment()
+        term = Conjunction([Atom("a"), Atom("b")])
+        evaluation = tested.IncrementalEvaluation(term, env)
+        self.assertRaises(Exception, lambda: evaluation.value)
+        env.set_value("a", False)
+        self.assertEqual(False, evaluation.value)
+        env.set_value("a", True)
+        self.assertRaises(Exception, lambda: evaluation.value)
+        env.set_value("b", True)
+        self.assertEqual(True, evaluation.value)
+
+    def test_structure_change(self):
+        """Tests that the changes of the term are recognized."""
+        term = Conjunction([Atom("x0"), Constant(True)])
+        evaluation = tested.IncrementalEvaluation(term, self.env)
+        self.assertEqual(False, evaluation.value)
+        term.terms = [Negation([Atom("x0")]), Constant(True)]
+        self.assertEqual(True, evaluation.value)
+
+    def test_custom_operation(self):
+        """Tests the custom operation within the evaluated term."""
+        majority = CustomOperation(
+            3, [Atom("x0"), Atom("x1"), Atom("x2")],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        evaluation = tested.IncrementalEvaluation(majority, self.env)
+        self.assertEqual(False, evaluation.value)
+        self.env.set_values({"x0": True, "x2": True})
+        self.assertEqual(True, evaluation.value)
+
+    def test_custom_operation_updates(self):
+        """Tests that the term with the custom operation is updated
+        incrementally and that the changes of other terms do not make it
+        evaluated again."""
+        names = [f"y{i}" for i in range(1000)]
+        for name in names:
+            self.env.add_values(name, False)
+        clauses = Conjunction([Disjunction([Atom(name), Atom("x0")])
+                               for name in names])
+        custom = CustomOperation(
+            2, [Atom("x1"), clauses],
+            lambda env, terms: terms[0].evaluate(env) or
+            terms[1].evaluate(env))
+        evaluation = tested.IncrementalEvaluation(
+            Conjunction([custom, Negation([Atom("x2")])]), self.env)
+        self.assertEqual(False, evaluation.value)
+
+        for name in ("x1", "y7", "x1", "x2"):
+            self.env.set_value(name, not self.env.lookup(name))
+            evaluation.value
+            self.assertLessEqual(evaluation.recomputed, 3)
+
+        other = Negation([Atom("x0")])
+        other.terms = [Constant(False)]
+        clauses.terms[0].terms[0].atom_name = "y0"
+        self.env.set_values({"x1": True, "x2": False})
+        self.assertEqual(True, evaluation.value)
+        self.assertLessEqual(evaluation.recomputed, 3)
+
+        clauses.terms[0].terms[0].atom_name = "x1"
+        self.assertEqual(True, evaluation.value)
+        self.assertGreater(evaluation.recomputed, 1000)
+
+    def test_immutable_environment(self):
+        """Tests the evaluation in the environment, which cannot change."""
+        env = Environment()
+        env.add_values("a", True)
+        evaluation = tested.IncrementalEvaluation(Negation([Atom("a")]), env)
+        self.assertEqual(False, evaluation.value)
+        evaluation.close()
+
+    def test_close(self):
+        """Tests that the closed evaluation does not follow the changes."""
+        evaluation = tested.IncrementalEvaluation(Atom("x0"), self.env)
+        evaluation.close()
+        self.env.set_value("x0", True)
+        self.assertEqual(False, evaluation.value)
@@ -0,0 +1,97 @@
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant
+from scripts.src.instrumentation import Instrumentation
+
+
+def _env(**values) -> Environment:
+    env = Environment()
+    for name, value in values.items():
+        env.add_values(name, value)
+    return env
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests of the instrumented evaluation."""
+
+    def test_values(self):
+        """Tests that the values are the same as of `Term.evaluate`."""
+        a, b = Atom("a"), Atom("b")
+        terms = [Conjunction([a, Negation([b])]),
+                 Implication([a, Disjunction([b, Constant(False)])]),
+                 Equivalence([Negation([a]), b])]
+        instrumentation = Instrumentation()
+        for term in terms:
+            for first in (False, True):
+                for second in (False, True):
+                    env = _env(a=first, b=second)
+                    self.assertEqual(term.evaluate(env),
+                                     instrumentation.evaluate(term, env))
+        self.assertEqual(12, instrumentation.evaluations)
+
+    def test_counters(self):
+        """Tests the counts of the operators, visits and lookups; the
+        short-circuited terms are not visited."""
+        a, b = Atom("a"), Atom("b")
+        shared = Negation([a])
+        term = Disjunction([Conjunction([shared, b]), shared])
+        instrumentation = Instrumentation()
+        self.assertFalse(instrumentation.evaluate(term, _env(a=True, b=True)))
+        self.assertEqual({"Disjunction": 1, "Conjunction": 1, "Negation": 2},
+                         instrumentation.operator_calls)
+        self.assertEqual(2, instrumentation.visits(shared))
+        self.assertEqual(0, instrumentation.visits(b))
+        self.assertEqual(2, instrumentation.lookups)
+        self.assertEqual(0, instrumentation.lookup_misses)
+
+        instrumentation.reset()
+        self.assertRaises(Exception, instrumentation.evaluate, term,
+                          _env(b=True))
+        self.assertEqual(1, instrumentation.lookup_misses)
+
+    def test_times(self):
+        """Tests that the time of the subtree includes it's subterms and
+        that the collapsed stacks sum up to the time of the root."""
+        a, b, c = Atom("a"), Atom("b"), Atom("c")
+        inner = Disjunction([b, c])
+        term = Conjunction([a, inner])
+        instrumentation = Instrumentation()
+        instrumentation.evaluate(term, _env(a=True, b=False, c=True))
+        self.assertGreaterEqual(instrumentation.subtree_time(term),
+                                instrumentation.subtree_time(inner))
+        self.assertIs(term, instrumentation.most_expensive(1)[0][0])
+
+        lines = instrumentation.collapsed_stacks().splitlines()
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        self.assertEqual({"Conjunction", "Conjunction;a",
+                          "Conjunction;Disjunction",
+                          "Conjunction;Disjunction;b",
+                          "Conjunction;Disjunction;c"}, set(stacks))
+        self.assertEqual(instrumentation.subtree_time(term),
+                         sum(map(int, stacks.values())))
+        self.assertIn("Conjunction", instrumentation.report())
+
+    def test_trace(self):
+        """Tests the events reported to the trace callback."""
+        events = []
+        a = Atom("a")
+        term = Negation([a])
+        instrumentation = Instrumentation(
+            lambda event, t, value: events.append((event, t, value)),
+            timing=False)
+        instrumentation.evaluate(term, _env(a=True))
+        self.assertEqual([("enter", term, None), ("enter", a, None),
+                          ("exit", a, True), ("exit", term, False)], events)
+        self.assertEqual(0, instrumentation.subtree_time(term))
+
+    def test_deep_term(self):
+        """Tests the evaluation of the term deeper than the recursion
+        limit."""
+        term = Atom("a")
+        for _ in range(5000):
+            term = Negation([term])
+        instrumentation = Instrumentation(timing=False)
+        self.assertTrue(instrumentation.evaluate(term, _env(a=True)))
+        self.assertEqual(5000, instrumentation.operator_calls["Negation"])
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant
+from scripts.src.truth_table import TruthTable
+import scripts.src.models as tested
+
+
+def _assignment(env: Environment) -> tuple:
+    """Returns the pairs of the names and the values of the environment."""
+    return tuple((d.declaration_name, d.value) for d in env.declarations)
+
+
+class TestModels(unittest.TestCase):
+    """Tests of the enumeration of the models."""
+
+    def setUp(self):
+        """Prepares random terms."""
+        generator = random.Random(17)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        self.terms = []
+        for _ in range(30):
+            terms = [Atom(f"x{generator.randrange(5)}") for _ in range(7)]
+            while len(terms) > 1:
+                first = terms.pop(generator.randrange(len(terms)))
+                second = terms.pop(generator.randrange(len(terms)))
+                term = generator.choice(operators)([first, second])
+                if generator.random() < 0.3:
+                    term = Negation([term])
+                terms.append(term)
+            self.terms.append(terms[0])
+
+    def test_all_models(self):
+        """Tests that the models are exactly the rows of the truth table
+        the term is true for."""
+        for term in self.terms:
+            table = TruthTable(term)
+            expected = {tuple(zip(table.variable_names, values))
+                        for values, result in table.rows() if result}
+            found = [_assignment(m) for m in tested.models(term)]
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(expected, set(found))
+
+    def test_projection(self):
+        """Tests the models projected onto some of the variables."""
+        for term in self.terms:
+            table = TruthTable(term)
+            names = table.variable_names[:2]
+            expected = {tuple(zip(table.variable_names, values))[:2]
+                        for values, result in table.rows() if result}
+            found = [_assignment(m) for m in tested.models(term, names)]
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(expected, set(found))
+
+    def test_projection_onto_other_variables(self):
+        """Tests the projection onto the variables out of the term."""
+        term = Disjunction([Atom("a"), Atom("b")])
+        found = [_assignment(m) for m in tested.models(term, ["c", "a"])]
+        self.assertEqual(4, len(found))
+        self.assertEqual((("c", False), ("a", False)), found[0])
+
+    def test_limit(self):
+        """Tests the limit of the number of the models."""
+        term = Disjunction([Atom("a"), Atom("b")])
+        self.assertEqual(2, len(list(tested.models(term, limit=2))))
+        self.assertEqual([], list(tested.models(term, limit=0)))
+
+    def test_decided_subspaces(self):
+        """Tests that the models of the large term, which is decided by the
+        first variables, are found quickly."""
+        term = Atom("x0")
+        for i in range(1, 200):
+            term = Conjunction([term, Disjunction([Atom(f"x{i}"),
+                                                   Atom("x0")])])
+        found = tested.models(term, limit=3)
+        self.assertEqual(3, len(list(found)))
+        self.assertEqual([], list(tested.models(Conjunction(
+            [term, Negation([Atom("x0")])]))))
+
+    def test_constants(self):
+        """Tests the models of the constant terms."""
+        self.assertEqual(1, len(list(tested.models(Constant(True)))))
+        self.assertEqual(0, len(list(tested.models(Constant(False)))))
+        self.assertEqual(4, len(list(tested.models(Constant(True),
+                                                   ["a", "b"]))))
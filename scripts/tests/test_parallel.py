@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant
+from scripts.src.truth_table import TruthTable
+import scripts.src.parallel as tested
+
+
+class TestParallel(unittest.TestCase):
+    """Tests of the evaluation sharded into the worker processes."""
+
+    def setUp(self):
+        """Prepares a random term over ten variables."""
+        generator = random.Random(23)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        terms = [Atom(f"x{generator.randrange(10)}") for _ in range(30)]
+        while len(terms) > 1:
+            first = terms.pop(generator.randrange(len(terms)))
+            second = terms.pop(generator.randrange(len(terms)))
+            terms.append(generator.choice(operators)([first, second]))
+        self.term = terms[0]
+
+    def test_count_models(self):
+        """Tests that the sharded counts match the truth table."""
+        expected = TruthTable(self.term).count_models
+        self.assertEqual(expected, tested.count_models(
+            self.term, workers=2, chunk_size=16))
+        self.assertEqual(expected, tested.count_models(
+            self.term, workers=1, chunk_size=3))
+        self.assertEqual(expected, tested.count_models(self.term))
+
+    def test_find_model(self):
+        """Tests that the found witness satisfies the term."""
+        for workers in (1, 2):
+            env = tested.find_model(self.term, workers, chunk_size=8)
+            self.assertEqual(True, self.term.evaluate(env))
+
+    def test_no_model(self):
+        """Tests the term without any model."""
+        term = Conjunction([self.term, Negation([self.term])])
+        self.assertEqual(None, tested.find_model(term, 2, chunk_size=32))
+        self.assertEqual(0, tested.count_models(term, 2, chunk_size=32))
+
+    def test_constants(self):
+        """Tests the terms without any variable."""
+        self.assertEqual(1, tested.count_models(Constant(True), 2))
+        self.assertEqual(0, len(tested.find_model(Constant(True), 2)))
+        self.assertEqual(None, tested.find_model(Constant(False), 2))
@@ -0,0 +1,144 @@
+import io
+import os
+import tempfile
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant
+from scripts.src.truth_table import TruthTable, are_equivalent
+import scripts.src.parser as tested
+
+
+class TestParser(unittest.TestCase):
+    """Tests of parsing the terms from strings."""
+
+    def setUp(self):
+        """Prepares the atoms used in tests."""
+        self.a = Atom("a")
+        self.b = Atom("b")
+        self.c = Atom("c")
+
+    def test_atoms_and_constants(self):
+        """Tests parsing of the atoms and the constants."""
+        term = tested.parse("  var_1 ")
+        self.assertIsInstance(term, Atom)
+        self.assertEqual("var_1", term.atom_name)
+        for text, value in (("TRUE", True), ("false", False), ("1", True)):
+            term = tested.parse(text)
+            self.assertIsInstance(term, Constant)
+            self.assertEqual(value, term.value)
+
+    def test_structure(self):
+        """Tests the types of the parsed operators."""
+        term = tested.parse("~a & b")
+        self.assertIsInstance(term, Conjunction)
+        self.assertIsInstance(term.terms[0], Negation)
+        self.assertIsInstance(tested.parse("a -> b"), Implication)
+        self.assertIsInstance(tested.parse("a <=> b"), Equivalence)
+        self.assertIsInstance(tested.parse("a or not b"), Disjunction)
+
+    def test_precedence(self):
+        """Tests the precedence and the associativity of the operators."""
+        cases = (
+            ("a | b & c", Disjunction([self.a, Conjunction([self.b,
+                                                            self.c])])),
+            ("a -> b -> c", Implication([self.a, Implication([self.b,
+                                                              self.c])])),
+            ("a <-> b | c", Equivalence([self.a, Disjunction([self.b,
+                                                              self.c])])),
+            ("!(a -> b) & c", Conjunction([Negation([Implication(
+                [self.a, self.b])]), self.c])),
+            ("a AND b -> c", Implication([Conjunction([self.a, self.b]),
+                                          self.c])),
+        )
+        for text, expected in cases:
+            self.assertEqual(True, are_equivalent(tested.parse(text),
+                                                  expected), text)
+        term = tested.parse("a -> b -> c")
+        self.assertIsInstance(term.terms[1], Implication)
+
+    def test_chains(self):
+        """Tests that the chains of the conjunctions and the disjunctions
+        are parsed as single operations, while the parentheses are kept."""
+        term = tested.parse("a & b & ~c & d")
+        self.assertIsInstance(term, Conjunction)
+        self.assertEqual(4, len(term.terms))
+        self.assertIsInstance(term.terms[2], Negation)
+        term = tested.parse("a | b & c & a | c")
+        self.assertEqual(3, len(term.terms))
+        self.assertEqual(3, len(term.terms[1].terms))
+        term = tested.parse("(a & b) & c", TermFactory())
+        self.assertEqual(2, len(term.terms))
+        self.assertIsInstance(term.terms[0], Conjunction)
+        self.assertTrue(term.is_interned)
+
+    def test_atoms_are_shared(self):
+        """Tests that the atoms of the same name are the same object."""
+        term = tested.parse("a & (a | b)")
+        self.assertIs(term.terms[0], term.terms[1].terms[0])
+
+    def test_deep_nesting(self):
+        """Tests that the depth of the nesting is not limited."""
+        depth = 20000
+        term = tested.parse("(" * depth + "a" + ")" * depth)
+        self.assertEqual("a", term.atom_name)
+        term = tested.parse("~" * depth + "a")
+        env = Environment()
+        env.add_values("a", False)
+        self.assertEqual(False, term.evaluate(env))
+
+    def test_errors(self):
+        """Tests the errors and their positions."""
+        cases = (
+            ("", "position 0"),
+            ("a &", "position 3"),
+            ("a b", "position 2"),
+            ("(a | b", "position 0"),
+            ("a | b)", "position 5"),
+            ("a # b", "position 2"),
+            ("a & & b", "position 4"),
+        )
+        for text, position in cases:
+            with self.assertRaises(Exception) as context:
+                tested.parse(text)
+            self.assertIn(position, str(context.exception), text)
+
+    def test_factory(self):
+        """Tests that the terms are interned by the given factory."""
+        factory = TermFactory()
+        first = tested.parse("a & ~b", factory)
+        second = tested.parse("(a) & (~b)", factory)
+        self.assertIs(first, second)
+
+    def test_parse_lines(self):
+        """Tests the lazy parsing of the lines."""
+        lines = io.StringIO("a & b\n\n# comment\n~a\nTRUE\n")
+        terms = tested.parse_lines(lines)
+        self.assertIsInstance(next(terms), Conjunction)
+        self.assertIsInstance(next(terms), Negation)
+        self.assertIsInstance(next(terms), Constant)
+        self.assertRaises(StopIteration, next, terms)
+
+    def test_parse_lines_error(self):
+        """Tests that the error contains the number of the line."""
+        terms = tested.parse_lines(["a", "b", "", "a ->"])
+        with self.assertRaises(Exception) as context:
+            list(terms)
+        self.assertIn("Line 4", str(context.exception))
+        self.assertIn("position 4", str(context.exception))
+
+    def test_parse_file(self):
+        """Tests parsing of the formulas from a file."""
+        handle, path = tempfile.mkstemp(text=True)
+        try:
+            with os.fdopen(handle, "w") as file:
+                for i in range(100):
+                    file.write(f"x{i} | ~x{i}\n")
+            terms = list(tested.parse_file(path))
+        finally:
+            os.remove(path)
+        self.assertEqual(100, len(terms))
+        self.assertEqual(True, all(TruthTable(t).is_tautology
+                                   for t in terms))
@@ -0,0 +1,142 @@
+import random
+import unittest
+from itertools import product
+
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.incremental import IncrementalEvaluation
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+
+
+def _random_term(generator: random.Random, size: int):
+    operators = (Conjunction, Disjunction, Implication, Equivalence)
+    terms = [Atom(f"x{generator.randrange(6)}") for _ in range(size)]
+    terms.append(Constant(generator.random() < 0.5))
+    while len(terms) > 1:
+        first = terms.pop(generator.randrange(len(terms)))
+        second = terms.pop(generator.randrange(len(terms)))
+        term = generator.choice(operators)([first, second])
+        if generator.random() < 0.3:
+            term = Negation([term])
+        terms.append(term)
+    return terms[0]
+
+
+def _env(values) -> Environment:
+    env = Environment()
+    for name, value in values.items():
+        env.add_values(name, value)
+    return env
+
+
+class TestPartialEvaluation(unittest.TestCase):
+    """Tests of the partial evaluation of the terms."""
+
+    def test_residual(self):
+        """Tests that the residual term has the value of the term for all
+        the values of the unknown variables, that it contains the unknown
+        variables only and that it's constant iff the value is known by the
+        three-valued logic."""
+        generator = random.Random(13)
+        for _ in range(100):
+            term = _random_term(generator, 8)
+            names = term.variable_names
+            known = {name: generator.random() < 0.5 for name in names
+                     if generator.random() < 0.5}
+            residual = term.partial_evaluate(_env(known))
+            unknown = [name for name in names if name not in known]
+            self.assertTrue(set(residual.variable_names) <= set(unknown))
+
+            partial = IncrementalEvaluation(term, _env(known)).partial_value
+            self.assertEqual(partial is not None,
+                             isinstance(residual, Constant))
+            for values in product((False, True), repeat=len(unknown)):
+                rest = dict(zip(unknown, values))
+                self.assertEqual(term.evaluate(_env({**known, **rest})),
+                                 residual.evaluate(_env(rest)))
+
+    def test_simplification(self):
+        """Tests the simplification of the operators with known terms."""
+        a, b = Atom("a"), Atom("b")
+        env = _env({"t": True, "f": False})
+        t, f = Atom("t"), Atom("f")
+
+        residual = Conjunction([t, a]).partial_evaluate(env)
+        self.assertIsInstance(residual, Atom)
+        self.assertIsNot(a, residual)
+        self.assertEqual("a", residual.atom_name)
+
+        residual = Implication([a, f]).partial_evaluate(env)
+        self.assertIsInstance(residual, Negation)
+        residual = Equivalence([Negation([a]), f]).partial_evaluate(env)
+        self.assertEqual("a", residual.atom_name)
+
+        residual = Disjunction([a, b]).partial_evaluate(env)
+        self.assertIsInstance(residual, Disjunction)
+        self.assertFalse(Disjunction([f, f]).partial_evaluate(env).value)
+
+        residual = Conjunction([a, t, b, Atom("c")]).partial_evaluate(env)
+        self.assertIsInstance(residual, Conjunction)
+        self.assertEqual(("a", "b", "c"), residual.variable_names)
+        self.assertTrue(Disjunction([a, f, t, b]).partial_evaluate(env).value)
+        self.assertEqual("b", Disjunction([f, b, f]).partial_evaluate(env)
+                         .atom_name)
+
+    def test_short_circuit(self):
+        """Tests that the terms after the dominating value are not
+        evaluated."""
+        def failing(env, terms):
+            raise Exception("Should not be evaluated")
+
+        custom = CustomOperation(1, [Constant(True)], failing)
+        env = _env({"a": False})
+        self.assertFalse(
+            Conjunction([Atom("a"), custom]).partial_evaluate(env).value)
+        self.assertTrue(
+            Implication([Atom("a"), custom]).partial_evaluate(env).value)
+        self.assertRaises(Exception, custom.partial_evaluate)
+
+    def test_custom_operation(self):
+        """Tests that the custom operation is kept over the residual terms
+        and evaluated when all it's terms are known."""
+        custom = CustomOperation(
+            2, [Atom("a"), Negation([Atom("b")])],
+            lambda env, terms: terms[0].evaluate(env)
+            != terms[1].evaluate(env))
+        residual = custom.partial_evaluate(_env({"b": True}))
+        self.assertIsInstance(residual, CustomOperation)
+        self.assertIsInstance(residual.terms[1], Constant)
+        self.assertTrue(residual.evaluate(_env({"a": True})))
+        self.assertTrue(custom.partial_evaluate(
+            _env({"a": True, "b": True})).value)
+
+    def test_sharing_and_interning(self):
+        """Tests that the shared terms stay shared and that the residual of
+        the interned term is interned too."""
+        shared = Disjunction([Atom("a"), Atom("b")])
+        term = Conjunction([shared, Negation([shared])])
+        residual = term.partial_evaluate(_env({"b": False}))
+        self.assertIs(residual.terms[0], residual.terms[1].terms[0])
+
+        factory = TermFactory()
+        interned = factory.intern(term)
+        residual = interned.partial_evaluate(_env({"b": False}))
+        self.assertTrue(residual.is_interned)
+        self.assertIs(factory.intern(Conjunction(
+            [Atom("a"), Negation([Atom("a")])])), residual)
+
+    def test_deep_term(self):
+        """Tests the term much deeper than the recursion limit."""
+        term = Atom("a")
+        for _ in range(20000):
+            term = Conjunction([Atom("b"), Negation([term])])
+        residual = term.partial_evaluate(_env({"b": True}))
+        depth = 0
+        while isinstance(residual, Negation):
+            residual = residual.terms[0]
+            depth += 1
+        self.assertEqual(20000, depth)
+        self.assertEqual("a", residual.atom_name)
+        self.assertTrue(term.partial_evaluate(_env({"a": True, "b": True}))
+                        .value)
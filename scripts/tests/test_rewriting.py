@@ -0,0 +1,161 @@
+import random
+import unittest
+
+from scripts.src.factory import TermFactory
+from scripts.src.operators import *
+from scripts.src.parser import parse
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import are_equivalent
+import scripts.src.rewriting as tested
+
+
+def _size(term) -> int:
+    """Returns the number of the distinct subterms."""
+    return sum(1 for _ in term.postorder())
+
+
+class TestRewriting(unittest.TestCase):
+    """Tests of rewriting the terms by the simplification rules."""
+
+    def _assert_simplified(self, text: str, expected: str):
+        """Checks the simplified parsed term against the expected one."""
+        term = parse(text)
+        result = tested.simplify(term)
+        self.assertEqual(True, are_equivalent(term, result), text)
+        self.assertEqual(_size(parse(expected)), _size(result), text)
+        self.assertEqual(True, are_equivalent(parse(expected), result), text)
+
+    def test_constant_folding(self):
+        """Tests folding of the constants."""
+        self._assert_simplified("a & FALSE", "FALSE")
+        self._assert_simplified("a | FALSE", "a")
+        self._assert_simplified("TRUE -> a", "a")
+        self._assert_simplified("a -> FALSE", "~a")
+        self._assert_simplified("FALSE <-> a", "~a")
+        self._assert_simplified("~(TRUE & TRUE)", "FALSE")
+
+    def test_double_negation(self):
+        """Tests the elimination of the double negations."""
+        self._assert_simplified("~~~~a", "a")
+        self._assert_simplified("~~~a", "~a")
+
+    def test_idempotence_and_complement(self):
+        """Tests the idempotence and the complement rules."""
+        self._assert_simplified("(a | b) & (a | b)", "a | b")
+        self._assert_simplified("(b | ~b) & ~~c", "c")
+        self._assert_simplified("a & ~a", "FALSE")
+
+    def test_absorption(self):
+        """Tests the absorption rules."""
+        self._assert_simplified("a & (b | a)", "a")
+        self._assert_simplified("(a & b) | a", "a")
+
+    def test_nary_operations(self):
+        """Tests the rules on the conjunctions and the disjunctions of more
+        than two terms."""
+        self._assert_simplified("a & b & TRUE & c", "a & b & c")
+        self._assert_simplified("a | b | TRUE", "TRUE")
+        self._assert_simplified("a & FALSE & b", "FALSE")
+        self._assert_simplified("a | b | a | b", "a | b")
+        self._assert_simplified("a & c & b & ~c", "FALSE")
+        self._assert_simplified("a & c & (b | a) & (c | d)", "a & c")
+        self._assert_simplified("(a & b) & (c & (d | (e | ~f)))",
+                                "a & b & c & (d | e | ~f)")
+
+    def test_flatten(self):
+        """Tests that the chains of the binary operations are flattened
+        into a single operation and that nothing else is rewritten."""
+        term = Atom("x0")
+        for i in range(1, 20000):
+            term = Conjunction([term, Atom(f"x{i}")])
+        result = tested.flatten(term)
+        self.assertIsInstance(result, Conjunction)
+        self.assertEqual(20000, len(result.terms))
+        self.assertEqual(term.variable_names, result.variable_names)
+
+        term = parse("~~(a | (b | (c & (d & TRUE))))")
+        result = tested.flatten(term)
+        self.assertIsInstance(result.terms[0].terms[0], Disjunction)
+        self.assertEqual(3, len(result.terms[0].terms[0].terms))
+        self.assertEqual(3, len(result.terms[0].terms[0].terms[2].terms))
+
+        factory = TermFactory()
+        self.assertIs(parse("a & b & c", factory),
+                      tested.flatten(parse("a & (b & c)", factory)))
+
+    def test_elimination_and_de_morgan(self):
+        """Tests that only negations of atoms, conjunctions and
+        disjunctions remain."""
+        self._assert_simplified("a -> b", "~a | b")
+        self._assert_simplified("~(a & (b -> c))", "~a | (b & ~c)")
+        result = tested.simplify(parse("(a <-> ~b) -> ~(c | (a <-> c))"))
+        for term in result.postorder():
+            self.assertIsInstance(term, (Atom, Negation, Conjunction,
+                                         Disjunction))
+            if isinstance(term, Negation):
+                self.assertIsInstance(term.terms[0], Atom)
+
+    def test_random_terms(self):
+        """Tests that the random terms stay equivalent."""
+        generator = random.Random(13)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        for _ in range(50):
+            terms = [Atom(f"x{generator.randrange(3)}") for _ in range(6)]
+            terms.append(Constant(generator.random() < 0.5))
+            while len(terms) > 1:
+                first = terms.pop(generator.randrange(len(terms)))
+                second = terms.pop(generator.randrange(len(terms)))
+                term = generator.choice(operators)([first, second])
+                if generator.random() < 0.3:
+                    term = Negation([term])
+                terms.append(term)
+            self.assertEqual(True, are_equivalent(
+                terms[0], tested.simplify(terms[0])))
+
+    def test_term_is_not_changed(self):
+        """Tests that the given term stays as it was."""
+        term = parse("~~a & (b -> c)")
+        first, second = term.terms
+        tested.simplify(term)
+        self.assertIs(first, term.terms[0])
+        self.assertIsInstance(term.terms[1], Implication)
+
+    def test_shared_subterms(self):
+        """Tests that the shared subterms are rewritten once, so the terms
+        of exponential size are rewritten in linear time."""
+        term = Atom("a")
+        for i in range(200):
+            term = Conjunction([term, Negation([Negation([term])])])
+        result = tested.simplify(term)
+        self.assertEqual("a", result.atom_name)
+
+    def test_deep_term(self):
+        """Tests that the depth is not limited by the recursion."""
+        term = Atom("a")
+        for i in range(20000):
+            term = Negation([term])
+        self.assertIsInstance(tested.simplify(term), Atom)
+
+    def test_interned(self):
+        """Tests that the interned terms are rewritten into the interned
+        ones of the same factory."""
+        factory = TermFactory()
+        term = parse("~~a -> b", factory)
+        self.assertIs(parse("~a | b", factory), tested.simplify(term))
+
+    def test_custom_rules(self):
+        """Tests the rewriter with given rules indexed by the type."""
+        rewriter = tested.Rewriter([r for r in tested.RULES
+                                    if r.name == "double negation"])
+        self.assertEqual((), rewriter.rules_for(Conjunction))
+        result = rewriter.rewrite(parse("~~a -> b"))
+        self.assertIsInstance(result, Implication)
+        self.assertIsInstance(result.terms[0], Atom)
+
+    def test_custom_operation(self):
+        """Tests that the terms of the custom operation are rewritten."""
+        operation = CustomOperation(
+            1, [parse("~~a")], lambda env, terms: terms[0].evaluate(env))
+        result = tested.simplify(operation)
+        self.assertIsInstance(result, CustomOperation)
+        self.assertIsInstance(result.terms[0], Atom)
@@ -0,0 +1,148 @@
+import random
+import unittest
+
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+import scripts.src.sat as tested
+
+
+class TestSolver(unittest.TestCase):
+    """Tests of the SAT solver working with clauses."""
+
+    def _check_model(self, clauses, model):
+        for clause in clauses:
+            self.assertTrue(any(model[abs(l)] == (l > 0) for l in clause))
+
+    def test_satisfiable_clauses(self):
+        """Tests that the found model satisfies all the clauses."""
+        clauses = [[1, 2], [-1, 3], [-2, -3], [2, 3]]
+        solver = tested.Solver()
+        for clause in clauses:
+            solver.add_clause(clause)
+        self.assertEqual(True, solver.solve())
+        self._check_model(clauses, solver.model)
+
+    def test_unsatisfiable_clauses(self):
+        """Tests the unsatisfiable clauses."""
+        solver = tested.Solver()
+        for clause in ([1, 2], [-1, 2], [1, -2], [-1, -2]):
+            solver.add_clause(clause)
+        self.assertEqual(False, solver.solve())
+        self.assertIsNone(solver.model)
+
+    def test_empty_clause(self):
+        """Tests that the empty clause cannot be satisfied."""
+        solver = tested.Solver()
+        solver.add_clause([])
+        self.assertEqual(False, solver.solve())
+
+    def test_zero_literal(self):
+        """Tests that zero is not a literal."""
+        self.assertRaises(Exception, tested.Solver().add_clause, [1, 0])
+
+    def test_incremental_clauses(self):
+        """Tests adding of clauses between solving."""
+        solver = tested.Solver()
+        solver.add_clause([1, 2])
+        self.assertEqual(True, solver.solve())
+        solver.add_clause([-1])
+        self.assertEqual(True, solver.solve())
+        self.assertEqual(True, solver.model[2])
+        solver.add_clause([-2])
+        self.assertEqual(False, solver.solve())
+
+    def test_pigeonhole(self):
+        """Tests that 5 pigeons do not fit into 4 holes."""
+        pigeons, holes = 5, 4
+
+        def var(p, h):
+            return p * holes + h + 1
+
+        solver = tested.Solver()
+        for p in range(pigeons):
+            solver.add_clause([var(p, h) for h in range(holes)])
+        for h in range(holes):
+            for p in range(pigeons):
+                for q in range(p + 1, pigeons):
+                    solver.add_clause([-var(p, h), -var(q, h)])
+        self.assertEqual(False, solver.solve())
+        self.assertGreater(solver.conflicts, 0)
+
+    def test_random_3sat(self):
+        """Tests random 3-SAT instances against brute force."""
+        generator = random.Random(7)
+        for _ in range(30):
+            variables = 10
+            clauses = [[generator.choice((1, -1)) *
+                        generator.randint(1, variables) for _ in range(3)]
+                       for _ in range(45)]
+            solver = tested.Solver()
+            for clause in clauses:
+                solver.add_clause(clause)
+
+            expected = any(
+                all(any(((bits >> (abs(l) - 1)) & 1) == (l > 0)
+                        for l in clause) for clause in clauses)
+                for bits in range(1 << variables))
+            self.assertEqual(expected, solver.solve())
+            if expected:
+                self._check_model(clauses, solver.model)
+
+
+class TestTermSatisfiability(unittest.TestCase):
+    """Tests of deciding the satisfiability of terms."""
+
+    def setUp(self):
+        """Prepares the atoms used in tests."""
+        self.a = Atom("a")
+        self.b = Atom("b")
+        self.c = Atom("c")
+
+    def test_solve_satisfiable(self):
+        """Tests that the returned environment satisfies the term."""
+        term = Conjunction([
+            Equivalence([self.a, Negation([self.b])]),
+            Implication([self.b, Disjunction([self.c, self.a])])])
+        env = tested.solve(term)
+        self.assertIsNotNone(env)
+        self.assertEqual(("a", "b", "c"), env.declaration_names)
+        self.assertEqual(True, term.evaluate(env))
+
+    def test_solve_unsatisfiable(self):
+        """Tests the contradiction."""
+        term = Conjunction([self.a, Negation([self.a])])
+        self.assertIsNone(tested.solve(term))
+        self.assertEqual(False, tested.is_satisfiable(Constant(False)))
+        self.assertEqual(True, tested.is_satisfiable(Constant(True)))
+
+    def test_custom_operation(self):
+        """Tests the term with custom operation."""
+        majority = CustomOperation(
+            3, [self.a, self.b, self.c],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        term = Conjunction([majority, Negation([self.b])])
+        env = tested.solve(term)
+        self.assertEqual(True, term.evaluate(env))
+        self.assertIsNone(tested.solve(
+            Conjunction([majority, Negation([Disjunction([self.a, self.b])])])))
+
+    def test_agrees_with_truth_table(self):
+        """Tests random terms against their truth tables."""
+        generator = random.Random(3)
+        operators = (Conjunction, Disjunction, Implication, Equivalence)
+        for _ in range(50):
+            terms = [Atom(f"x{generator.randrange(5)}") for _ in range(8)]
+            while len(terms) > 1:
+                first = terms.pop(generator.randrange(len(terms)))
+                second = terms.pop(generator.randrange(len(terms)))
+                term = generator.choice(operators)([first, second])
+                if generator.random() < 0.3:
+                    term = Negation([term])
+                terms.append(term)
+
+            env = tested.solve(terms[0])
+            self.assertEqual(TruthTable(terms[0]).is_satisfiable,
+                             env is not None)
+            if env is not None:
+                self.assertEqual(True, terms[0].evaluate(env))
@@ -0,0 +1,177 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.factory import TermFactory
+from scripts.src.operators import *
+from scripts.src.rewriting import flatten
+from scripts.src.term import Atom, Constant, CustomOperation
+from scripts.src.truth_table import TruthTable
+import scripts.src.serialization as tested
+
+
+def _random_term(generator: random.Random, size: int):
+    operators = (Conjunction, Disjunction, Implication, Equivalence)
+    terms = [Atom(f"x{generator.randrange(300)}") for _ in range(size)]
+    terms.append(Constant(generator.random() < 0.5))
+    while len(terms) > 1:
+        first = terms.pop(generator.randrange(len(terms)))
+        second = terms.pop(generator.randrange(len(terms)))
+        term = generator.choice(operators)([first, second])
+        if generator.random() < 0.3:
+            term = Negation([term])
+        terms.append(term)
+    return terms[0]
+
+
+class TestSerialization(unittest.TestCase):
+    """Tests of the binary format of the terms."""
+
+    def test_round_trip(self):
+        """Tests that the loaded terms are equivalent to the dumped ones,
+        including the far references and many names."""
+        generator = random.Random(7)
+        for size in (1, 5, 400):
+            term = _random_term(generator, size)
+            loaded = tested.loads(tested.dumps(term))
+            self.assertEqual(term.variable_names, loaded.variable_names)
+            env = Environment()
+            for name in term.variable_names:
+                env.add_values(name, generator.random() < 0.5)
+            self.assertEqual(term.evaluate(env), loaded.evaluate(env))
+
+    def test_atoms_and_sharing(self):
+        """Tests that the names, the values and the shared terms are
+        kept."""
+        a = Atom("ä")
+        shared = Negation([a])
+        term = Disjunction([Conjunction([shared, Atom("b", True)]),
+                            Implication([shared, Constant(False, "F")])])
+        data = tested.dumps(term)
+        self.assertEqual(b"LGT", data[:3])
+        loaded = tested.loads(data)
+        self.assertEqual(TruthTable(term), TruthTable(loaded))
+        left, right = loaded.terms
+        self.assertIs(left.terms[0], right.terms[0])
+        self.assertEqual("ä", left.terms[0].terms[0].atom_name)
+        self.assertTrue(left.terms[1].value)
+        self.assertEqual("F", right.terms[1].atom_name)
+
+        factory = TermFactory()
+        self.assertIs(factory.intern(term), tested.loads(data, factory))
+
+    def test_nary_operations(self):
+        """Tests the conjunctions and the disjunctions of more than two
+        terms and reading the data of the version 1."""
+        term = flatten(_random_term(random.Random(3), 300))
+        loaded = tested.loads(tested.dumps(term))
+        self.assertEqual(sum(1 for _ in term.postorder()),
+                         sum(1 for _ in loaded.postorder()))
+        env = Environment()
+        for name in term.variable_names:
+            env.add_values(name, False)
+        self.assertEqual(term.evaluate(env), loaded.evaluate(env))
+
+        clauses = Conjunction([Disjunction([Atom(f"x{i}"), Atom("y"),
+                                            Negation([Atom(f"x{i + 1}")])])
+                               for i in range(5)])
+        loaded = tested.loads(tested.dumps(clauses))
+        self.assertEqual(5, len(loaded.terms))
+        self.assertEqual(3, len(loaded.terms[4].terms))
+        self.assertEqual(TruthTable(clauses), TruthTable(loaded))
+
+        data = tested.dumps(Implication([Atom("a"), Atom("b")]))
+        self.assertIsInstance(tested.loads(data[:3] + bytes([1]) + data[4:]),
+                              Implication)
+        data = tested.dumps(Conjunction([Atom("a")] * 3))
+        self.assertRaises(Exception, tested.loads,
+                          data[:3] + bytes([1]) + data[4:])
+
+    def test_invalid_data(self):
+        """Tests that the invalid data and the custom operations are
+        refused."""
+        data = tested.dumps(Negation([Atom("a")]))
+        self.assertRaises(Exception, tested.loads, b"XYZ" + data[3:])
+        self.assertRaises(Exception, tested.loads,
+                          data[:3] + bytes([99]) + data[4:])
+        self.assertRaises(Exception, tested.loads, data[:-1] + bytes([5]))
+        custom = CustomOperation(1, [Atom("a")], lambda env, terms: True)
+        self.assertRaises(Exception, tested.dumps, custom)
+
+    def test_truncated_data(self):
+        """Tests that the truncated data are refused by the exception of
+        the invalid data, not by reading past their end."""
+        data = tested.dumps(Implication([Atom("a"), Negation([Atom("b")])]))
+        for length in range(len(data)):
+            with self.assertRaises(Exception) as context:
+                tested.loads(data[:length])
+            self.assertIs(Exception, type(context.exception))
+
+
+class TestFormulaStore(unittest.TestCase):
+    """Tests of the memory-mapped store of the terms."""
+
+    def test_store(self):
+        """Tests reading and evaluating the single terms of the store."""
+        generator = random.Random(11)
+        terms = [_random_term(generator, 20) for _ in range(30)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "terms.lgts")
+            self.assertEqual(30, tested.write_store(path, iter(terms)))
+            with tested.FormulaStore(path) as store:
+                self.assertEqual(30, len(store))
+                for index in (0, 17, 29):
+                    self.assertEqual(TruthTable(terms[index]),
+                                     TruthTable(store[index]))
+                self.assertEqual(terms[-1].variable_names,
+                                 store[-1].variable_names)
+                self.assertRaises(IndexError, store.compact, 30)
+
+                env = Environment()
+                for name in terms[5].variable_names:
+                    env.add_values(name, True)
+                self.assertEqual(terms[5].evaluate(env),
+                                 store.evaluate(5, env))
+                self.assertEqual(30, sum(1 for _ in store))
+
+    def test_invalid_store(self):
+        """Tests that other files are not opened as stores."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "other")
+            with open(path, "wb") as file:
+                file.write(b"not a store of the terms at all")
+            self.assertRaises(Exception, tested.FormulaStore, path)
+            empty = os.path.join(directory, "empty.lgts")
+            tested.write_store(empty, [])
+            with tested.FormulaStore(empty) as store:
+                self.assertEqual(0, len(store))
+
+    def test_truncated_store(self):
+        """Tests that the empty, truncated and corrupted files are refused
+        by the exception of the invalid store."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "terms.lgts")
+            tested.write_store(path, [Negation([Atom("a")]), Atom("b")])
+            with open(path, "rb") as file:
+                data = file.read()
+
+            for content in (b"", data[:-3], data[:8] + data[16:]):
+                with open(path, "wb") as file:
+                    file.write(content)
+                with self.assertRaises(Exception) as context:
+                    tested.FormulaStore(path)
+                self.assertIs(Exception, type(context.exception))
+
+            # The only term cut short
+            data = tested.dumps(Negation([Atom("a")]))[:-1]
+            with open(path, "wb") as file:
+                file.write(data + struct.pack("<QQ", 0, len(data)))
+                file.write(tested._TRAILER.pack(tested._STORE_MAGIC,
+                                                tested.VERSION, 1, len(data)))
+            with tested.FormulaStore(path) as store:
+                with self.assertRaises(Exception) as context:
+                    store[0]
+                self.assertIs(Exception, type(context.exception))
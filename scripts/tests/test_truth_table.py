@@ -0,0 +1,93 @@
+import unittest
+
+from scripts.src.environment import Environment
+from scripts.src.operators import *
+from scripts.src.term import Atom, Constant, CustomOperation
+import scripts.src.truth_table as tested
+
+
+class TestTruthTable(unittest.TestCase):
+    """Tests of the bit-parallel truth tables."""
+
+    def setUp(self):
+        """Prepares the atoms used in tests."""
+        self.a = Atom("a")
+        self.b = Atom("b")
+        self.c = Atom("c")
+
+    def _assert_rows(self, term, table):
+        """Checks all the rows of the table against the evaluation."""
+        for values, result in table.rows():
+            env = Environment()
+            for name, value in zip(table.variable_names, values):
+                env.add_values(name, value)
+            self.assertEqual(term.evaluate(env), result)
+
+    def test_rows_order(self):
+        """Tests the order of the rows and the values of the variables."""
+        table = tested.TruthTable(Implication([self.a, self.b]))
+        self.assertEqual((
+            ((False, False), True),
+            ((False, True), True),
+            ((True, False), False),
+            ((True, True), True)), table.table)
+
+    def test_rows_equal_evaluation(self):
+        """Tests that every row matches the evaluation of the term."""
+        term = Equivalence([
+            Disjunction([self.a, Negation([self.c])]),
+            Conjunction([self.b, Implication([self.c, self.a])])])
+        table = tested.TruthTable(term)
+        self.assertEqual(8, len(table))
+        self._assert_rows(term, table)
+
+    def test_tautology(self):
+        """Tests the tautology and it's negation."""
+        term = Disjunction([self.a, Negation([self.a])])
+        self.assertEqual(True, tested.TruthTable(term).is_tautology)
+        self.assertEqual(
+            False, tested.TruthTable(Negation([term])).is_satisfiable)
+
+    def test_count_models(self):
+        """Tests counting of the models."""
+        term = Disjunction([self.a, Conjunction([self.b, self.c])])
+        self.assertEqual(5, tested.TruthTable(term).count_models)
+
+    def test_constants(self):
+        """Tests the table of the constant term."""
+        table = tested.TruthTable(Constant(True), ("a", "b"))
+        self.assertEqual(True, table.is_tautology)
+        self.assertEqual(4, table.count_models)
+
+    def test_missing_variable(self):
+        """Tests that the variables of the term have to be in the table."""
+        self.assertRaises(Exception, tested.TruthTable,
+                          Conjunction([self.a, self.b]), ("a",))
+
+    def test_equivalence(self):
+        """Tests the equivalence of the terms (De Morgan's law)."""
+        first = Negation([Conjunction([self.a, self.b])])
+        second = Disjunction([Negation([self.a]), Negation([self.b])])
+        self.assertEqual(True, tested.are_equivalent(first, second))
+        self.assertEqual(
+            False, tested.are_equivalent(first, Negation([self.a])))
+
+    def test_custom_operation(self):
+        """Tests that the custom operation is expanded by it's values."""
+        majority = CustomOperation(
+            3, [self.a, self.b, self.c],
+            lambda env, terms: sum(t.evaluate(env) for t in terms) >= 2)
+        table = tested.TruthTable(majority)
+        self.assertEqual(4, table.count_models)
+        self._assert_rows(majority, table)
+
+    def test_evaluate_values(self):
+        """Tests evaluation of the operation with given term values."""
+        custom = CustomOperation(
+            2, [self.a, self.b],
+            lambda env, terms: terms[0].evaluate(env) and not
+            terms[1].evaluate(env))
+        self.assertEqual(True, custom.evaluate_values((True, False)))
+        self.assertEqual(False, custom.evaluate_values((True, True)))
+        self.assertRaises(Exception, custom.evaluate_values, (True,))
+        self.assertEqual((self.a, self.b), custom.terms)